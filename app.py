@@ -3,10 +3,15 @@ MagicBricks ETL Pipeline Streamlit App
 --------------------------------------
 Gracefully handles live scraping failures (403) by switching
 to demo mode using sample Mumbai datasets.
+
+Scraping and cleaning run as background jobs (utils/jobs.py): the page
+stays responsive, shows live progress and can cancel a running job, and a
+job keeps running across reruns and browser reconnects.
 """
 
 from scraper.scraper import run_scraper
 from utils.data_cleaner import clean_data
+from utils.jobs import CANCELLED, DONE, JobManager
 import streamlit as st
 import os
 import pandas as pd
@@ -32,6 +37,106 @@ if "cleaned" not in st.session_state:
 if "demo_mode" not in st.session_state:
     st.session_state.demo_mode = False
 
+# -------------------------------
+# Background jobs
+# -------------------------------
+@st.cache_resource
+def get_job_manager():
+    # One manager per server process, shared by every session
+    return JobManager()
+
+
+jobs = get_job_manager()
+
+# Job ids also live in the URL, so a reloaded page finds its jobs again
+for job_key in ("scrape_job", "clean_job"):
+    if job_key not in st.session_state:
+        st.session_state[job_key] = st.query_params.get(job_key)
+
+
+def start_job(job_key, kind, fn, *args, **kwargs):
+    job = jobs.submit(kind, fn, *args, **kwargs)
+    st.session_state[job_key] = job.id
+    st.query_params[job_key] = job.id
+    return job
+
+
+def format_seconds(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+
+@st.fragment(run_every=1.0)
+def job_progress(job_key):
+    """Live progress of a job; re-renders itself every second."""
+    job = jobs.get(st.session_state.get(job_key))
+    if job is None:
+        return
+
+    info = job.snapshot()
+
+    if not job.active:
+        # Re-run the whole page once so it can show the job's outcome
+        if st.session_state.get(f"{job_key}_shown") != job.id:
+            st.session_state[f"{job_key}_shown"] = job.id
+            st.rerun()
+        return
+
+    if info["fraction"] is not None:
+        st.progress(min(info["fraction"], 1.0))
+
+    # Scrapes have no known end (no fraction, no ETA): rates and elapsed time
+    details = []
+    if info["pages"] is not None:
+        details.append(f"{info['pages']} pages fetched")
+    details.append(f"{info['records']} records")
+    if info["pages_per_second"] is not None:
+        details.append(f"{info['pages_per_second']:.2f} pages/s")
+    details.append(f"{info['records_per_second']:.1f} records/s")
+    if info["eta_seconds"] is not None:
+        details.append(f"ETA {format_seconds(info['eta_seconds'])}")
+    else:
+        details.append(f"elapsed {format_seconds(info['elapsed_seconds'])}")
+    st.caption(" • ".join(details))
+
+    if st.button("Cancel", key=f"cancel_{job.id}"):
+        jobs.cancel(job.id)
+        st.info("Stopping after the current step...")
+
+# -------------------------------
+# Cached data access
+# -------------------------------
+# The script re-runs on every interaction: file reads are cached and keyed
+# on the file's version, so they only happen again when the file changes
+
+def file_version(path):
+    """Cache key that changes whenever the file is rewritten."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_preview(path, version, rows=5):
+    # Only the preview rows are parsed, however large the file is
+    return pd.read_csv(path, nrows=rows)
+
+
+def preview_and_download(title, path, label):
+    st.markdown(title)
+    st.dataframe(load_preview(path, file_version(path)), width='stretch')
+
+    # Not streamed: st.download_button reads the whole file into memory on
+    # every rerun and serves it from there. Only the cached copies are gone
+    with open(path, "rb") as f:
+        st.download_button(
+            label=label,
+            data=f,
+            file_name=os.path.basename(path),
+            mime="text/csv",
+            # Downloading does not need to re-run the script
+            on_click="ignore",
+        )
+
 # -------------------------------
 # Styling
 # -------------------------------
@@ -92,27 +197,43 @@ if st.button("Run Scraper"):
     if not url or not city_name:
         st.error("Please enter both URL and city name")
     else:
-        try:
-            with st.spinner("Extracting data from MagicBricks..."):
-                run_scraper(url, raw_path)
+        # The output path is the job key: one crawl per file at a time
+        start_job("scrape_job", "scrape", run_scraper, url, raw_path, key=raw_path)
+        st.session_state.scraped = False
+        st.session_state.cleaned = False
+        st.session_state.demo_mode = False
 
-            st.session_state.scraped = True
-            st.session_state.demo_mode = False
-            st.success("Extraction completed successfully")
+scrape_job = jobs.get(st.session_state.scrape_job)
 
-        except Exception as e:
-            error_message = str(e)
+if scrape_job is not None:
+    # Paths follow the job, even if the inputs changed since it started
+    raw_path = scrape_job.key
 
-            if "403" in error_message or "Forbidden" in error_message:
-                st.session_state.demo_mode = True
-                st.session_state.scraped = True
+    if scrape_job.active:
+        st.markdown("Extracting data from MagicBricks...")
+        job_progress("scrape_job")
 
-                st.warning("Live scraping blocked by MagicBricks (403 Forbidden)")
-                st.info("Demo mode enabled using sample Mumbai data")
+    elif scrape_job.status == DONE:
+        st.session_state.scraped = os.path.exists(raw_path)
+        st.success("Extraction completed successfully")
 
-            else:
-                st.error("An unexpected error occurred")
-                st.code(error_message)
+    elif scrape_job.status == CANCELLED:
+        st.session_state.scraped = os.path.exists(raw_path)
+        st.info("Extraction cancelled. The pages scraped so far were kept.")
+
+    else:
+        error_message = scrape_job.error
+
+        if "403" in error_message or "Forbidden" in error_message:
+            st.session_state.demo_mode = True
+            st.session_state.scraped = True
+
+            st.warning("Live scraping blocked by MagicBricks (403 Forbidden)")
+            st.info("Demo mode enabled using sample Mumbai data")
+
+        else:
+            st.error("An unexpected error occurred")
+            st.code(error_message)
 
 # -------------------------------
 # Demo mode override paths
@@ -143,28 +264,36 @@ if st.session_state.demo_mode:
 # Preview Raw Data
 # -------------------------------
 if st.session_state.scraped and os.path.exists(raw_path):
-    st.markdown("### 📄 Raw Data Preview")
-    df_raw = pd.read_csv(raw_path)
-    st.dataframe(df_raw.head(5), width='stretch')
-    
-    with open(raw_path, "rb") as f:
-        st.download_button(
-            label="Download Raw Data",
-            data=f,
-            file_name=os.path.basename(raw_path),
-            mime="text/csv"
-        )
+    preview_and_download("### 📄 Raw Data Preview", raw_path, "Download Raw Data")
 
 # -------------------------------
 # Clean Data (Transform)
 # -------------------------------
 if st.session_state.scraped and not st.session_state.demo_mode:
     if st.button("Clean Data"):
-        with st.spinner("Transforming raw data..."):
-            clean_data(raw_path, clean_file)
-            st.session_state.cleaned = True
+        clean_file = os.path.basename(raw_path).replace("_raw_data.csv", "_cleaned_data.csv")
+        start_job("clean_job", "clean", clean_data, raw_path, clean_file, key=clean_file)
+        st.session_state.cleaned = False
+
+clean_job = jobs.get(st.session_state.clean_job)
+
+if clean_job is not None and not st.session_state.demo_mode:
+    if clean_job.active:
+        st.markdown("Transforming raw data...")
+        job_progress("clean_job")
+
+    elif clean_job.status == DONE:
+        clean_path = clean_job.result
+        st.session_state.cleaned = True
         st.success("Transformation completed")
 
+    elif clean_job.status == CANCELLED:
+        st.info("Transformation cancelled")
+
+    else:
+        st.error("Transformation failed")
+        st.code(clean_job.error)
+
 # -------------------------------
 # Pipeline Visualization
 # -------------------------------
@@ -201,17 +330,7 @@ with c3:
 # Preview Cleaned Data
 # -------------------------------
 if (st.session_state.cleaned or st.session_state.demo_mode) and os.path.exists(clean_path):
-    st.markdown("### 🧹 Cleaned Data Preview")
-    df_clean = pd.read_csv(clean_path)
-    st.dataframe(df_clean.head(5), width='stretch')
-
-    with open(clean_path, "rb") as f:
-        st.download_button(
-            label="Download Cleaned Data",
-            data=f,
-            file_name=os.path.basename(clean_path),
-            mime="text/csv"
-        )
+    preview_and_download("### 🧹 Cleaned Data Preview", clean_path, "Download Cleaned Data")
 
 # -------------------------------
 # Footer
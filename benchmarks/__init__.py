@@ -0,0 +1,9 @@
+"""
+Benchmarks for the MagicBricks ETL pipeline.
+
+- fixtures.py: synthetic MagicBricks result pages and raw CSVs
+- standin.py: local HTTP server serving paginated synthetic pages
+- run.py: times every pipeline stage and writes machine-readable results
+
+Run with: python -m benchmarks.run --help
+"""
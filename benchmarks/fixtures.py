@@ -0,0 +1,179 @@
+"""
+Synthetic MagicBricks Fixtures
+
+Generates listing records that look like what the scraper extracts, the
+result-page HTML those records would be scraped from, and raw CSVs of any
+size (10^3 to 10^7 rows and beyond, written in chunks).
+
+Everything is deterministic for a given seed. A page rendered from records
+parses back to exactly those records, so benchmarks can also check
+correctness. Each optional field is left out of a card with probability
+missing_rate, like cards on the real site that lack a summary block.
+"""
+
+import csv
+import html
+import random
+
+from scraper.schema import LABEL_CLASS, PARTS, PRICE_CLASS, RAW_FIELDS, SUMMARY_FIELDS, TITLE_CLASS
+
+CITIES = {
+    "Mumbai": ["Andheri West", "Powai", "Borivali East", "Chembur", "Worli", "Thane West"],
+    "New Delhi": ["Saket", "Dwarka", "Vasant Kunj", "Rohini", "Lajpat Nagar"],
+    "Bhubaneswar": ["Patia", "Khandagiri", "Chandrasekharpur", "Jatni"],
+    "Pune": ["Baner", "Wakad", "Hinjewadi", "Kharadi", "Hadapsar"],
+    "Bangalore": ["Whitefield", "Electronic City", "Hebbal", "Sarjapur Road"],
+}
+PROPERTY_TYPES = ["Flat", "Flat", "Flat", "Villa", "House", "Studio Apartment"]
+PREFIXES = ["Lodha", "Godrej", "Prestige", "Sobha", "DLF", "Hiranandani", "Kolte Patil", "Shapoorji"]
+SUFFIXES = ["Heights", "Residency", "Park", "Towers", "Gardens", "Enclave", "Greens", "Vista"]
+FURNISHING = ["Unfurnished", "Semi-Furnished", "Furnished"]
+STATUS = ["Ready to Move", "Under Construction", "Possession by Dec '27"]
+FACING = ["East", "West", "North", "South", "North - East", "South - West"]
+TRANSACTION = ["Resale", "New Property"]
+
+# Fields that may be missing from a card (title and price always exist)
+OPTIONAL_FIELDS = list(SUMMARY_FIELDS)
+
+# record field, data-summary, class of the div holding the text (see scraper/schema.py)
+_SUMMARY_BLOCKS = [
+    (field, summary, PARTS[part]) for field, (summary, part) in SUMMARY_FIELDS.items()
+]
+
+
+def _price(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.03:
+        return "Price on Request"
+    if roll < 0.45:
+        return f"₹{rng.randint(10, 99) / 10:g} Cr"
+    return f"₹{rng.randint(15, 99)} Lac"
+
+
+def _area(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.8:
+        return f"{rng.randint(350, 3500)} sqft"
+    if roll < 0.9:
+        return f"{rng.randint(60, 400)} sqyrd"
+    return f"{rng.randint(35, 320)} sqm"
+
+
+def make_record(rng: random.Random, missing_rate: float = 0.1) -> dict:
+    """One synthetic listing with the scraper's raw fields."""
+    city = rng.choice(list(CITIES))
+    locality = rng.choice(CITIES[city])
+    project = f"{rng.choice(PREFIXES)} {rng.choice(SUFFIXES)}"
+    bhk = rng.randint(1, 5)
+    property_type = rng.choice(PROPERTY_TYPES)
+    listing = "Sale" if rng.random() < 0.85 else "Rent"
+
+    record = {
+        "title": f"{bhk} BHK {property_type} for {listing} in {project}, {locality}, {city}",
+        "price": _price(rng),
+        "carpet_area": _area(rng),
+        "furnishing": rng.choice(FURNISHING),
+        "status": rng.choice(STATUS),
+        "society": project,
+        "car_parking": f"{rng.randint(1, 2)} Covered",
+        "bathrooms": str(rng.randint(1, 4)) if rng.random() < 0.97 else "5+",
+    }
+    total_floors = rng.randint(2, 40)
+    record["floor"] = f"{rng.randint(1, total_floors)} out of {total_floors}"
+    record["facing"] = rng.choice(FACING)
+    record["transaction"] = rng.choice(TRANSACTION)
+
+    for field in OPTIONAL_FIELDS:
+        if rng.random() < missing_rate:
+            record[field] = ""
+
+    return record
+
+
+def generate_records(count: int, missing_rate: float = 0.1, seed: int = 0):
+    """Yields count synthetic records."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield make_record(rng, missing_rate)
+
+
+def render_card(record: dict) -> str:
+    """HTML of one property card; empty fields get no summary block."""
+    escape = html.escape
+    parts = [
+        '<div class="mb-srp__list">',
+        '<div class="mb-srp__card">',
+        f'<h2 class="{TITLE_CLASS}">{escape(record["title"])}</h2>',
+        f'<div class="mb-srp__card__price"><div class="{PRICE_CLASS}">'
+        f'{escape(record["price"])}</div></div>',
+        '<div class="mb-srp__card__summary">',
+    ]
+
+    for field, summary, css_class in _SUMMARY_BLOCKS:
+        if not record[field]:
+            continue
+        label = summary.replace("-", " ").title()
+        if css_class == LABEL_CLASS:
+            body = f'<div class="{css_class}">{escape(record[field])}</div>'
+        else:
+            body = (
+                f'<div class="{LABEL_CLASS}">{label}</div>'
+                f'<div class="{css_class}">{escape(record[field])}</div>'
+            )
+        parts.append(f'<div class="mb-srp__card__summary__list" data-summary="{summary}">{body}</div>')
+
+    parts.append("</div></div></div>")
+    return "".join(parts)
+
+
+def render_page(records: list, next_href: str | None = None) -> str:
+    """A complete result page holding records, with an optional "Next" link."""
+    pagination = ""
+    if next_href:
+        pagination = (
+            '<div class="mb-pagination">'
+            f'<a class="mb-pagination__list--item" title="Next" href="{html.escape(next_href)}">Next</a>'
+            "</div>"
+        )
+
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        "<title>Property for Sale</title>"
+        "<script>window.__INITIAL_STATE__ = {};</script></head><body>"
+        '<div class="mb-srp__left">'
+        + "".join(render_card(record) for record in records)
+        + "</div>"
+        + pagination
+        + "</body></html>"
+    )
+
+
+def generate_page(page: int, cards: int = 30, missing_rate: float = 0.1, seed: int = 0,
+                  next_href: str | None = None) -> tuple:
+    """
+    Result page number page (1-based) of a synthetic search.
+
+    Returns:
+        tuple: (html, records on the page)
+    """
+    rng = random.Random(f"{seed}:{page}")
+    records = [make_record(rng, missing_rate) for _ in range(cards)]
+    return render_page(records, next_href), records
+
+
+def write_raw_csv(path: str, rows: int, missing_rate: float = 0.1, seed: int = 0,
+                  chunk_rows: int = 100_000) -> str:
+    """Writes a raw CSV of rows synthetic records, chunk by chunk."""
+    records = generate_records(rows, missing_rate, seed)
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RAW_FIELDS)
+        writer.writeheader()
+
+        remaining = rows
+        while remaining > 0:
+            batch = min(chunk_rows, remaining)
+            writer.writerows(next(records) for _ in range(batch))
+            remaining -= batch
+
+    return path
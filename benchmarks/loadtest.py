@@ -0,0 +1,141 @@
+"""
+Scraper Load Test
+
+Crawls the local stand-in server (standin.py) with every combination of
+fetcher settings given on the command line, under the faults the server is
+told to inject, and reports for each run:
+
+- pages per second and whether every page's records made it to the CSV
+- requests, retries and responses by status (from utils/metrics.py)
+- the peak number of requests the server saw in flight
+
+This is how concurrency, retry and rate-limit settings are tuned, and
+checked for throughput regressions, without sending a single request to
+MagicBricks.
+
+Usage:
+    python -m benchmarks.loadtest --pages 100 --latency 0.05 --workers 1 4 8
+    python -m benchmarks.loadtest --throttle-rate 0.1 --error-rate 0.05 --retry-after 0 \\
+        --rate-limit 20 --capacity 6 --client-rate 0 10 20
+    python -m benchmarks.loadtest --baseline loadtest.json   # exit code 1 on regressions
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.run import compare, metadata, result
+from benchmarks.standin import StandInServer, add_fault_arguments, fault_options
+from scraper.fetcher import Fetcher
+from scraper.scraper import run_scraper
+from scraper.throttle import RetryPolicy, TokenBucket
+from utils.metrics import Metrics
+
+
+def crawl(server: StandInServer, workdir: str, workers: int, client_rate: float,
+          max_retries: int, backoff_base: float) -> dict:
+    """One crawl of the stand-in with the given fetcher settings."""
+    output_path = os.path.join(workdir, f"crawl_{workers}_{client_rate}.csv")
+    metrics = Metrics("loadtest")
+    fetcher = Fetcher(
+        max_per_host=workers,
+        rate_limiter=TokenBucket(client_rate, workers) if client_rate else False,
+        retry_policy=RetryPolicy(max_retries, backoff_base),
+        metrics=metrics,
+    )
+
+    before = server.stats()
+    error = None
+    start = time.perf_counter()
+    try:
+        with fetcher:
+            run_scraper(server.start_url, output_path, workers=workers,
+                        fetcher=fetcher, metrics=metrics)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - start
+
+    after = server.stats()
+    records = len(pd.read_csv(output_path)) if os.path.exists(output_path) else 0
+    counters = metrics.snapshot()["counters"]
+
+    params = {"workers": workers, "client_rate": client_rate, "max_retries": max_retries}
+    entry = result("crawl", params, {"seconds": seconds}, int(counters.get("pages", 0)), "pages")
+    entry.update({
+        "complete": records == server.pages * server.cards,
+        "records": records,
+        "error": error,
+        "requests": after["requests"] - before["requests"],
+        "retries": int(counters.get("http.retries", 0)),
+        "responses": {
+            status: count - before["responses"].get(status, 0)
+            for status, count in after["responses"].items()
+            if count - before["responses"].get(status, 0)
+        },
+        "peak_in_flight": after["peak_in_flight"],
+    })
+    return entry
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the scraper against the stand-in server")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--cards", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    add_fault_arguments(parser)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8],
+                        help="pages in flight (also the per-host limit)")
+    parser.add_argument("--client-rate", type=float, nargs="+", default=[0],
+                        help="client request rates per second to try (0 = unpaced)")
+    parser.add_argument("--max-retries", type=int, default=4)
+    parser.add_argument("--backoff-base", type=float, default=0.05,
+                        help="retry backoff base in seconds when no Retry-After is sent")
+    parser.add_argument("--output", default="loadtest_results.json", help="JSON results file")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative throughput drop vs the baseline")
+    args = parser.parse_args(argv)
+
+    faults = fault_options(args)
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="mb-loadtest-") as workdir:
+        for workers, rate in itertools.product(args.workers, args.client_rate):
+            # A fresh server per run: its rate window and counters start empty
+            with StandInServer(args.pages, args.cards, seed=args.seed, **faults) as server:
+                entry = crawl(server, workdir, workers, rate, args.max_retries, args.backoff_base)
+            entry["params"].update(faults)
+            results.append(entry)
+
+    report = {"meta": metadata(), "results": results}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f)["results"], args.tolerance)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nLoad test results:")
+    for entry in results:
+        status = "complete" if entry["complete"] else f"INCOMPLETE ({entry['error']})"
+        print(f"  workers={entry['params']['workers']} client_rate={entry['params']['client_rate']}: "
+              f"{entry['throughput'] or 0:,.1f} pages/s, {entry['requests']} requests, "
+              f"{entry['retries']} retries, peak {entry['peak_in_flight']} in flight, "
+              f"responses {entry['responses']} - {status}")
+    print(f"Results saved to: {args.output}")
+
+    for regression in report.get("regressions", []):
+        print(f"REGRESSION {regression['name']} {regression['params']}: "
+              f"{regression['change']:+.1%} vs baseline")
+
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Benchmark Runner
+
+Times each pipeline stage on synthetic data and reports throughput and
+peak memory as JSON, so runs can be compared and regressions caught.
+
+Stages:
+- parse_properties: cards parsed per second, for each parser backend
+- get_next_page_url: pages per second
+- run_scraper: pages per second for a full crawl of the local stand-in
+  server (no cache, no rate limit)
+- clean_data: raw rows cleaned per second, for each --rows size
+
+Each stage runs once, and that run is timed. --memory adds a second run
+under tracemalloc for the peak of Python allocations; tracing slows code
+down, so that run is reported separately (peak_memory_mb and its own
+traced_seconds) and never counts towards the timings.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --rows 1000 1000000 10000000 --output results.json
+    python -m benchmarks.run --baseline results.json   # exit code 1 on regressions
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import lxml
+import pandas as pd
+
+from benchmarks.fixtures import generate_page, write_raw_csv
+from benchmarks.standin import StandInServer
+from scraper.fetcher import Fetcher
+from scraper.paginator import get_next_page_url
+from scraper.parser import BACKENDS, parse_properties
+from scraper.scraper import run_scraper
+from utils.data_cleaner import clean_data
+
+DEFAULT_ROWS = [1_000, 100_000]
+DEFAULT_TOLERANCE = 0.2
+
+
+def measure(fn, memory: bool = False) -> dict:
+    """
+    Times one run of fn. If memory is set, fn runs a second time under
+    tracemalloc for its peak memory; that run's duration is kept apart.
+
+    Returns:
+        dict: seconds, and peak_memory_mb / traced_seconds (None unless memory)
+    """
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    timing = {"seconds": time.perf_counter() - start,
+              "peak_memory_mb": None, "traced_seconds": None}
+
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            fn()
+            timing["traced_seconds"] = time.perf_counter() - start
+            timing["peak_memory_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+
+    return timing
+
+
+def result(name: str, params: dict, timing: dict, items: int, unit: str) -> dict:
+    seconds = timing["seconds"]
+    peak_mb = timing.get("peak_memory_mb")
+    traced_seconds = timing.get("traced_seconds")
+    return {
+        "name": name,
+        "params": params,
+        "seconds": round(seconds, 6),
+        "items": items,
+        "unit": unit,
+        "throughput": round(items / seconds, 3) if seconds > 0 else None,
+        "peak_memory_mb": round(peak_mb, 3) if peak_mb is not None else None,
+        "traced_seconds": round(traced_seconds, 6) if traced_seconds is not None else None,
+    }
+
+
+def bench_parsing(pages: int, cards: int, missing_rate: float, memory: bool) -> list:
+    htmls = [
+        generate_page(n, cards, missing_rate, next_href=f"/search?page={n + 1}")[0]
+        for n in range(1, pages + 1)
+    ]
+    params = {"pages": pages, "cards": cards, "missing_rate": missing_rate}
+    results = []
+
+    for backend in BACKENDS:
+        timing = measure(
+            lambda: [parse_properties(html, backend) for html in htmls], memory
+        )
+        results.append(result(
+            "parse_properties", {**params, "backend": backend},
+            timing, pages * cards, "cards",
+        ))
+
+    timing = measure(lambda: [get_next_page_url(html) for html in htmls], memory)
+    results.append(result("get_next_page_url", params, timing, pages, "pages"))
+    return results
+
+
+def bench_scraper(pages: int, cards: int, workers: int, workdir: str, memory: bool) -> list:
+    output_path = os.path.join(workdir, "raw", "standin_raw_data.csv")
+
+    with StandInServer(pages=pages, cards=cards) as server:
+        def crawl():
+            with Fetcher(rate_limiter=False) as fetcher:
+                run_scraper(server.start_url, output_path, workers=workers, fetcher=fetcher)
+
+        timing = measure(crawl, memory)
+
+    params = {"pages": pages, "cards": cards, "workers": workers}
+    return [result("run_scraper", params, timing, pages, "pages")]
+
+
+def bench_cleaning(rows_list: list, missing_rate: float, chunksize: int | None,
+                   workdir: str, memory: bool) -> list:
+    results = []
+
+    for rows in rows_list:
+        raw_path = write_raw_csv(os.path.join(workdir, f"raw_{rows}.csv"), rows, missing_rate)
+        # An absolute output name keeps the benchmark out of data/processed
+        output_name = os.path.join(workdir, f"clean_{rows}.csv")
+
+        timing = measure(
+            lambda: clean_data(raw_path, output_name, chunksize=chunksize), memory
+        )
+        params = {"rows": rows, "missing_rate": missing_rate, "chunksize": chunksize}
+        results.append(result("clean_data", params, timing, rows, "rows"))
+        os.remove(raw_path)
+
+    return results
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "lxml": lxml.__version__,
+    }
+
+
+def _key(entry: dict) -> str:
+    return entry["name"] + json.dumps(entry["params"], sort_keys=True)
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """Results whose throughput dropped by more than tolerance vs the baseline."""
+    previous = {_key(entry): entry for entry in baseline}
+    regressions = []
+
+    for entry in results:
+        old = previous.get(_key(entry))
+        if not old or not old["throughput"] or not entry["throughput"]:
+            continue
+        change = entry["throughput"] / old["throughput"] - 1
+        if change < -tolerance:
+            regressions.append({"name": entry["name"], "params": entry["params"],
+                                "baseline": old["throughput"],
+                                "current": entry["throughput"],
+                                "change": round(change, 4)})
+
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the MagicBricks ETL pipeline")
+    parser.add_argument("--pages", type=int, default=50, help="pages parsed and crawled")
+    parser.add_argument("--cards", type=int, default=30, help="cards per page")
+    parser.add_argument("--missing-rate", type=float, default=0.1,
+                        help="probability that an optional card field is missing")
+    parser.add_argument("--workers", type=int, default=4, help="run_scraper workers")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="raw CSV sizes for clean_data")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="clean_data chunk size (default: in-memory)")
+    parser.add_argument("--only", nargs="+", choices=["parse", "scrape", "clean"],
+                        help="run only these stages")
+    parser.add_argument("--memory", action="store_true",
+                        help="also measure peak memory, on a second (traced) run")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative throughput drop vs the baseline")
+    args = parser.parse_args(argv)
+
+    stages = set(args.only or ["parse", "scrape", "clean"])
+    memory = args.memory
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="mb-bench-") as workdir:
+        if "parse" in stages:
+            results += bench_parsing(args.pages, args.cards, args.missing_rate, memory)
+        if "scrape" in stages:
+            results += bench_scraper(args.pages, args.cards, args.workers, workdir, memory)
+        if "clean" in stages:
+            results += bench_cleaning(args.rows, args.missing_rate, args.chunksize,
+                                      workdir, memory)
+
+    report = {"meta": metadata(), "results": results}
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f)["results"], args.tolerance)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nBenchmark results:")
+    for entry in results:
+        memory_note = f", peak {entry['peak_memory_mb']:.1f} MB" if entry["peak_memory_mb"] is not None else ""
+        print(f"  {entry['name']} {entry['params']}: "
+              f"{entry['throughput']:,.1f} {entry['unit']}/s{memory_note}")
+    print(f"Results saved to: {args.output}")
+
+    for regression in report.get("regressions", []):
+        print(f"REGRESSION {regression['name']} {regression['params']}: "
+              f"{regression['change']:+.1%} vs baseline")
+
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
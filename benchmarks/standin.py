@@ -0,0 +1,265 @@
+"""
+Local MagicBricks Stand-in
+
+A small threaded HTTP server serving a paginated synthetic search
+(see fixtures.py), so the scraper can be run and timed end to end without
+touching the real site.
+
+    GET /search            page 1
+    GET /search?page=N     page N (1..pages); 404 beyond the last page
+
+Every page but the last carries an absolute "Next" link to the following
+page, so the crawl stays on the stand-in. Pages are rendered once and kept
+in memory.
+
+To exercise the fetcher's retry, throttling and concurrency handling, the
+server can misbehave like the real site does:
+- latency: seconds added to every response (plus up to `jitter` more)
+- forbidden_rate / throttle_rate / error_rate: share of requests answered
+  with 403, 429 or a 5xx (500/502/503/504)
+- rate_limit: requests per second accepted over a sliding one-second
+  window; requests beyond it get a 429
+- capacity: requests handled at the same time; requests beyond it get a 503
+429 and 503 responses carry Retry-After: retry_after (whole seconds) unless
+retry_after is None. Faults are drawn from a random generator seeded with
+seed, and every answered status is counted in `responses`.
+
+Usage:
+    with StandInServer(pages=50, latency=0.05, throttle_rate=0.1) as server:
+        run_scraper(server.start_url, "out.csv")
+
+or from the command line: python -m benchmarks.standin --pages 50 --port 8000
+(see --help for the fault options), and `python main.py --standin 50` runs
+the whole pipeline against an in-process stand-in.
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixtures import generate_page
+
+SEARCH_PATH = "/search"
+SERVER_ERRORS = (500, 502, 503, 504)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.standin.handle(self)
+
+
+class StandInServer:
+    """Serves pages of a synthetic search from a background thread."""
+
+    def __init__(self, pages: int = 20, cards: int = 30, missing_rate: float = 0.1,
+                 seed: int = 0, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0,
+                 forbidden_rate: float = 0.0, throttle_rate: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: float | None = None,
+                 capacity: int | None = None, retry_after: int | None = 1):
+        self.pages = pages
+        self.cards = cards
+        self.missing_rate = missing_rate
+        self.seed = seed
+        self.latency = latency
+        self.jitter = jitter
+        self.forbidden_rate = forbidden_rate
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.capacity = capacity
+        self.retry_after = retry_after
+
+        self.requests = 0
+        self.responses = Counter()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._recent = deque()
+        self._rng = random.Random(seed)
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.standin = self
+        self._thread = None
+        self._lock = threading.Lock()
+        self._pages = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def start_url(self) -> str:
+        return self.url + SEARCH_PATH
+
+    def page_url(self, page: int) -> str:
+        return f"{self.start_url}?page={page}"
+
+    def page(self, number: int) -> bytes:
+        """HTML of page number, rendered on first use."""
+        if number not in self._pages:
+            next_href = self.page_url(number + 1) if number < self.pages else None
+            html, _ = generate_page(number, self.cards, self.missing_rate, self.seed, next_href)
+            self._pages[number] = html.encode("utf-8")
+        return self._pages[number]
+
+    def _fault(self) -> int | None:
+        """Status of an injected failure for the current request, if any."""
+        now = time.monotonic()
+
+        with self._lock:
+            if self.capacity is not None and self.in_flight > self.capacity:
+                return 503
+
+            if self.rate_limit is not None:
+                while self._recent and now - self._recent[0] >= 1.0:
+                    self._recent.popleft()
+                if len(self._recent) >= self.rate_limit:
+                    return 429
+                self._recent.append(now)
+
+            draw = self._rng.random()
+            if draw < self.forbidden_rate:
+                return 403
+            draw -= self.forbidden_rate
+            if draw < self.throttle_rate:
+                return 429
+            draw -= self.throttle_rate
+            if draw < self.error_rate:
+                return self._rng.choice(SERVER_ERRORS)
+            return None
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        """Answers one GET request."""
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+
+        try:
+            if delay:
+                time.sleep(delay)
+            status, body, headers = self._respond(request.path)
+            with self._lock:
+                self.responses[status] += 1
+            self._send(request, status, body, headers)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _respond(self, path: str) -> tuple:
+        """(status, body, headers) of the response to a GET of path."""
+        url = urlsplit(path)
+        number = parse_qs(url.query).get("page", ["1"])[0]
+
+        if url.path != SEARCH_PATH or not number.isdigit() or not 1 <= int(number) <= self.pages:
+            return 404, b"Not Found", None
+
+        status = self._fault()
+        if status is None:
+            return 200, self.page(int(number)), None
+
+        headers = None
+        if status in (429, 503) and self.retry_after is not None:
+            headers = {"Retry-After": str(self.retry_after)}
+        return status, f"Injected {status}".encode("utf-8"), headers
+
+    def stats(self) -> dict:
+        """Requests served so far, by status, and the peak concurrency seen."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "responses": dict(sorted(self.responses.items())),
+                "peak_in_flight": self.peak_in_flight,
+            }
+
+    @staticmethod
+    def _send(request: BaseHTTPRequestHandler, status: int, body: bytes, headers: dict | None = None):
+        request.send_response(status)
+        request.send_header("Content-Type", "text/html; charset=utf-8")
+        request.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(body)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+FAULT_OPTIONS = ("latency", "jitter", "forbidden_rate", "throttle_rate", "error_rate",
+                 "rate_limit", "capacity", "retry_after")
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser):
+    """Command-line options for the stand-in's injected faults."""
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency, up to this")
+    parser.add_argument("--forbidden-rate", type=float, default=0.0, help="share of 403 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of 429 responses")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 5xx responses")
+    parser.add_argument("--rate-limit", type=float, default=None,
+                        help="requests per second accepted before answering 429")
+    parser.add_argument("--capacity", type=int, default=None,
+                        help="concurrent requests handled before answering 503")
+    parser.add_argument("--retry-after", type=int, default=1,
+                        help="Retry-After seconds sent with 429/503 (-1 omits the header)")
+
+
+def fault_options(args: argparse.Namespace) -> dict:
+    options = {name: getattr(args, name) for name in FAULT_OPTIONS}
+    if options["retry_after"] is not None and options["retry_after"] < 0:
+        options["retry_after"] = None
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic MagicBricks search locally")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--cards", type=int, default=30)
+    parser.add_argument("--missing-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server = StandInServer(args.pages, args.cards, args.missing_rate, args.seed,
+                           args.host, args.port, **fault_options(args))
+    print(f"Serving {args.pages} pages at {server.start_url} (Ctrl+C to stop)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+        print(server.stats())
+
+
+if __name__ == "__main__":
+    main()
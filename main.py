@@ -2,25 +2,131 @@
 Main entry point for the MagicBricks scraping pipeline.
 
 This script:
-1. Takes user input (URL and city name)
+1. Takes user input (URL and city name), or a batch file of many cities
 2. Scrapes raw property data
 3. Cleans the scraped data
-4. Saves both raw and cleaned CSV files
+4. Saves the raw CSV and the cleaned dataset (CSV, Parquet or Feather)
+5. Loads the cleaned listings into the SQLite database (utils/loader.py)
+   and refreshes the aggregate rollups (utils/aggregates.py)
 
 Run this file to execute the full workflow.
+
+Options:
+  --no-cache   Always download pages instead of using the on-disk cache
+  --offline    Replay a previous crawl from the cache only (no network)
+  --resume     Continue an interrupted crawl from its last checkpoint
+  --format     Format of the cleaned dataset: csv (default), parquet, feather
+  --incremental  Only clean raw rows that are new or changed since the last run
+  --new-only   Skip listings already scraped by earlier --new-only runs
+  --db PATH    SQLite database to load into (default data/magicbricks.db)
+  --no-db      Skip the database Load stage
+  --batch FILE Run every (city, URL) job of a JSON file concurrently, without
+               prompts, and build a combined national dataset (utils/batch.py)
+  --metrics FILE  Save stage timings and counters of the run (utils/metrics.py):
+               Prometheus text for .prom files, JSON otherwise
+  --log-metrics   Print structured (JSON) metric events to stderr
+  --profile STAGE ...  Profile these stages (e.g. parse clean.titles) and save
+               the profiles to data/profiles/; --profile-mode cpu|memory
+  --archive    Also keep every scraped page in data/archive/<city> (scraper/archive.py)
+  --replay     Re-parse the latest archived crawl of the city instead of scraping
+  --standin N  Scrape N synthetic pages from a local stand-in server instead of
+               MagicBricks (benchmarks/standin.py); no prompts, city "standin"
 """
 
+from scraper.archive import replay_archive
+from scraper.config import ARCHIVE_DIR, CACHE_DIR
 from scraper.scraper import run_scraper
+from utils.aggregates import refresh_rollups
+from utils.batch import load_jobs, run_batch
 from utils.data_cleaner import clean_data
+from utils.loader import DB_PATH, load_dataset
+from utils.metrics import PROFILE_MODES, Metrics, configure_logging
+from utils.storage import FORMATS
+import argparse
+import logging
 import os
+import sys
 
 
 if __name__ == "__main__":
-    # Get target MagicBricks URL from user
-    url = input("Enter Magicbricks URL: ").strip()
+    parser = argparse.ArgumentParser(description="MagicBricks ETL pipeline")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="do not read or write the on-disk page cache")
+    parser.add_argument("--offline", action="store_true",
+                        help="serve every page from the cache, never hit the network")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted crawl instead of starting over")
+    parser.add_argument("--format", choices=FORMATS, default="csv",
+                        help="file format of the cleaned dataset")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reuse already-cleaned rows and only clean new or changed ones")
+    parser.add_argument("--new-only", action="store_true",
+                        help="keep only listings never scraped before for this city")
+    parser.add_argument("--db", default=DB_PATH,
+                        help="SQLite database the cleaned listings are loaded into")
+    parser.add_argument("--no-db", action="store_true",
+                        help="do not load the cleaned listings into the database")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="JSON file of (city, url) jobs to run non-interactively")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="save a metrics snapshot of the run (.json or .prom)")
+    parser.add_argument("--log-metrics", action="store_true",
+                        help="print structured metric events to stderr")
+    parser.add_argument("--profile", nargs="+", metavar="STAGE", default=[],
+                        help="stages to profile, e.g. fetch parse write clean.titles")
+    parser.add_argument("--profile-mode", choices=PROFILE_MODES, default="cpu",
+                        help="cProfile (cpu) or tracemalloc (memory) profiles")
+    parser.add_argument("--archive", action="store_true",
+                        help="archive the HTML of every scraped page for later replay")
+    parser.add_argument("--replay", action="store_true",
+                        help="rebuild the raw CSV from the page archive instead of scraping")
+    parser.add_argument("--standin", type=int, metavar="PAGES",
+                        help="scrape a local stand-in server serving this many synthetic pages")
+    args = parser.parse_args()
+
+    if args.log_metrics:
+        # Per-stage timings are DEBUG events, summaries INFO
+        configure_logging(logging.DEBUG)
+
+    # Non-interactive mode: every job of the batch file, several at a time
+    if args.batch:
+        if args.replay or args.standin:
+            parser.error("--batch cannot be combined with --replay or --standin")
+        jobs, options = load_jobs(args.batch)
+        options.setdefault("output_format", args.format)
+        options.setdefault("resume", args.resume)
+        options.setdefault("offline", args.offline)
+        options.setdefault("new_only", args.new_only)
+        options.setdefault("incremental", args.incremental)
+        if args.no_cache and not args.offline:
+            options["cache_dir"] = None
+        options.setdefault("database", None if args.no_db else args.db)
+        options.setdefault("archive", args.archive)
+
+        results = run_batch(jobs, **options)
+        failed = [result["city"] for result in results if result["error"]]
+        if failed:
+            print(f"\nBatch completed with {len(failed)} failed job(s): {', '.join(failed)}")
+            sys.exit(1)
+        print("\nBatch completed ✔")
+        sys.exit(0)
+
+    standin = None
+    if args.standin:
+        # Synthetic pages served locally: nothing to ask, nothing worth caching
+        from benchmarks.standin import StandInServer
+
+        standin = StandInServer(pages=args.standin).start()
+        url = standin.start_url
+        city_name = "standin"
+        args.no_cache = True
+        print(f"Serving {args.standin} synthetic pages at {url}")
+    else:
+        # Get target MagicBricks URL from user (a replay needs no URL)
+        url = None if args.replay else input("Enter Magicbricks URL: ").strip()
 
-    # City name used for naming output files
-    city_name = input("Enter city name (e.g. mumbai, bhubaneswar): ").strip().lower()
+        # City name used for naming output files
+        city_name = input("Enter city name (e.g. mumbai, bhubaneswar): ").strip().lower()
 
     # Output file names
     raw_file = f"{city_name}_raw_data.csv"
@@ -29,13 +135,59 @@ if __name__ == "__main__":
     # Path to store raw scraped data
     raw_path = os.path.join("data", "raw", raw_file)
 
-    # Start scraping process
-    print("\nStarting scraping process...\n")
-    run_scraper(url, raw_path)
+    # Fingerprints of every listing scraped so far for this city
+    seen_index = os.path.join("data", "raw", f"{city_name}_seen.idx")
+
+    # Raw HTML of the city's crawls
+    archive_dir = os.path.join(ARCHIVE_DIR, city_name)
+
+    # Timings and counters of both stages, saved even if a stage fails
+    metrics = Metrics(city_name, profile=args.profile, profile_mode=args.profile_mode)
+
+    try:
+        if args.replay:
+            # Re-extract the records of the last archived crawl
+            print("\nReplaying archived pages...\n")
+            with metrics.stage("replay"):
+                records = replay_archive(archive_dir, raw_path)
+        else:
+            # Start scraping process
+            print("\nStarting scraping process...\n")
+            records = run_scraper(
+                url,
+                raw_path,
+                cache_dir=None if args.no_cache and not args.offline else CACHE_DIR,
+                offline=args.offline,
+                resume=args.resume,
+                seen_index=seen_index if args.new_only else None,
+                metrics=metrics,
+                archive_dir=archive_dir if args.archive else None,
+            )
+
+        # A raw CSV left over from an earlier run is not this run's output
+        if not records:
+            print("\nNothing was scraped; the cleaning and Load stages are skipped.")
+            sys.exit(1)
+
+        # Start data cleaning process
+        print("\nStarting cleaning process...\n")
+        clean_path = clean_data(raw_path, clean_file, output_format=args.format,
+                                incremental=args.incremental, metrics=metrics)
 
-    # Start data cleaning process
-    print("\nStarting cleaning process...\n")
-    clean_data(raw_path, clean_file)
+        # Load the cleaned listings into the database
+        if not args.no_db:
+            print("\nLoading into the database...\n")
+            with metrics.stage("load"):
+                load_dataset(clean_path, args.db)
+                refresh_rollups(args.db)
+    finally:
+        if standin:
+            standin.stop()
+        metrics.log_summary()
+        if args.metrics:
+            print(f"Metrics saved to: {metrics.save(args.metrics)}")
+        for path in metrics.save_profiles():
+            print(f"Profile saved to: {path}")
 
     # Final success message
     print("\nPipeline completed successfully ✔")
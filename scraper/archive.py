@@ -0,0 +1,353 @@
+"""
+Raw Page Archive
+
+Keeps the HTML of every scraped page, so new fields can be extracted later
+by re-parsing the archive (replay) instead of re-crawling the site.
+
+Layout of an archive directory (e.g. data/archive/<city>):
+- pages-00001.gz, pages-00002.gz, ...: append-only segments. Every page
+  is its own compressed frame (a gzip member, or a zstd frame in .zst
+  segments), holding a small WARC-like header block and the HTML:
+
+      URL: https://www.magicbricks.com/...
+      Page: 3
+      Crawl: 20250101T120000-1a2b3c
+      Fetched-At: 2025-01-01T12:00:07+00:00
+
+      <html>...
+
+- index.jsonl: one line per page with its segment, offset and length, so
+  any page is read with one seek and decompressed on its own
+
+Segments are written before the index line that points into them, so an
+interrupted write never leaves the index pointing at missing data.
+
+Replay streams the frames of one crawl, in page order, through a ParsePool:
+decompression and parsing both run in the worker processes, so a replay
+runs at disk speed times the number of cores. Its output is the raw CSV
+the crawl would have produced with the current parser.
+
+Usage:
+    python -m scraper.archive replay data/archive/mumbai data/raw/mumbai_raw_data.csv
+    python -m scraper.archive list data/archive/mumbai
+"""
+
+import argparse
+import gzip
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from scraper.config import (
+    ARCHIVE_COMPRESSION,
+    ARCHIVE_DIR,
+    ARCHIVE_SEGMENT_BYTES,
+    PARSER_BACKEND,
+)
+from scraper.dedup import ListingIndex
+from scraper.parse_pool import ParsePool
+from scraper.parser import BACKENDS
+from scraper.writer import RecordWriter
+
+# zstd is optional: gzip (standard library) is always available
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+INDEX_NAME = "index.jsonl"
+SEGMENT_PREFIX = "pages-"
+EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def new_crawl_id() -> str:
+    """Sortable identifier of one crawl: start time plus a random suffix."""
+    return time.strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+
+class PageArchive:
+    """Appends scraped pages to an archive directory. Thread-safe."""
+
+    def __init__(self, directory: str = ARCHIVE_DIR, compression: str = ARCHIVE_COMPRESSION,
+                 segment_bytes: int = ARCHIVE_SEGMENT_BYTES, crawl_id: str | None = None):
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unknown compression {compression!r}, expected one of {tuple(EXTENSIONS)}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package (pip install zstandard)")
+
+        self.directory = directory
+        self.compression = compression
+        self.segment_bytes = segment_bytes
+        self.crawl_id = crawl_id or new_crawl_id()
+        self.pages_written = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._compressor = zstandard.ZstdCompressor(level=3) if compression == "zstd" else None
+
+        # Appends continue the newest segment, unless it is full or was
+        # written with another compression
+        self._segment_number = max(_segment_numbers(directory), default=1)
+        if not os.path.exists(self._segment_path()):
+            if _segment_numbers(directory):
+                self._segment_number += 1
+        elif os.path.getsize(self._segment_path()) >= segment_bytes:
+            self._segment_number += 1
+
+        self._segment = open(self._segment_path(), "ab")
+        self._index = open(os.path.join(directory, INDEX_NAME), "a", encoding="utf-8")
+
+    def _segment_name(self) -> str:
+        return f"{SEGMENT_PREFIX}{self._segment_number:05d}{EXTENSIONS[self.compression]}"
+
+    def _segment_path(self) -> str:
+        return os.path.join(self.directory, self._segment_name())
+
+    def _compress(self, data: bytes) -> bytes:
+        if self._compressor is not None:
+            return self._compressor.compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    def append(self, url: str, html: str, page: int | None = None) -> dict:
+        """
+        Archives one page.
+
+        Returns:
+            dict: The page's index entry
+        """
+        fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        header = (
+            f"URL: {url}\nPage: {page if page is not None else ''}\n"
+            f"Crawl: {self.crawl_id}\nFetched-At: {fetched_at}\n\n"
+        )
+        frame = self._compress((header + html).encode("utf-8"))
+
+        with self._lock:
+            if self._segment.tell() and self._segment.tell() + len(frame) > self.segment_bytes:
+                self._segment.close()
+                self._segment_number += 1
+                self._segment = open(self._segment_path(), "ab")
+
+            offset = self._segment.tell()
+            self._segment.write(frame)
+            self._segment.flush()
+
+            entry = {
+                "segment": self._segment_name(),
+                "offset": offset,
+                "length": len(frame),
+                "url": url,
+                "page": page,
+                "crawl": self.crawl_id,
+                "fetched_at": fetched_at,
+            }
+            self._index.write(json.dumps(entry) + "\n")
+            self._index.flush()
+            self.pages_written += 1
+
+        return entry
+
+    def close(self):
+        """Flushes both files to disk."""
+        with self._lock:
+            for f in (self._segment, self._index):
+                if not f.closed:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _segment_numbers(directory: str) -> list:
+    """Numbers of the segments in an archive directory, any compression."""
+    numbers = []
+    for name in os.listdir(directory):
+        number = name[len(SEGMENT_PREFIX):].split(".")[0]
+        if name.startswith(SEGMENT_PREFIX) and number.isdigit():
+            numbers.append(int(number))
+    return numbers
+
+
+# ---------------- READING ---------------- #
+
+def read_index(directory: str) -> list:
+    """Every index entry of the archive, in the order pages were archived."""
+    entries = []
+    try:
+        with open(os.path.join(directory, INDEX_NAME), encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A line cut short by an interrupted write
+                    continue
+    except OSError:
+        pass
+    return entries
+
+
+def select_pages(entries: list, crawl: str = "latest") -> list:
+    """
+    Entries of one crawl ("latest", or a crawl id), or of every crawl
+    ("all"), in page order.
+
+    A page archived more than once within a crawl (pages re-fetched after a
+    resume) is kept once, in its last version.
+    """
+    if not entries:
+        return []
+
+    if crawl == "all":
+        crawls = list(dict.fromkeys(entry["crawl"] for entry in entries))
+    elif crawl == "latest":
+        crawls = [entries[-1]["crawl"]]
+    else:
+        crawls = [crawl]
+
+    selected = []
+    for crawl_id in crawls:
+        pages = {}
+        for entry in entries:
+            if entry["crawl"] == crawl_id:
+                pages[entry["page"] if entry["page"] is not None else entry["url"]] = entry
+        selected += sorted(
+            pages.values(),
+            key=lambda entry: (entry["page"] is None, entry["page"] or 0),
+        )
+    return selected
+
+
+def iter_frames(directory: str, entries: list):
+    """Yields the compressed frame of every entry, reading each segment in order."""
+    handles = {}
+    try:
+        for entry in entries:
+            f = handles.get(entry["segment"])
+            if f is None:
+                f = handles[entry["segment"]] = open(os.path.join(directory, entry["segment"]), "rb")
+            f.seek(entry["offset"])
+            yield f.read(entry["length"])
+    finally:
+        for f in handles.values():
+            f.close()
+
+
+def decode_frame(frame: bytes) -> tuple:
+    """
+    Decompresses one frame.
+
+    Returns:
+        tuple: (header dict, HTML)
+    """
+    if frame.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError("This archive needs the zstandard package to be read")
+        data = zstandard.ZstdDecompressor().decompress(frame)
+    elif frame.startswith(GZIP_MAGIC):
+        data = gzip.decompress(frame)
+    else:
+        raise ValueError("Not an archive frame")
+
+    header, _, html = data.decode("utf-8").partition("\n\n")
+    fields = dict(line.split(": ", 1) for line in header.splitlines() if ": " in line)
+    return fields, html
+
+
+def frame_html(frame: bytes) -> str:
+    """HTML of one frame (module-level so parse workers can unpickle it)."""
+    return decode_frame(frame)[1]
+
+
+def read_page(directory: str, entry: dict) -> str:
+    """HTML of one archived page."""
+    return frame_html(next(iter_frames(directory, [entry])))
+
+
+# ---------------- REPLAY ---------------- #
+
+def replay_archive(directory: str, output_path: str, crawl: str = "latest",
+                   workers: int | None = None, backend: str = PARSER_BACKEND) -> int:
+    """
+    Re-parses archived pages into a raw CSV, as the crawl would have written
+    it with the current parser.
+
+    Parameters:
+    - directory (str): Archive directory
+    - output_path (str): Raw CSV to write
+    - crawl (str): "latest", "all" or a crawl id (see select_pages)
+    - workers (int, optional): Parse processes (default: one per core)
+    - backend (str): Parser backend
+
+    Returns:
+    - int: Number of records written
+    """
+    entries = select_pages(read_index(directory), crawl)
+    if not entries:
+        print(f"No archived pages found in: {directory}")
+        return 0
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    writer = RecordWriter(output_path)
+    # Listings repeated across pages are dropped, exactly like in a crawl
+    listings = ListingIndex()
+    started = time.monotonic()
+
+    with ParsePool(workers, backend, decode=frame_html) as pool:
+        for records, _ in pool.map_ordered(iter_frames(directory, entries)):
+            writer.write(listings.filter(records))
+
+    if not writer.commit():
+        print("No records found in the archived pages.")
+        return 0
+
+    elapsed = time.monotonic() - started
+    print(f"Replayed {len(entries)} page(s) in {elapsed:.1f}s: "
+          f"{writer.records_written} properties saved to: {output_path}")
+    listings.report()
+    return writer.records_written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or replay a raw page archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay = commands.add_parser("replay", help="re-parse archived pages into a raw CSV")
+    replay.add_argument("directory")
+    replay.add_argument("output")
+    replay.add_argument("--crawl", default="latest", help='"latest", "all" or a crawl id')
+    replay.add_argument("--workers", type=int, default=None, help="parse processes")
+    replay.add_argument("--backend", default=PARSER_BACKEND, choices=BACKENDS)
+
+    listing = commands.add_parser("list", help="show the crawls stored in an archive")
+    listing.add_argument("directory")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "replay":
+        replay_archive(args.directory, args.output, args.crawl, args.workers, args.backend)
+    else:
+        crawls = {}
+        for entry in read_index(args.directory):
+            crawls.setdefault(entry["crawl"], []).append(entry)
+        for crawl_id, entries in crawls.items():
+            size = sum(entry["length"] for entry in entries)
+            print(f"{crawl_id}: {len(entries)} page(s), {size / 2**20:.1f} MB compressed, "
+                  f"{entries[0]['url']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+HTTP Response Cache
+
+Stores fetched HTML on disk so repeated runs over the same search do not
+re-download every page. Useful when iterating on the parser or the cleaner:
+a crawl can be replayed entirely from disk in offline ("cache-only") mode.
+
+Layout:
+- Every URL is addressed by the SHA-256 digest of the URL
+- <cache_dir>/<digest[:2]>/<digest>.html.gz holds the gzip-compressed page
+- <cache_dir>/<digest[:2]>/<digest>.json holds the URL, validators
+  (ETag / Last-Modified), store time and compressed size
+
+The modification time of the metadata file doubles as the "last used"
+timestamp for LRU eviction, so a cache hit costs a single utime call.
+
+Sizes and last-used times are also kept in an in-memory index, built
+from one directory scan (stat calls only) before the first write, and
+updated by every get, put and eviction. Once the cache passes max_bytes,
+the least recently used pages are evicted down to CACHE_EVICT_TO of it,
+so a full cache does not evict, and sort its index, on every write.
+Pages added or removed by another process sharing the directory are
+only seen by the next process that builds an index.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+from scraper.config import CACHE_DIR, CACHE_EVICT_TO, CACHE_MAX_BYTES, CACHE_TTL
+
+
+class CacheMissError(LookupError):
+    """Raised in offline mode when a page is not in the cache."""
+
+
+class CachedPage:
+    """A cached page body with the validators needed to revalidate it."""
+
+    def __init__(self, url: str, html: str, etag: str | None,
+                 last_modified: str | None, stored_at: float):
+        self.url = url
+        self.html = html
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+    def age(self) -> float:
+        """Seconds since the page was stored or last revalidated."""
+        return time.time() - self.stored_at
+
+    def conditional_headers(self) -> dict:
+        """Headers turning a GET into a conditional GET for this page."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Compressed on-disk page cache with TTL and size-based LRU eviction.
+    Safe to share between the worker threads of a crawl.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl: float = CACHE_TTL,
+                 max_bytes: int = CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        # metadata path -> [compressed size, last used]; None until needed
+        self._index = None
+        self._total_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        folder = os.path.join(self.cache_dir, digest[:2])
+        return (
+            os.path.join(folder, digest + ".html.gz"),
+            os.path.join(folder, digest + ".json"),
+        )
+
+    def _build_index(self):
+        """Sizes and last-used times of every cached page, from stat calls."""
+        self._index = {}
+        for folder, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                meta_path = os.path.join(folder, name)
+                try:
+                    last_used = os.stat(meta_path).st_mtime
+                    size = os.stat(_body_path(meta_path)).st_size
+                except OSError:
+                    continue
+                self._index[meta_path] = [size, last_used]
+        self._total_bytes = sum(size for size, _ in self._index.values())
+
+    def get(self, url: str) -> CachedPage | None:
+        """Returns the cached page for url (fresh or stale), or None."""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with gzip.open(body_path, "rt", encoding="utf-8") as f:
+                html = f.read()
+
+            # Mark as recently used for LRU eviction
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            if self._index is not None and meta_path in self._index:
+                self._index[meta_path][1] = time.time()
+
+        return CachedPage(
+            url, html, meta.get("etag"), meta.get("last_modified"), meta["stored_at"]
+        )
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return page.age() < self.ttl
+
+    def put(self, url: str, html: str, etag: str | None = None,
+            last_modified: str | None = None):
+        """Stores (or replaces) the page for url, evicting old pages if needed."""
+        body_path, meta_path = self._paths(url)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+
+        body = gzip.compress(html.encode("utf-8"))
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+            "size": len(body),
+        }
+
+        with self._lock:
+            if self._index is None:
+                self._build_index()
+            previous = self._index.get(meta_path, [0])[0]
+
+            # Write to temporary files first so readers never see half a page
+            _atomic_write(body_path, body)
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+            self._index[meta_path] = [len(body), time.time()]
+            self._total_bytes += len(body) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def refresh(self, url: str):
+        """Restarts the TTL of a page the server confirmed unchanged (HTTP 304)."""
+        _, meta_path = self._paths(url)
+        with self._lock:
+            try:
+                with open(meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                return
+            meta["stored_at"] = time.time()
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _evict(self):
+        """Deletes least recently used pages until the cache is back to CACHE_EVICT_TO."""
+        target = self.max_bytes * CACHE_EVICT_TO
+        entries = sorted(self._index.items(), key=lambda entry: entry[1][1])
+
+        for meta_path, (size, _) in entries:
+            if self._total_bytes <= target:
+                break
+            for path in (meta_path, _body_path(meta_path)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            del self._index[meta_path]
+            self._total_bytes -= size
+
+
+def _body_path(meta_path: str) -> str:
+    return meta_path[: -len(".json")] + ".html.gz"
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
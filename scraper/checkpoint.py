@@ -0,0 +1,89 @@
+"""
+Crawl Checkpoints
+
+Persists the progress of a crawl next to its raw CSV
+("<output>.checkpoint.json") so an interrupted crawl can continue from the
+last completed page instead of starting over from the search URL.
+
+A checkpoint holds:
+- start_url: the search the crawl belongs to
+- next_url / next_page: where to continue
+- pages_completed / records_written: progress so far
+- bytes_written: size of the CSV at checkpoint time; anything written
+  after it is discarded on resume, so no row is ever duplicated
+- fieldnames: CSV columns, needed to keep appending to the same file
+- seen: fingerprints (see scraper/dedup.py) of the listings met so far
+- crawl_id: identifier of the crawl in the page archive (scraper/archive.py),
+  so the pages of a resumed crawl are archived under the same crawl
+"""
+
+import json
+import os
+
+
+class CrawlCheckpoint:
+    """Resumable state of one crawl."""
+
+    def __init__(self, output_path: str, start_url: str):
+        self.path = output_path + ".checkpoint.json"
+        self.start_url = start_url
+        self.next_url = start_url
+        self.next_page = 1
+        self.pages_completed = 0
+        self.records_written = 0
+        self.bytes_written = 0
+        self.fieldnames = None
+        self.seen = set()
+        self.crawl_id = None
+
+    @classmethod
+    def load(cls, output_path: str, start_url: str):
+        """
+        Returns the saved checkpoint for this crawl, or None when there is
+        none (or it belongs to a different search URL).
+        """
+        checkpoint = cls(output_path, start_url)
+        try:
+            with open(checkpoint.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if state.get("start_url") != start_url:
+            print("Checkpoint belongs to a different search URL. Starting over.")
+            return None
+
+        checkpoint.next_url = state["next_url"]
+        checkpoint.next_page = state["next_page"]
+        checkpoint.pages_completed = state["pages_completed"]
+        checkpoint.records_written = state["records_written"]
+        checkpoint.bytes_written = state["bytes_written"]
+        checkpoint.fieldnames = state["fieldnames"]
+        checkpoint.seen = set(state["seen"])
+        checkpoint.crawl_id = state.get("crawl_id")
+        return checkpoint
+
+    def save(self):
+        """Writes the checkpoint atomically."""
+        state = {
+            "start_url": self.start_url,
+            "next_url": self.next_url,
+            "next_page": self.next_page,
+            "pages_completed": self.pages_completed,
+            "records_written": self.records_written,
+            "bytes_written": self.bytes_written,
+            "fieldnames": self.fieldnames,
+            "seen": sorted(self.seen),
+            "crawl_id": self.crawl_id,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def delete(self):
+        """Removes the checkpoint once the crawl has completed."""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
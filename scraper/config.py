@@ -8,6 +8,16 @@ update, and extend without touching core scraping logic.
 Contents:
 - HEADERS: HTTP request headers used to mimic a real browser and reduce blocking
 - DEFAULT_CITY: Fallback city value used when no city is explicitly provided
+- BASE_URL: Site root that relative pagination links are resolved against
+- PARSER_BACKEND: HTML parser used for listing pages ("bs4" or "lxml")
+- PARSE_WORKERS: Processes used to parse pages in parallel
+- MAX_WORKERS / MAX_PER_HOST: Limits for concurrent page fetching
+- POOL_SIZE / CONNECT_TIMEOUT / READ_TIMEOUT: HTTP session settings
+- RATE_LIMIT / MAX_RETRIES / BACKOFF_*: Request pacing and retry policy
+- CACHE_*: On-disk HTTP response cache settings
+- WRITE_BUFFER_RECORDS: Records held in memory before being flushed to disk
+- CHECKPOINT_EVERY: Pages scraped between two crawl checkpoints
+- ARCHIVE_*: Compressed archive of fetched pages, replayable offline
 """
 
 # HTTP headers used for all outgoing requests
@@ -21,3 +31,65 @@ HEADERS = {
 }
 
 DEFAULT_CITY = "Bhubaneswar"
+
+BASE_URL = "https://www.magicbricks.com"
+
+# "bs4" walks a BeautifulSoup tree (reference implementation),
+# "lxml" uses precompiled XPath on a raw lxml tree and is much faster.
+# Both backends produce identical records
+PARSER_BACKEND = "lxml"
+
+# Number of processes in the parse pool. 0 parses in the scraping process
+# itself, which is cheaper for small crawls than starting worker processes
+PARSE_WORKERS = 0
+
+# Concurrency settings for the page fetching engine
+# MAX_WORKERS controls how many result pages are kept in flight at once,
+# MAX_PER_HOST caps simultaneous requests to a single host regardless of workers
+MAX_WORKERS = 4
+MAX_PER_HOST = 4
+
+# HTTP session settings
+# POOL_SIZE is the number of keep-alive connections kept open per host.
+# Timeouts are in seconds: connecting fails fast, reading a page may be slow
+POOL_SIZE = 8
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+
+# Request pacing and retry policy
+# RATE_LIMIT is the sustained number of requests per second (None disables it),
+# RATE_BURST how many requests may be sent back to back before pacing kicks in.
+# Failed requests are retried with jittered exponential backoff:
+# BACKOFF_BASE * 2**attempt seconds, never more than BACKOFF_MAX
+RATE_LIMIT = 5.0
+RATE_BURST = 4
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# On-disk HTTP response cache
+# Pages younger than CACHE_TTL seconds are served without touching the network;
+# older ones are revalidated with a conditional GET. Least recently used pages
+# are evicted once the cache grows past CACHE_MAX_BYTES (compressed size),
+# down to CACHE_EVICT_TO of it so the next few writes do not evict again
+CACHE_DIR = "data/cache"
+CACHE_TTL = 24 * 60 * 60
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_EVICT_TO = 0.9
+
+# Raw CSV output is streamed page by page; at most this many records are
+# buffered in memory before they are written and flushed to disk
+WRITE_BUFFER_RECORDS = 500
+
+# A resumable checkpoint is written after every CHECKPOINT_EVERY pages
+# (and whenever a crawl stops on an error)
+CHECKPOINT_EVERY = 5
+
+# Append-only archive of every scraped page (see scraper/archive.py).
+# Each page is compressed on its own ("gzip", or "zstd" when the zstandard
+# package is installed) and a new segment file is started once the current
+# one grows past ARCHIVE_SEGMENT_BYTES
+ARCHIVE_DIR = "data/archive"
+ARCHIVE_COMPRESSION = "gzip"
+ARCHIVE_SEGMENT_BYTES = 256 * 1024 * 1024
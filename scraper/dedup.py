@@ -0,0 +1,120 @@
+"""
+Listing Deduplication
+
+MagicBricks repeats featured and sponsored cards across result pages, so the
+same listing can be scraped several times in one crawl. Every record is
+reduced to a 64-bit fingerprint of its normalized title, price, carpet area
+and society; a record whose fingerprint was already seen is dropped.
+
+Two sets of fingerprints are kept:
+- seen: listings met during the current crawl (also saved in checkpoints)
+- known: listings recorded by earlier runs, loaded from an optional on-disk
+  index so a crawl can keep only listings it has never scraped before
+
+The on-disk index is an append-only file of little-endian uint64 values.
+Membership tests are plain set lookups: constant time per record.
+"""
+
+import hashlib
+import os
+import re
+
+import numpy as np
+
+# Record fields that identify a listing
+FINGERPRINT_FIELDS = ("title", "price", "carpet_area", "society")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(value) -> str:
+    """Drops formatting noise: case, spacing, "₹" and thousands separators."""
+    if value is None:
+        return ""
+    value = str(value).replace(",", "").replace("₹", " ")
+    return _WHITESPACE_RE.sub(" ", value).strip().lower()
+
+
+def fingerprint(values) -> int:
+    """
+    64-bit fingerprint of the values that identify a listing, stable across
+    runs and processes. Shared with the database loader (utils/loader.py),
+    which identifies cleaned listings by the same fields.
+    """
+    key = "\x1f".join(_normalize(value) for value in values)
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def listing_fingerprint(record: dict) -> int:
+    """Fingerprint of a scraped record (its FINGERPRINT_FIELDS)."""
+    return fingerprint(record.get(field) for field in FINGERPRINT_FIELDS)
+
+
+class ListingIndex:
+    """
+    Filters duplicate listings out of a crawl.
+
+    Parameters:
+    - path (str, optional): On-disk index of listings from earlier runs.
+      Listings found there are skipped, and the new ones are appended to it
+      by save(). Without a path only duplicates within the crawl are removed
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self.seen = set()
+        self.known = set()
+        self.duplicates = 0
+        self.previously_seen = 0
+        self._added = []
+
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            # A torn final write leaves a partial value: ignore it
+            data = data[: len(data) - len(data) % 8]
+            self.known = set(np.frombuffer(data, dtype="<u8").tolist())
+
+    def filter(self, records: list) -> list:
+        """Returns the records that are neither repeats nor already known."""
+        unique = []
+        for record in records:
+            fingerprint = listing_fingerprint(record)
+
+            if fingerprint in self.seen:
+                self.duplicates += 1
+                continue
+            self.seen.add(fingerprint)
+
+            if fingerprint in self.known:
+                self.previously_seen += 1
+                continue
+
+            self._added.append(fingerprint)
+            unique.append(record)
+
+        return unique
+
+    def save(self):
+        """Appends the listings kept by this crawl to the on-disk index."""
+        if not self.path or not self._added:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(self.path, "ab") as f:
+            f.write(np.array(self._added, dtype="<u8").tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.known.update(self._added)
+        self._added = []
+
+    def report(self):
+        if self.duplicates:
+            print(f"Skipped {self.duplicates} duplicate listing(s) repeated within the crawl")
+        if self.previously_seen:
+            print(f"Skipped {self.previously_seen} listing(s) already scraped in earlier runs")
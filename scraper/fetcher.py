@@ -7,20 +7,237 @@ separated from parsing and scraping orchestration.
 
 Responsibilities:
 - Send HTTP GET requests with proper headers
+- Reuse keep-alive connections through a pooled session
+- Pace requests and retry transient failures (see scraper/throttle.py)
+- Serve and revalidate pages from the on-disk cache (see scraper/cache.py)
 - Handle request timeouts and HTTP errors
+- Cap the number of simultaneous requests sent to a single host
 - Return raw HTML content for downstream parsing
 """
 
+import threading
+import time
+from contextlib import nullcontext
+from typing import Literal
+
 import requests
-from scraper.config import HEADERS
+from requests.adapters import HTTPAdapter
+
+from scraper.config import (
+    CONNECT_TIMEOUT,
+    HEADERS,
+    MAX_PER_HOST,
+    POOL_SIZE,
+    RATE_LIMIT,
+    READ_TIMEOUT,
+)
+from scraper.cache import CacheMissError, ResponseCache
+from scraper.throttle import THROTTLE_STATUSES, HostLimiter, RetryPolicy, TokenBucket
+
+# Brotli is only advertised when a decoder is installed, otherwise urllib3
+# would hand back compressed bytes it cannot decode
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+
+class Fetcher:
+    """
+    Owns a pooled, keep-alive HTTP session used for a whole crawl.
 
+    A single Fetcher is meant to be shared by every page (and every worker
+    thread) of a crawl, so TCP/TLS connections are opened once and reused
+    instead of being re-established for each page.
 
-def fetch_page(url: str) -> str:
+    Rate limiting and retries are pluggable: pass a TokenBucket / RetryPolicy
+    to override the defaults from config, or rate_limiter=False /
+    retry_policy=False to disable them.
+
+    With a ResponseCache, fresh pages are served from disk, stale ones are
+    revalidated with a conditional GET, and offline=True never touches the
+    network at all (missing pages raise CacheMissError).
+
+    network_slots is an optional semaphore shared with other fetchers, e.g. a
+    multiprocessing.Manager().BoundedSemaphore used by every job of a batch:
+    each request holds one slot, capping the combined number of requests in
+    flight.
+
+    With a Metrics object (utils/metrics.py), requests, retries, bytes
+    downloaded and cache hits / misses / revalidations are counted.
+    """
+
+    def __init__(self, pool_size: int = POOL_SIZE, max_per_host: int = MAX_PER_HOST,
+                 connect_timeout: float = CONNECT_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT,
+                 rate_limiter: TokenBucket | Literal[False] | None = None,
+                 retry_policy: RetryPolicy | Literal[False] | None = None,
+                 cache: ResponseCache | None = None, offline: bool = False,
+                 network_slots=None, metrics=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.network_slots = network_slots
+        self.cache = cache
+        self.offline = offline
+        self.metrics = metrics
+
+        if offline and cache is None:
+            raise ValueError("Offline mode needs a ResponseCache to read pages from.")
+        self.limiter = HostLimiter(max_per_host)
+
+        if rate_limiter is None and RATE_LIMIT:
+            rate_limiter = TokenBucket()
+        self.rate_limiter = rate_limiter or None
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self.session.headers.update({
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+        })
+
+        # Pool enough connections for every concurrent request to a host
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=max(pool_size, max_per_host),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _get(self, url: str, headers: dict | None = None) -> requests.Response:
+        """Sends one paced, concurrency-limited GET request."""
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
+        slots = self.network_slots if self.network_slots is not None else nullcontext()
+
+        with slots, self.limiter.slot(url):
+            return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def fetch(self, url: str) -> str:
+        """
+        Fetches the HTML content of a given URL, from the cache when possible.
+
+        Raises:
+            CacheMissError: In offline mode, if the page was never cached
+            PermissionError: If access is blocked (HTTP 403)
+            requests.HTTPError: For other HTTP errors, once retries run out
+            requests.RequestException: For network errors, once retries run out
+        """
+        if self.cache is None:
+            return self._fetch_network(url).text
+
+        cached = self.cache.get(url)
+
+        if self.offline:
+            if cached is None:
+                self._count("cache.misses")
+                raise CacheMissError(f"Offline mode: {url} is not in the cache.")
+            self._count("cache.hits")
+            return cached.html
+
+        if cached is not None and self.cache.is_fresh(cached):
+            self._count("cache.hits")
+            return cached.html
+
+        self._count("cache.stale" if cached is not None else "cache.misses")
+
+        # Stale (or missing) page: ask the server whether it changed
+        headers = cached.conditional_headers() if cached else None
+        response = self._fetch_network(url, headers)
+
+        if response.status_code == 304 and cached is not None:
+            self._count("cache.revalidated")
+            self.cache.refresh(url)
+            return cached.html
+
+        self.cache.put(
+            url,
+            response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return response.text
+
+    def _fetch_network(self, url: str, headers: dict | None = None) -> requests.Response:
+        """
+        Fetches a URL over the pooled session.
+
+        Transient failures (connection errors, timeouts, 429 and 5xx) are
+        retried according to the retry policy. Throttling responses also
+        shrink the per-host concurrency limit.
+        """
+        attempt = 0
+
+        while True:
+            try:
+                response = self._get(url, headers)
+            except (requests.ConnectionError, requests.Timeout):
+                self._count("http.network_errors")
+                if not (self.retry_policy and self.retry_policy.should_retry(attempt, None)):
+                    raise
+                time.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+                self._count("http.retries")
+                continue
+
+            self._count("http.requests")
+            self._count(f"http.status.{response.status_code}")
+            self._count("http.bytes", len(response.content))
+
+            # Explicitly handle forbidden access (common in cloud environments)
+            if response.status_code == 403:
+                raise PermissionError(
+                    "403 Forbidden: Access blocked by MagicBricks (cloud environment detected)."
+                )
+
+            if response.status_code in THROTTLE_STATUSES:
+                self.limiter.record_throttle(url)
+
+            if response.ok:
+                self.limiter.record_success(url)
+                return response
+
+            if not (self.retry_policy and self.retry_policy.should_retry(attempt, response.status_code)):
+                # Raise exception for other HTTP errors
+                response.raise_for_status()
+
+            time.sleep(self.retry_policy.delay(attempt, response.headers.get("Retry-After")))
+            attempt += 1
+            self._count("http.retries")
+
+    def _count(self, name: str, value: int = 1):
+        if self.metrics is not None:
+            self.metrics.incr(name, value)
+
+    def close(self):
+        """Closes every pooled connection."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_default_fetcher = None
+_default_lock = threading.Lock()
+
+
+def fetch_page(url: str, fetcher: Fetcher | None = None) -> str:
     """
     Fetches the HTML content of a given URL.
 
     Args:
         url (str): The page URL to fetch
+        fetcher (Fetcher, optional): Session to use. Defaults to a shared
+            module-level Fetcher so ad-hoc calls still reuse connections
 
     Returns:
         str: Raw HTML content of the page
@@ -28,20 +245,14 @@ def fetch_page(url: str) -> str:
     Raises:
         PermissionError: If access is blocked (HTTP 403)
         requests.HTTPError: For other HTTP errors
+        CacheMissError: If the fetcher is offline and the page is not cached
     """
-    response = requests.get(
-        url,
-        headers=HEADERS,   # Mimic a real browser to reduce blocking
-        timeout=30
-    )
-
-    # Explicitly handle forbidden access (common in cloud environments)
-    if response.status_code == 403:
-        raise PermissionError(
-            "403 Forbidden: Access blocked by MagicBricks (cloud environment detected)."
-        )
+    global _default_fetcher
 
-    # Raise exception for other HTTP errors
-    response.raise_for_status()
+    if fetcher is None:
+        with _default_lock:
+            if _default_fetcher is None:
+                _default_fetcher = Fetcher()
+        fetcher = _default_fetcher
 
-    return response.text
+    return fetcher.fetch(url)
@@ -0,0 +1,174 @@
+"""
+lxml Parser Backend
+
+Fast drop-in alternative to the BeautifulSoup code in parser.py.
+
+The page is parsed straight into a plain lxml tree, cards and the "Next"
+link are located with precompiled XPath expressions (matching runs in C),
+and each card's subtree is walked once instead of once per field, with
+the fields dispatched through the compiled schema plan (scraper/schema.py).
+Text is extracted with the same rules as BeautifulSoup's `.text`
+(comments and script/style/template/ruby strings are skipped), which keeps
+the records identical to the bs4 backend.
+"""
+
+from lxml import etree
+
+from scraper.paginator import absolute_url
+from scraper.schema import PLAN, SUMMARY_TAG, ExtractionPlan
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching one class token, like bs4's class_ filter."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+CARDS = etree.XPath(f"//div[{_has_class('mb-srp__list')}]")
+NEXT_LINK = etree.XPath("//a[@title='Next']")
+
+# Strings BeautifulSoup does not include in `.text`
+SKIPPED_TAGS = {"script", "style", "template", "rt", "rp"}
+
+# BeautifulSoup collapses whitespace-only strings to "\n" or " ",
+# except inside these tags
+PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+ASCII_SPACES = " \n\t\x0c\r"
+
+# Plain etree parser: lxml.html's custom element classes slow every lookup down
+_PARSER = etree.HTMLParser(encoding="utf-8")
+
+
+def parse_document(html: str):
+    """Parses page HTML into an lxml tree (None for empty documents)."""
+    try:
+        # Encoded first: lxml rejects str input carrying an XML encoding declaration
+        return etree.fromstring(html.encode("utf-8"), parser=_PARSER)
+    except etree.XMLSyntaxError:
+        return None
+
+
+def _string(text: str, preserve: bool) -> str:
+    """Applies BeautifulSoup's whitespace collapsing to one string node."""
+    if preserve or text.strip(ASCII_SPACES):
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def _text(element) -> str:
+    """Equivalent of BeautifulSoup's tag.text.strip()."""
+    # Fast path for the common case of a tag holding a single string:
+    # whitespace collapsing cannot change the stripped result
+    if not len(element):
+        return (element.text or "").strip()
+
+    parts = []
+    preserve = any(
+        node.tag in PRESERVE_WHITESPACE_TAGS for node in element.iterancestors()
+    )
+    stack = [(element, preserve)]
+
+    while stack:
+        node, preserve = stack.pop()
+        if isinstance(node, str):
+            parts.append(_string(node, preserve))
+            continue
+
+        if node.tag in SKIPPED_TAGS:
+            continue
+
+        preserve = preserve or node.tag in PRESERVE_WHITESPACE_TAGS
+        if node.text:
+            parts.append(_string(node.text, preserve))
+
+        # Children are pushed in reverse so they pop in document order,
+        # each child followed by its tail text (which belongs to node)
+        for child in reversed(node):
+            if child.tail:
+                stack.append((child.tail, preserve))
+            if isinstance(child.tag, str):
+                stack.append((child, preserve))
+
+    return "".join(parts).strip()
+
+
+def _classes(element) -> list:
+    value = element.get("class")
+    return value.split() if value else []
+
+
+def _first_div_text(parent, class_name: str) -> str:
+    """Text of the first descendant div carrying class_name, or ""."""
+    for div in parent.iter("div"):
+        if div is not parent and class_name in _classes(div):
+            return _text(div)
+    return ""
+
+
+def extract_properties(root, plan: ExtractionPlan = PLAN) -> list:
+    """
+    Extract property details from an lxml tree of a MagicBricks page.
+
+    Each card's subtree is walked once; every element is dispatched on its
+    tag and attributes through the plan instead of running one search per
+    field. Only the first match of each field counts, as with bs4's find().
+    """
+    properties = []
+    if root is None:
+        return properties
+
+    # plan.match() inlined: this loop runs for every element of every card
+    by_tag, by_summary = plan.by_tag, plan.by_summary
+    total_fields, total_card_fields = len(plan.fields), len(plan.card_fields)
+
+    for prop in CARDS(root):
+        record = plan.new_record()
+        found = set()
+        card_fields_found = 0
+
+        for element in prop.iter(*plan.tags):
+            if element is prop:
+                continue
+
+            # Classes are only looked at while a card field is still missing
+            class_fields = by_tag.get(element.tag) if card_fields_found < total_card_fields else None
+            if class_fields:
+                for class_name in _classes(element):
+                    field = class_fields.get(class_name)
+                    if field:
+                        if field not in found:
+                            found.add(field)
+                            card_fields_found += 1
+                            record[field] = _text(element)
+                        break
+
+            summary = element.get("data-summary")
+            if summary is not None and element.tag == SUMMARY_TAG and summary in by_summary:
+                field, class_name = by_summary[summary]
+                if field not in found:
+                    found.add(field)
+                    record[field] = _first_div_text(element, class_name)
+
+            if len(found) == total_fields:
+                break
+
+        properties.append(record)
+
+    return properties
+
+
+def find_next_page_url(root) -> str | None:
+    """Returns the next page URL from an lxml tree, otherwise None."""
+    if root is None:
+        return None
+
+    links = NEXT_LINK(root)
+    if links and links[0].get("href"):
+        return absolute_url(links[0].get("href"))
+
+    return None
+
+
+def parse_page(html: str) -> tuple:
+    """lxml counterpart of parser.parse_page: (records, next page URL)."""
+    root = parse_document(html)
+    return extract_properties(root), find_next_page_url(root)
@@ -3,20 +3,80 @@ Pagination Handler
 
 Extracts the URL of the next results page from MagicBricks HTML.
 Used to navigate through paginated property listings.
+
+Also predicts the URLs of upcoming pages from the page number carried in
+the query string, so several pages can be fetched concurrently.
 """
 
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 from bs4 import BeautifulSoup
 
+from scraper.config import BASE_URL
+
 
 def get_next_page_url(html: str) -> str | None:
     """
     Returns the next page URL if pagination exists, otherwise None.
     """
-    soup = BeautifulSoup(html, "lxml")
+    return find_next_page_url(BeautifulSoup(html, "lxml"))
 
+
+def find_next_page_url(soup: BeautifulSoup) -> str | None:
+    """
+    Same as get_next_page_url, but works on an already parsed document
+    so callers that also extract listings do not parse the page twice.
+    """
     next_btn = soup.find("a", attrs={"title": "Next"})
 
     if next_btn and next_btn.get("href"):
-        return "https://www.magicbricks.com" + next_btn["href"]
+        return absolute_url(next_btn["href"])
+
+    return None
+
+
+def absolute_url(href: str) -> str:
+    """Resolves a "Next" link: site-relative links are joined to BASE_URL."""
+    return href if urlsplit(href).scheme else BASE_URL + href
+
+
+def detect_page_param(current_url: str, next_url: str) -> str | None:
+    """
+    Finds the query parameter that carries the page number.
+
+    The parameter must be numeric in next_url and either missing from
+    current_url (first page) or exactly one lower. Returns None when the
+    pagination scheme cannot be inferred safely.
+    """
+    current = dict(parse_qsl(urlsplit(current_url).query))
+    upcoming = parse_qsl(urlsplit(next_url).query)
+
+    for key, value in upcoming:
+        if not value.isdigit():
+            continue
+        previous = current.get(key)
+        if previous is None or (previous.isdigit() and int(previous) + 1 == int(value)):
+            if previous is None and int(value) != 2:
+                continue
+            return key
 
     return None
+
+
+def page_number(url: str, page_param: str) -> int | None:
+    """Page number carried by the page parameter of url, or None."""
+    value = dict(parse_qsl(urlsplit(url).query)).get(page_param)
+    return int(value) if value is not None and value.isdigit() else None
+
+
+def predict_page_url(template_url: str, page_param: str, page_number: int) -> str:
+    """
+    Builds the URL of a given page by rewriting the page parameter
+    of a known pagination URL, keeping every other parameter untouched.
+    """
+    parts = urlsplit(template_url)
+    query = [
+        (key, str(page_number) if key == page_param else value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query)))
@@ -0,0 +1,77 @@
+"""
+Parallel Parse Stage
+
+HTML parsing is CPU-bound, so threads cannot speed it up (GIL). This module
+hands fetched HTML to a pool of parser processes instead, keeping network
+I/O in the scraping process and parsing on every available core.
+
+- ParsePool.submit / ParsePool.parse: parse single pages in a worker process
+- ParsePool.map_ordered: stream many pages through the pool with a bounded
+  number of pages in flight (backpressure), yielding results in input order
+
+With a decode function, the pool is fed encoded pages (e.g. compressed
+archive frames, see scraper/archive.py) and decoding happens in the worker
+processes too.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+
+from scraper.config import PARSER_BACKEND
+from scraper.parser import parse_page
+
+
+def _parse_item(item, backend: str, decode=None) -> tuple:
+    html = decode(item) if decode else item
+    return parse_page(html, backend)
+
+
+class ParsePool:
+    """Process pool running parser.parse_page on raw HTML."""
+
+    def __init__(self, workers: int | None = None, backend: str = PARSER_BACKEND,
+                 decode=None):
+        self.workers = workers or os.cpu_count() or 1
+        # decode must be picklable (a module-level function)
+        self._parse = partial(_parse_item, backend=backend, decode=decode)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def submit(self, html: str) -> Future:
+        """Schedules one page; the future resolves to (records, next_url)."""
+        return self._executor.submit(self._parse, html)
+
+    def parse(self, html: str) -> tuple:
+        """Parses one page in a worker process and waits for the result."""
+        return self.submit(html).result()
+
+    def map_ordered(self, htmls, max_pending: int | None = None):
+        """
+        Parses an iterable of HTML pages, yielding (records, next_url) per page
+        in input order.
+
+        At most max_pending pages (default: twice the worker count) are
+        queued at once. The input iterable is only advanced when a slot frees
+        up, so a slow consumer (e.g. the CSV writer) throttles the producer
+        instead of letting parsed pages pile up in memory.
+        """
+        max_pending = max_pending or self.workers * 2
+        pending = deque()
+
+        for html in htmls:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(self.submit(html))
+
+        while pending:
+            yield pending.popleft().result()
+
+    def close(self):
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
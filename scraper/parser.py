@@ -5,23 +5,81 @@ structured property information.
 This module is responsible ONLY for:
 - Reading HTML content
 - Locating property cards
-- Extracting visible text fields safely
+- Extracting visible text fields safely, as declared in scraper/schema.py
 - Returning clean Python dictionaries
 
 It does NOT handle:
 - HTTP requests
-- Pagination
+- Pagination (parse_page only reuses its parsed tree for the paginator)
 - File saving
+
+Two interchangeable backends are available, selected with PARSER_BACKEND
+in scraper/config.py or the backend argument: "bs4" (the functions below)
+and "lxml" (scraper/lxml_parser.py).
 """
 
 from bs4 import BeautifulSoup
 
+from scraper import lxml_parser
+from scraper.config import PARSER_BACKEND
+from scraper.paginator import find_next_page_url
+from scraper.schema import PLAN, ExtractionPlan
+
+BACKENDS = ("bs4", "lxml")
+
+
+def _check_backend(backend: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}, expected one of {BACKENDS}")
+
+
+def parse_page(html: str, backend: str = PARSER_BACKEND) -> tuple:
+    """
+    Parses a results page once and returns everything the scraper needs.
+
+    Args:
+        html (str): Raw page HTML
+        backend (str): "bs4" or "lxml" (see scraper/lxml_parser.py)
 
-def parse_properties(html: str) -> list:
+    Returns:
+        tuple: (list of property records, next page URL or None)
+    """
+    _check_backend(backend)
+    if backend == "lxml":
+        return lxml_parser.parse_page(html)
+
+    soup = BeautifulSoup(html, "lxml")
+    return extract_properties(soup), find_next_page_url(soup)
+
+
+def parse_properties(html: str, backend: str = PARSER_BACKEND) -> list:
     """Extract property details from a MagicBricks HTML page."""
-    
+    _check_backend(backend)
+    if backend == "lxml":
+        return lxml_parser.extract_properties(lxml_parser.parse_document(html))
+
     # Parse HTML using BeautifulSoup
-    soup = BeautifulSoup(html, "lxml")
+    return extract_properties(BeautifulSoup(html, "lxml"))
+
+
+# Helper function to safely extract text
+# Prevents errors if a tag is missing
+def safe_text(parent, selector, attr=None, value=None):
+    tag = (
+        parent.find(selector, attrs={attr: value})
+        if attr else parent.find(selector)
+    )
+    return tag.text.strip() if tag else ""
+
+
+def extract_properties(soup: BeautifulSoup, plan: ExtractionPlan = PLAN) -> list:
+    """
+    Extract property details from an already parsed MagicBricks page.
+
+    The fields come from the schema (scraper/schema.py): each card's
+    elements are visited once and dispatched through the compiled plan.
+    Only the first match of each field counts, as with find().
+    """
     properties = []
 
     # Each property listing is wrapped inside this div
@@ -29,73 +87,27 @@ def parse_properties(html: str) -> list:
 
     for prop in cards:
         # Default structure for one property
-        record = {
-            "title": "",
-            "price": "",
-            "carpet_area": "",
-            "furnishing": "",
-            "status": "",
-            "society": "",
-            "car_parking": "",
-            "bathrooms": ""
-        }
-
-        # Helper function to safely extract text
-        # Prevents errors if a tag is missing
-        def safe_text(parent, selector, attr=None, value=None):
-            tag = (
-                parent.find(selector, attrs={attr: value})
-                if attr else parent.find(selector)
-            )
-            return tag.text.strip() if tag else ""
-
-        # Property title
-        record["title"] = safe_text(prop, "h2", "class", "mb-srp__card--title")
-
-        # Price value
-        record["price"] = safe_text(prop, "div", "class", "mb-srp__card__price--amount")
+        record = plan.new_record()
+        found = set()
 
-        # Carpet area (sqft)
-        carpet = prop.find("div", attrs={"data-summary": "carpet-area"})
-        if carpet:
-            record["carpet_area"] = safe_text(
-                carpet, "div", "class", "mb-srp__card__summary--value"
+        for element in prop.find_all(plan.tags):
+            card_field, summary = plan.match(
+                element.name, element.get("class") or (), element.get("data-summary")
             )
 
-        # Furnishing status
-        furnishing = prop.find("div", attrs={"data-summary": "furnishing"})
-        if furnishing:
-            record["furnishing"] = safe_text(
-                furnishing, "div", "class", "mb-srp__card__summary--value"
-            )
-
-        # Construction status (Ready / Under Construction)
-        status = prop.find("div", attrs={"data-summary": "status"})
-        if status:
-            record["status"] = safe_text(
-                status, "div", "class", "mb-srp__card__summary--label"
-            )
+            # Title, price: the element's own text
+            if card_field and card_field not in found:
+                found.add(card_field)
+                record[card_field] = element.text.strip()
 
-        # Society / Project name
-        society = prop.find("div", attrs={"data-summary": "society"})
-        if society:
-            record["society"] = safe_text(
-                society, "div", "class", "mb-srp__card__summary--value"
-            )
+            # Summary blocks: text of the value (or label) div inside
+            if summary and summary[0] not in found:
+                field, class_name = summary
+                found.add(field)
+                record[field] = safe_text(element, "div", "class", class_name)
 
-        # Parking information
-        parking = prop.find("div", attrs={"data-summary": "parking"})
-        if parking:
-            record["car_parking"] = safe_text(
-                parking, "div", "class", "mb-srp__card__summary--value"
-            )
-
-        # Number of bathrooms
-        bathroom = prop.find("div", attrs={"data-summary": "bathroom"})
-        if bathroom:
-            record["bathrooms"] = safe_text(
-                bathroom, "div", "class", "mb-srp__card__summary--value"
-            )
+            if len(found) == len(plan.fields):
+                break
 
         # Add extracted property to list
         properties.append(record)
@@ -0,0 +1,111 @@
+"""
+Listing Schema
+
+Declares, in one place, every field scraped from a property card and where
+its text lives on the card. Both parser backends (scraper/parser.py and
+scraper/lxml_parser.py) extract records from the compiled plan of this
+schema, and the raw CSV columns follow it, in declaration order.
+
+Two kinds of fields:
+- CARD_FIELDS: record field -> (tag, class) of the element holding the text
+- SUMMARY_FIELDS: record field -> (data-summary key, "value" or "label").
+  Summary blocks are the <div data-summary="..."> entries of a card; the
+  text is in the block's first div with the value or label class
+
+Adding a field is one line here: extraction visits every card's elements
+once and dispatches them through dictionaries (compile_plan), so the cost
+per card does not grow with the number of fields.
+"""
+
+TITLE_CLASS = "mb-srp__card--title"
+PRICE_CLASS = "mb-srp__card__price--amount"
+VALUE_CLASS = "mb-srp__card__summary--value"
+LABEL_CLASS = "mb-srp__card__summary--label"
+
+# Class of the div holding a summary block's text
+PARTS = {"value": VALUE_CLASS, "label": LABEL_CLASS}
+
+# Tag of the summary blocks
+SUMMARY_TAG = "div"
+
+CARD_FIELDS = {
+    "title": ("h2", TITLE_CLASS),
+    "price": ("div", PRICE_CLASS),
+}
+
+SUMMARY_FIELDS = {
+    "carpet_area": ("carpet-area", "value"),
+    "furnishing": ("furnishing", "value"),
+    # Construction status (Ready / Under Construction) is shown as the label
+    "status": ("status", "label"),
+    "society": ("society", "value"),
+    "car_parking": ("parking", "value"),
+    "bathrooms": ("bathroom", "value"),
+    "floor": ("floor", "value"),
+    "facing": ("facing", "value"),
+    "transaction": ("transaction", "value"),
+}
+
+# Raw CSV columns, in order
+RAW_FIELDS = list(CARD_FIELDS) + list(SUMMARY_FIELDS)
+
+
+class ExtractionPlan:
+    """
+    A schema compiled into lookup tables for single-pass extraction.
+
+    - tags: tags worth visiting inside a card
+    - by_tag: tag -> {class -> card field}
+    - by_summary: data-summary key -> (field, class of the text div)
+    - template: empty record, copied for every card
+    """
+
+    def __init__(self, card_fields: dict, summary_fields: dict):
+        self.fields = list(card_fields) + list(summary_fields)
+        self.card_fields = list(card_fields)
+        self.template = dict.fromkeys(self.fields, "")
+
+        self.by_tag = {}
+        for field, (tag, class_name) in card_fields.items():
+            self.by_tag.setdefault(tag, {})[class_name] = field
+        self.by_summary = {}
+        for field, (key, part) in summary_fields.items():
+            if part not in PARTS:
+                raise ValueError(f"Summary field {field!r}: part must be one of {tuple(PARTS)}")
+            self.by_summary[key] = (field, PARTS[part])
+
+        self.tags = sorted(set(self.by_tag) | {SUMMARY_TAG})
+
+    def new_record(self) -> dict:
+        return self.template.copy()
+
+    def match(self, tag: str, classes, summary: str | None):
+        """
+        Fields an element provides.
+
+        Returns:
+            tuple: (card field or None, (summary field, text class) or None)
+        """
+        card_field = None
+        class_fields = self.by_tag.get(tag)
+        if class_fields:
+            for class_name in classes:
+                card_field = class_fields.get(class_name)
+                if card_field:
+                    break
+
+        summary_field = None
+        if summary is not None and tag == SUMMARY_TAG:
+            summary_field = self.by_summary.get(summary)
+
+        return card_field, summary_field
+
+
+def compile_plan(card_fields: dict = CARD_FIELDS,
+                 summary_fields: dict = SUMMARY_FIELDS) -> ExtractionPlan:
+    """Compiles a field declaration into an ExtractionPlan."""
+    return ExtractionPlan(card_fields, summary_fields)
+
+
+# Plan of the declared schema, used by both parser backends
+PLAN = compile_plan()
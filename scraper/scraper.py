@@ -7,76 +7,394 @@ available result pages, extracts structured property data, and saves it as a raw
 
 Key responsibilities:
 - Fetch HTML pages using a resilient fetcher
-- Parse property cards into structured records
+- Keep several pages in flight at once when the page URLs can be predicted
+- Parse property cards into structured records, optionally in a process pool
+- Drop listings repeated across pages (and optionally across runs)
 - Handle pagination until no next page exists
-- Save all collected records into a raw CSV file
+- Stream collected records into a raw CSV file as pages are scraped
+- Checkpoint progress so an interrupted crawl can be resumed
+- Optionally archive every page's HTML for later replay (see scraper/archive.py)
+- Time every stage (fetch, parse, paginate, write) and count pages, cards
+  and duplicates (see utils/metrics.py)
 
 This module is intentionally kept clean and focused only on data ingestion.
 All data cleaning, normalization, and feature engineering are handled separately
 inside utils/data_cleaner.py.
 """
 
-import csv
 import os
-from scraper.fetcher import fetch_page
-from scraper.parser import parse_properties
-from scraper.paginator import get_next_page_url
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
+from scraper.archive import PageArchive
+from scraper.cache import ResponseCache
+from scraper.checkpoint import CrawlCheckpoint
+from scraper.config import (
+    ARCHIVE_COMPRESSION,
+    CACHE_DIR,
+    CHECKPOINT_EVERY,
+    MAX_PER_HOST,
+    MAX_WORKERS,
+    PARSE_WORKERS,
+)
+from scraper.dedup import ListingIndex
+from scraper.fetcher import Fetcher
+from scraper.parse_pool import ParsePool
+from scraper.parser import parse_page
+from scraper.paginator import detect_page_param, page_number, predict_page_url
+from scraper.schema import RAW_FIELDS
+from scraper.writer import RecordWriter
+from utils.metrics import Metrics
 
-def run_scraper(start_url: str, output_path: str):
-    """
-    Scrapes MagicBricks property data starting from the given URL
-    and saves raw data to the specified output path.
-
-    Parameters:
-    - start_url (str): MagicBricks search results URL provided by the user
-    - output_path (str): Full file path where raw CSV data will be saved
-    """
 
-    # Ensure the raw data directory exists before saving the file
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+class ScrapeCancelled(Exception):
+    """Raised inside a crawl when its cancel event is set."""
 
-    all_records = []
-    current_url = start_url
-    page_count = 1
 
-    # Loop through paginated result pages
+def _crawl_sequential(current_url: str, page_count: int, emit, fetch, parse):
+    """Follows "Next" links one page at a time, starting at current_url."""
     while current_url:
         print(f"Scraping page {page_count}")
 
         # Fetch HTML content of the current page
-        html = fetch_page(current_url)
+        html = fetch(current_url)
 
-        # Parse property listings from the page
-        records = parse_properties(html)
+        # Parse property listings and the next page link in a single pass
+        records, next_url = parse(html)
 
         # Stop if no records are found (safety check)
         if not records:
             print("No records found on this page. Stopping pagination.")
-            break
+            return
 
-        # Accumulate all property records
-        all_records.extend(records)
+        # Stream the page's records to the writer
+        emit(page_count, current_url, html, records, next_url)
 
-        # Get the next page URL (if available)
-        next_url = get_next_page_url(html)
+        # Stop when there is no next page
         if not next_url:
             print("No next page found. Scraping completed.")
-            break
+            return
 
         current_url = next_url
         page_count += 1
 
-    # Exit early if scraping returned no data
-    if not all_records:
+
+def _crawl_concurrent(template_url: str, page_param: str, first_page: int, emit,
+                      fetch, parse, workers: int, metrics: Metrics):
+    """
+    Fetches predicted pages concurrently, starting with page first_page
+    (whose URL is template_url).
+
+    Up to `workers` pages are in flight at any time. Results are consumed
+    strictly in page order, so records are emitted exactly as a sequential
+    crawl would emit them. Every consumed page is still checked for a
+    "Next" link; if the site stops paginating or links to a URL that differs
+    from the prediction, the speculative requests are dropped.
+
+    Each worker thread fetches and then parses its page, so with a process
+    parse pool the parsing of one page overlaps the download of the next.
+    The window of `workers` pages bounds how much HTML is held at once.
+
+    Returns:
+        tuple: (url to continue sequentially from or None, last page number)
+    """
+    pending = deque()
+    next_page = first_page
+    page_count = first_page
+
+    def fetch_and_parse(url):
+        html = fetch(url)
+        return (html, *parse(html))
+
+    def last_page_known():
+        # A page already fetched without records or "Next" link ends the
+        # crawl, so nothing past it is worth requesting
+        for _, _, future in pending:
+            if future.done() and future.exception() is None:
+                _, records, next_url = future.result()
+                if not records or not next_url:
+                    return True
+        return False
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+
+        def fill_window():
+            nonlocal next_page
+            while len(pending) < workers and not last_page_known():
+                url = predict_page_url(template_url, page_param, next_page)
+                pending.append((next_page, url, pool.submit(fetch_and_parse, url)))
+                next_page += 1
+
+        try:
+            fill_window()
+
+            while pending:
+                page_count, url, future = pending.popleft()
+                print(f"Scraping page {page_count}")
+
+                html, records, next_url = future.result()
+
+                if not records:
+                    print("No records found on this page. Stopping pagination.")
+                    return None, page_count
+
+                emit(page_count, url, html, records, next_url)
+
+                if not next_url:
+                    print("No next page found. Scraping completed.")
+                    return None, page_count
+
+                # The site links somewhere we did not predict (another page
+                # number, or other parameters): fall back
+                with metrics.stage("paginate"):
+                    expected = predict_page_url(template_url, page_param, page_count + 1)
+                    predicted = (
+                        page_number(next_url, page_param) == page_count + 1
+                        and predict_page_url(next_url, page_param, page_count + 1) == expected
+                    )
+                if not predicted:
+                    metrics.incr("pages.prediction_misses")
+                    return next_url, page_count + 1
+
+                fill_window()
+        finally:
+            # Drop speculative requests that are no longer needed
+            for _, _, future in pending:
+                future.cancel()
+
+    return None, page_count
+
+
+def _crawl(start_url: str, first_page: int, fetch, parse, workers: int, emit,
+           metrics: Metrics):
+    """
+    Crawls every result page reachable from start_url (page number first_page).
+
+    emit(page_number, url, html, records, next_url) is called once per page
+    with records, in page order; next_url is None for the last page.
+    """
+    # The first page is always fetched on its own: its "Next" link tells us
+    # how the site numbers pages, which is what makes prediction possible
+    print(f"Scraping page {first_page}")
+    html = fetch(start_url)
+    records, next_url = parse(html)
+    if records:
+        emit(first_page, start_url, html, records, next_url)
+
+    if not records:
+        print("No records found on this page. Stopping pagination.")
+    elif not next_url:
+        print("No next page found. Scraping completed.")
+    else:
+        with metrics.stage("paginate"):
+            page_param = detect_page_param(start_url, next_url)
+        page_count = first_page + 1
+
+        if workers > 1 and page_param:
+            next_url, page_count = _crawl_concurrent(
+                next_url, page_param, page_count, emit, fetch, parse, workers, metrics
+            )
+
+        # Sequential crawl: default mode, or fallback when prediction fails
+        if next_url:
+            _crawl_sequential(next_url, page_count, emit, fetch, parse)
+
+
+def run_scraper(start_url: str, output_path: str, workers: int = MAX_WORKERS,
+                max_per_host: int = MAX_PER_HOST, fetcher: Fetcher | None = None,
+                cache_dir: str | None = None, offline: bool = False,
+                parse_workers: int = PARSE_WORKERS, resume: bool = False,
+                seen_index: str | None = None, progress=None, cancel=None,
+                metrics: Metrics | None = None, archive_dir: str | None = None,
+                archive_compression: str = ARCHIVE_COMPRESSION):
+    """
+    Scrapes MagicBricks property data starting from the given URL
+    and saves raw data to the specified output path.
+
+    Parameters:
+    - start_url (str): MagicBricks search results URL provided by the user
+    - output_path (str): Full file path where raw CSV data will be saved
+    - workers (int): Number of pages fetched concurrently (1 = sequential)
+    - max_per_host (int): Maximum simultaneous requests to the same host
+    - fetcher (Fetcher, optional): Pooled session to reuse, e.g. across
+      several cities. A private one is created (and closed) otherwise
+    - cache_dir (str, optional): Directory of the on-disk page cache.
+      Caching is disabled when None, unless offline is set
+    - offline (bool): Replay the crawl purely from the cache, no network
+    - parse_workers (int): Processes used for parsing (0 = parse in-process)
+    - resume (bool): Continue from the checkpoint of an interrupted crawl of
+      the same start_url, if there is one
+    - seen_index (str, optional): On-disk index of listings scraped by
+      earlier runs. Those listings are skipped and the new ones are added.
+      Listings repeated within the crawl are always skipped
+    - progress (callable, optional): Called after every page with a dict of
+      pages, records and elapsed seconds
+    - cancel (threading.Event, optional): Stops the crawl after the current
+      page when set. Progress is checkpointed like for any other early stop,
+      and ScrapeCancelled is raised
+    - metrics (Metrics, optional): Collects stage timings and counters of
+      the crawl. A private fetcher reports its HTTP and cache counters to
+      it as well; a fetcher passed in reports to its own metrics, if any
+    - archive_dir (str, optional): Append the HTML of every scraped page to
+      the page archive in this directory, so the crawl can be replayed
+      later with a newer parser (scraper/archive.py)
+    - archive_compression (str): "gzip" or "zstd" frames for the archive
+
+    Returns:
+    - int: Number of properties in the raw CSV; 0 when nothing was scraped,
+      in which case no file is written (an older one is left untouched)
+    """
+
+    # Ensure the raw data directory exists before saving the file
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    if metrics is None:
+        metrics = Metrics("scrape")
+
+    # One pooled session is shared by every page of the crawl
+    owns_fetcher = fetcher is None
+    if owns_fetcher:
+        if offline and cache_dir is None:
+            cache_dir = CACHE_DIR
+        cache = ResponseCache(cache_dir) if cache_dir else None
+        fetcher = Fetcher(max_per_host=max_per_host, cache=cache, offline=offline,
+                          metrics=metrics)
+
+    # Parsing runs in worker processes when requested, in-process otherwise
+    parse_pool = ParsePool(parse_workers) if parse_workers > 0 else None
+    parse_html = parse_pool.parse if parse_pool else parse_page
+
+    def fetch(url):
+        with metrics.stage("fetch"):
+            return fetcher.fetch(url)
+
+    def parse(html):
+        with metrics.stage("parse"):
+            records, next_url = parse_html(html)
+        metrics.observe("cards_per_page", len(records))
+        return records, next_url
+
+    # Records are written page by page instead of being kept in memory
+    writer = RecordWriter(output_path)
+
+    # Drops repeated (and, with seen_index, previously scraped) listings
+    listings = ListingIndex(seen_index)
+
+    checkpoint = CrawlCheckpoint.load(output_path, start_url) if resume else None
+
+    # Rows are appended under the checkpoint's columns, which must still be
+    # the schema's (scraper/schema.py)
+    if checkpoint and checkpoint.fieldnames != RAW_FIELDS:
+        print("Checkpoint was written with different columns. Starting over.")
+        checkpoint = None
+
+    if checkpoint and not writer.resume(checkpoint.fieldnames, checkpoint.bytes_written,
+                                        checkpoint.records_written):
+        print("Checkpoint's CSV is missing or incomplete. Starting over.")
+        checkpoint = None
+
+    if checkpoint:
+        print(
+            f"Resuming after page {checkpoint.next_page - 1} "
+            f"({checkpoint.records_written} properties already saved)"
+        )
+        # Listings written before the interruption are not written again
+        listings.seen = checkpoint.seen
+    else:
+        checkpoint = CrawlCheckpoint(output_path, start_url)
+        checkpoint.seen = listings.seen
+
+    # A resumed crawl keeps archiving under its original crawl id
+    archive = None
+    if archive_dir:
+        archive = PageArchive(archive_dir, archive_compression, crawl_id=checkpoint.crawl_id)
+        checkpoint.crawl_id = archive.crawl_id
+
+    def save_checkpoint():
+        # Only flushed rows are covered, so the checkpoint matches the file
+        with metrics.stage("checkpoint"):
+            writer.flush()
+            if writer.fieldnames is None:
+                return
+            checkpoint.records_written = writer.records_written
+            checkpoint.bytes_written = writer.bytes_written
+            checkpoint.fieldnames = writer.fieldnames
+            checkpoint.save()
+
+    started = time.monotonic()
+
+    def emit(page_number, url, html, records, next_url):
+        if archive:
+            with metrics.stage("archive"):
+                archive.append(url, html, page_number)
+
+        # The checkpoint shares the index's set of seen fingerprints
+        with metrics.stage("write"):
+            kept = listings.filter(records)
+            writer.write(kept)
+        metrics.incr("pages")
+        metrics.incr("records.scraped", len(records))
+        metrics.incr("records.written", len(kept))
+        metrics.incr("records.dropped_duplicates", len(records) - len(kept))
+        checkpoint.next_url = next_url
+        checkpoint.next_page = page_number + 1
+        checkpoint.pages_completed += 1
+
+        if next_url and checkpoint.pages_completed % CHECKPOINT_EVERY == 0:
+            save_checkpoint()
+
+        if progress:
+            progress({
+                "pages": checkpoint.pages_completed,
+                "records": writer.total_records,
+                "elapsed": time.monotonic() - started,
+            })
+
+        if next_url and cancel is not None and cancel.is_set():
+            raise ScrapeCancelled("Scraping cancelled")
+
+    error = None
+
+    try:
+        if checkpoint.next_url:
+            _crawl(checkpoint.next_url, checkpoint.next_page, fetch,
+                   parse, workers, emit, metrics)
+    except Exception as e:
+        # Keep what was gathered so far; the error is re-raised once saved
+        print(f"Scraping stopped early: {e}")
+        error = e
+        save_checkpoint()
+    finally:
+        if owns_fetcher:
+            fetcher.close()
+        if parse_pool:
+            parse_pool.close()
+        if archive:
+            archive.close()
+
+    # The index records every listing that made it into a raw CSV
+    listings.save()
+    listings.report()
+
+    if error is None:
+        checkpoint.delete()
+    elif writer.fieldnames is not None:
+        print("Progress saved. Run again with resume enabled to continue.")
+
+    metrics.event("scrape_finished", output=output_path, error=error and str(error),
+                  pages=checkpoint.pages_completed, records=writer.total_records)
+
+    # Publish the raw CSV (nothing is created if scraping returned no data)
+    records = 0
+    if not writer.commit():
         print("No data scraped.")
-        return
+    else:
+        records = writer.records_written
+        print(f"\nScraped {records} properties")
+        print(f"Raw data saved to: {output_path}")
 
-    # Write scraped data to raw CSV
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=all_records[0].keys())
-        writer.writeheader()
-        writer.writerows(all_records)
+    if error is not None:
+        raise error
 
-    print(f"\nScraped {len(all_records)} properties")
-    print(f"Raw data saved to: {output_path}")
+    return records
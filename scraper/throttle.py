@@ -0,0 +1,183 @@
+"""
+Request Throttling
+
+Keeps the crawl at the highest request rate MagicBricks tolerates without
+getting the scraper banned.
+
+Contents:
+- TokenBucket: paces requests to a sustained rate with a small burst allowance
+- RetryPolicy: decides whether and how long to wait before retrying a request
+- HostLimiter: per-host concurrency cap that shrinks when the site throttles
+  us (429/503) and grows back once requests succeed again
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from scraper.config import (
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    MAX_PER_HOST,
+    MAX_RETRIES,
+    RATE_BURST,
+    RATE_LIMIT,
+    RETRY_STATUSES,
+)
+
+# Status codes the site uses to tell us to slow down
+THROTTLE_STATUSES = {429, 503}
+
+
+class TokenBucket:
+    """
+    Classic token bucket shared by all threads of a crawl.
+
+    Tokens refill continuously at `rate` per second up to `capacity`;
+    every request consumes one token and waits when the bucket is empty.
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT, capacity: int = RATE_BURST):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available, then consumes it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Converts a Retry-After header into seconds.
+
+    The header is either a number of seconds or an HTTP date.
+    Returns None when the header is missing or malformed.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff that honours Retry-After.
+
+    Connection errors, timeouts and the statuses in `retry_statuses` are
+    retried up to `max_retries` times. Everything else (403 included) is
+    final: a blocked client does not get unblocked by insisting.
+    """
+
+    def __init__(self, max_retries: int = MAX_RETRIES, backoff_base: float = BACKOFF_BASE,
+                 backoff_max: float = BACKOFF_MAX, retry_statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = set(retry_statuses)
+
+    def should_retry(self, attempt: int, status_code: int | None) -> bool:
+        """status_code is None when the request failed before any response."""
+        if attempt >= self.max_retries:
+            return False
+        return status_code is None or status_code in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """Seconds to wait before retry number `attempt + 1`."""
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.backoff_max)
+
+        # "Full jitter": spreads retries of concurrent workers apart
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+class HostLimiter:
+    """
+    Bounds the number of in-flight requests per host.
+
+    The limit adapts (additive increase, multiplicative decrease): every
+    throttling response halves it, and every `recovery_after` consecutive
+    successes raise it by one, up to `max_per_host`.
+    """
+
+    def __init__(self, max_per_host: int = MAX_PER_HOST, recovery_after: int = 10):
+        self.max_per_host = max(1, max_per_host)
+        self.recovery_after = recovery_after
+        self._hosts = {}
+        self._cond = threading.Condition()
+
+    def _state(self, url: str) -> dict:
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = {"limit": self.max_per_host, "active": 0, "successes": 0}
+        return self._hosts[host]
+
+    def limit(self, url: str) -> int:
+        """Current concurrency limit for the URL's host."""
+        with self._cond:
+            return self._state(url)["limit"]
+
+    @contextmanager
+    def slot(self, url: str):
+        """Blocks until a request slot for the URL's host is available."""
+        with self._cond:
+            state = self._state(url)
+            while state["active"] >= state["limit"]:
+                self._cond.wait()
+            state["active"] += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                state["active"] -= 1
+                self._cond.notify_all()
+
+    def record_throttle(self, url: str):
+        """The host asked us to slow down: halve its concurrency."""
+        with self._cond:
+            state = self._state(url)
+            state["limit"] = max(1, state["limit"] // 2)
+            state["successes"] = 0
+
+    def record_success(self, url: str):
+        """A request went through: slowly win back concurrency."""
+        with self._cond:
+            state = self._state(url)
+            state["successes"] += 1
+            if state["successes"] >= self.recovery_after and state["limit"] < self.max_per_host:
+                state["limit"] += 1
+                state["successes"] = 0
+                self._cond.notify_all()
@@ -0,0 +1,135 @@
+"""
+Streaming Raw CSV Writer
+
+Writes scraped records to disk while the crawl is running instead of
+keeping the whole crawl in memory, so memory use stays flat regardless
+of how many pages a search has.
+
+Records go to a temporary "<output>.part" file, flushed every
+WRITE_BUFFER_RECORDS records. The file is atomically renamed to the final
+output path on commit, so readers never see a half-written CSV.
+
+A writer can also resume an earlier, interrupted file (see
+scraper/checkpoint.py): the file is cut back to the last checkpointed size
+and new records are appended after it. Rows are encoded before they are
+written to the (binary) file, so that size is an exact byte count.
+"""
+
+import csv
+import io
+import os
+
+from scraper.config import WRITE_BUFFER_RECORDS
+
+
+class RecordWriter:
+    """Buffered, append-only CSV writer for property records."""
+
+    def __init__(self, output_path: str, buffer_size: int = WRITE_BUFFER_RECORDS):
+        self.output_path = output_path
+        self.part_path = output_path + ".part"
+        self.buffer_size = max(1, buffer_size)
+        self.records_written = 0
+        self.fieldnames = None
+
+        self._buffer = []
+        self._file = None
+        self._writer = None
+        # Rows are formatted here, then encoded and appended to _file
+        self._text = io.StringIO(newline="")
+        self._bytes = 0
+
+    def _start(self, fieldnames, mode: str):
+        self.fieldnames = list(fieldnames)
+        self._file = open(self.part_path, mode)
+        self._writer = csv.DictWriter(self._text, fieldnames=self.fieldnames)
+
+    def _open(self, fieldnames):
+        self._start(fieldnames, "wb")
+        self._writer.writeheader()
+
+    def resume(self, fieldnames: list, bytes_written: int, records_written: int) -> bool:
+        """
+        Continues a previous file, keeping only its first bytes_written bytes.
+
+        The previous file is either the .part file of a crawl that was killed,
+        or the published output of a crawl that stopped on an error.
+
+        Returns:
+            bool: False, with nothing changed, when neither file exists or it
+            is shorter than bytes_written: the crawl has to start over
+        """
+        path = self.part_path if os.path.exists(self.part_path) else self.output_path
+        if not os.path.exists(path) or os.path.getsize(path) < bytes_written:
+            return False
+
+        if path != self.part_path:
+            os.replace(self.output_path, self.part_path)
+
+        with open(self.part_path, "r+b") as f:
+            f.truncate(bytes_written)
+
+        self._start(fieldnames, "ab")
+        self._bytes = bytes_written
+        self.records_written = records_written
+        return True
+
+    def write(self, records: list):
+        """Queues records, flushing to disk once the buffer is full."""
+        self._buffer.extend(records)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Writes buffered records to the .part file and flushes it."""
+        if not self._buffer:
+            return
+
+        # Columns are taken from the first record, like the original writer
+        if self._writer is None:
+            self._open(self._buffer[0].keys())
+
+        self._writer.writerows(self._buffer)
+        self._write_text()
+        self.records_written += len(self._buffer)
+        self._buffer.clear()
+
+    def _write_text(self):
+        """Appends the formatted rows (and header) to the .part file."""
+        data = self._text.getvalue().encode("utf-8")
+        self._text.seek(0)
+        self._text.truncate()
+        self._file.write(data)
+        self._file.flush()
+        self._bytes += len(data)
+
+    def commit(self) -> bool:
+        """
+        Flushes everything and moves the .part file to the output path.
+
+        Returns:
+            bool: False if no record was ever written (no file is created)
+        """
+        self.flush()
+        if self._file is None:
+            return False
+
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.part_path, self.output_path)
+        return True
+
+    def close(self):
+        """Closes the .part file without publishing it."""
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+
+    @property
+    def bytes_written(self) -> int:
+        """Size of the .part file, i.e. everything flushed so far."""
+        return self._bytes
+
+    @property
+    def total_records(self) -> int:
+        """Records written plus records still waiting in the buffer."""
+        return self.records_written + len(self._buffer)
@@ -0,0 +1,44 @@
+"""Rollup queries on empty databases and on listings without a price."""
+
+import pandas as pd
+
+from utils.aggregates import bhk_counts, furnishing_mix, price_per_sqft_stats, refresh_rollups
+from utils.loader import load_dataset
+
+
+def listing(locality, price_per_sqft, carpet_area_sqft=1000):
+    return {"project_name": f"{locality} Towers", "property_type": "Flat",
+            "listing_type": "for Sale", "city": "Pune", "locality": locality,
+            "furnishing": "Furnished", "status": "Ready to Move", "bhk": 2, "bathrooms": "2",
+            "price_lakh": int(price_per_sqft * carpet_area_sqft / 100_000),
+            "carpet_area_sqft": carpet_area_sqft, "price_per_sqft": price_per_sqft}
+
+
+def test_queries_on_a_database_nothing_was_loaded_into(tmp_path):
+    db_path = str(tmp_path / "empty.db")
+
+    assert price_per_sqft_stats(db_path=db_path).empty
+    assert bhk_counts(db_path=db_path).empty
+    assert furnishing_mix(db_path=db_path).empty
+
+
+def test_listings_without_a_price_do_not_count_towards_min_listings(tmp_path):
+    rows = [listing("Baner", 9000.0), listing("Baner", 11000.0)]
+    # Aundh has one priced listing and two without a price
+    rows += [listing("Aundh", 8000.0), listing("Aundh", 0.0, 1001), listing("Aundh", 0.0, 1002)]
+    pd.DataFrame(rows).to_csv(tmp_path / "cleaned.csv", index=False)
+
+    db_path = str(tmp_path / "listings.db")
+    load_dataset(str(tmp_path / "cleaned.csv"), db_path)
+    refresh_rollups(db_path)
+
+    stats = price_per_sqft_stats(city="Pune", min_listings=2, db_path=db_path)
+    assert stats["locality"].tolist() == ["Baner"]
+    assert stats["listings"].tolist() == [2]
+    assert stats["ppsf_mean"].tolist() == [10000.0]
+
+    city = price_per_sqft_stats(by="city", db_path=db_path)
+    assert city["listings"].tolist() == [3]
+
+    # Counts still include every listing
+    assert bhk_counts(city="Pune", db_path=db_path)["listings"].tolist() == [5]
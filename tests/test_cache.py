@@ -0,0 +1,79 @@
+"""LRU eviction of the page cache down to its low-water mark."""
+
+import os
+import random
+
+import pytest
+
+from scraper import cache as cache_module
+from scraper.cache import ResponseCache
+from scraper.config import CACHE_EVICT_TO
+
+# Unaffected by the scans fixture
+walk = os.walk
+
+
+def page(n: int) -> str:
+    # Random text: gzip cannot shrink it much, so every page has a similar size
+    rng = random.Random(n)
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(2_000))
+
+
+def cached_bytes(cache_dir) -> int:
+    return sum(
+        os.path.getsize(os.path.join(folder, name))
+        for folder, _, files in walk(cache_dir)
+        for name in files if name.endswith(".html.gz")
+    )
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Counts the directory scans of the cache."""
+    calls = []
+
+    def counting_walk(*args, **kwargs):
+        calls.append(args)
+        return walk(*args, **kwargs)
+
+    monkeypatch.setattr(cache_module.os, "walk", counting_walk)
+    return calls
+
+
+def test_evicts_least_recently_used_pages_down_to_the_low_water_mark(tmp_path, scans):
+    cache = ResponseCache(str(tmp_path), max_bytes=40_000)
+    evictions = 0
+
+    for n in range(100):
+        cache.put(f"https://example.com/{n}", page(n))
+        # Page 0 stays in use, so it is never the least recently used
+        assert cache.get("https://example.com/0") is not None
+        size = cached_bytes(tmp_path)
+        assert size <= cache.max_bytes
+        if n and size < previous:
+            evictions += 1
+            assert size <= cache.max_bytes * CACHE_EVICT_TO
+        previous = size
+
+    # Each eviction makes room for several pages, not just the next one
+    assert 0 < evictions < 40
+    assert cache.get("https://example.com/1") is None
+    assert cache.get("https://example.com/99") is not None
+    # The directory was scanned once, before the first write
+    assert len(scans) == 1
+
+
+def test_index_is_built_from_an_existing_cache(tmp_path):
+    first = ResponseCache(str(tmp_path), max_bytes=40_000)
+    for n in range(10):
+        first.put(f"https://example.com/{n}", page(n))
+    size = cached_bytes(tmp_path)
+
+    second = ResponseCache(str(tmp_path), max_bytes=size + 1_000)
+    # Replacing a page does not count its old size twice
+    second.put("https://example.com/0", page(0))
+    assert cached_bytes(tmp_path) == size
+
+    second.put("https://example.com/new", page(100))
+    assert cached_bytes(tmp_path) <= second.max_bytes * CACHE_EVICT_TO
+    assert second.get("https://example.com/new") is not None
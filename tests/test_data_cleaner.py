@@ -0,0 +1,267 @@
+"""Title parsing, the chunked mode's median, chunked vs in-memory and incremental cleaning."""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import write_raw_csv
+from utils import data_cleaner
+from utils.data_cleaner import PROPERTY_WORDS, TITLE_FIELDS, _median_from_counts, parse_titles
+from utils.storage import read_processed
+
+
+# ---------------- ORIGINAL ROW-WISE IMPLEMENTATION ---------------- #
+# As it was in clean_data before title parsing was vectorized
+
+def original_parse_titles(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["bhk"] = df["title"].str.extract(r"(\d+)\s*BHK")[0]
+    df["bhk"] = df["bhk"].fillna(0).astype(int)
+    df["property_type"] = df["title"].str.extract(r"BHK\s+(\w+)")[0].str.title()
+    df["listing_type"] = df["title"].str.extract(r"(for Sale|for Rent)")[0]
+
+    def extract_project_name(row):
+        society = str(row.get("society", "")).strip()
+        title = str(row.get("title", "")).lower()
+
+        if society and society.lower() not in PROPERTY_WORDS:
+            return society
+
+        if " in " in title:
+            after_in = title.split(" in ", 1)[1]
+            parts = [p.strip() for p in after_in.split(",")]
+
+            if len(parts) >= 3:
+                candidate = parts[0]
+            elif len(parts) == 2:
+                candidate = parts[0]
+            else:
+                candidate = ""
+
+            if candidate and candidate.lower() not in PROPERTY_WORDS:
+                return candidate.title()
+
+        return "Independent Property"
+
+    df["project_name"] = df.apply(extract_project_name, axis=1)
+
+    def extract_locality_city(title):
+        if pd.isna(title) or " in " not in title:
+            return pd.Series(["Unknown", "Unknown"])
+
+        location = title.split(" in ", 1)[1].strip()
+        parts = [p.strip() for p in location.split(",")]
+
+        if location.endswith("New Delhi"):
+            city = "New Delhi"
+            locality = parts[-2] if len(parts) >= 2 else "Unknown"
+            return pd.Series([locality, city])
+
+        if len(parts) >= 2:
+            city = parts[-1]
+            locality = parts[-2]
+            return pd.Series([locality, city])
+
+        words = parts[0].split()
+        if len(words) >= 2:
+            return pd.Series([" ".join(words[:-1]), words[-1]])
+
+        return pd.Series(["Unknown", "Unknown"])
+
+    df[["locality", "city"]] = df["title"].apply(extract_locality_city)
+    return df[TITLE_FIELDS]
+
+
+# ---------------- FUZZED TITLES ---------------- #
+
+def fuzzed_listings(count: int, seed: int) -> pd.DataFrame:
+    rng = random.Random(seed)
+    heads = ["", "2 BHK", "3BHK", "10 BHK", "1 RK", "bhk", "4 BHK  "]
+    kinds = ["Flat", "Villa", "House", "apartment", "Plot", "Studio", "Penthouse", ""]
+    listings = ["for Sale", "for Rent", "for sale", ""]
+    parts = ["Lodha Park", "Worli", "Mumbai", "flat", "Andheri West", "Anna Nagar Chennai",
+             "New Delhi", "Vasant Kunj", " ", "", "Sector 5 ", "in", "Salt Lake\tKolkata"]
+    societies = [np.nan, "", " ", "flat", "Villa", "Prestige Heights", "  DLF Park  ", "nan"]
+
+    titles, society = [], []
+    for _ in range(count):
+        if rng.random() < 0.03:
+            titles.append(np.nan)
+        else:
+            location = rng.choice([", ", ",", " , ", " "]).join(
+                rng.choice(parts) for _ in range(rng.randint(0, 4))
+            )
+            if rng.random() < 0.2:
+                location += rng.choice([", New Delhi", " New Delhi", "New Delhi"])
+            separator = rng.choice([" in ", " in ", " in ", " In ", " in  ", " "])
+            if rng.random() < 0.1:
+                location += " in " + rng.choice(parts)
+            titles.append(" ".join([rng.choice(heads), rng.choice(kinds),
+                                    rng.choice(listings)]) + separator + location)
+        society.append(rng.choice(societies))
+
+    return pd.DataFrame({"title": titles, "society": society}, dtype=object)
+
+
+def comparable(df: pd.DataFrame) -> pd.DataFrame:
+    """Object columns with None for every kind of missing value."""
+    df = df.astype(object)
+    return df.where(df.notna(), None).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_parse_titles_matches_original(seed):
+    df = fuzzed_listings(5_000, seed)
+
+    expected = comparable(original_parse_titles(df))
+    actual = comparable(parse_titles(df["title"], df["society"])[TITLE_FIELDS])
+
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_parse_titles_on_a_typical_title():
+    titles = pd.Series(["3 BHK Flat for Sale in Lodha Park, Worli, Mumbai",
+                        "2 BHK Apartment for Rent in Vasant Kunj, New Delhi",
+                        "1 BHK Flat for Sale in Anna Nagar Chennai"])
+    out = parse_titles(titles)
+
+    assert out["bhk"].tolist() == [3, 2, 1]
+    assert out["project_name"].tolist() == ["Lodha Park", "Vasant Kunj", "Independent Property"]
+    assert out["locality"].tolist() == ["Worli", "Vasant Kunj", "Anna Nagar"]
+    assert out["city"].tolist() == ["Mumbai", "New Delhi", "Chennai"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_median_from_counts_matches_pandas(seed):
+    rng = np.random.default_rng(seed)
+    values = pd.Series(rng.choice([np.nan, 450.0, 600.5, 900.0, 1200.0, 1e6], size=rng.integers(1, 60)))
+    counts = pd.Series(dtype=float)
+    for start in range(0, len(values), 7):
+        part = values.iloc[start:start + 7]
+        counts = counts.add(part.value_counts().astype(float), fill_value=0)
+
+    expected = values.median()
+    actual = _median_from_counts(counts)
+    assert actual == expected or (np.isnan(actual) and np.isnan(expected))
+
+
+def test_chunked_clean_matches_in_memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_cleaner, "PROCESSED_DIR", str(tmp_path))
+    raw_path = write_raw_csv(str(tmp_path / "raw.csv"), 3_000, missing_rate=0.2, seed=7)
+
+    whole = data_cleaner.clean_data(raw_path, "whole.csv")
+    chunked = data_cleaner.clean_data(raw_path, "chunked.csv", chunksize=700)
+
+    assert open(whole, "rb").read() == open(chunked, "rb").read()
+
+
+# ---------------- INCREMENTAL CLEANING ---------------- #
+
+def clean_both(raw_path, output_format="csv"):
+    """Incremental and full clean of raw_path; returns both outputs."""
+    incremental = data_cleaner.clean_data(raw_path, "incremental.csv", output_format=output_format,
+                                          incremental=True)
+    full = data_cleaner.clean_data(raw_path, "full.csv", output_format=output_format)
+    if output_format == "csv":
+        return open(incremental, "rb").read(), open(full, "rb").read()
+    return read_processed(incremental), read_processed(full)
+
+
+def test_incremental_appends_rows_added_to_the_raw_file(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(data_cleaner, "PROCESSED_DIR", str(tmp_path))
+    raw_path = write_raw_csv(str(tmp_path / "raw.csv"), 2_000, missing_rate=0.2, seed=3)
+    body = open(raw_path, "rb").read().split(b"\n", 1)[1]
+
+    clean_both(raw_path)
+    # A copy of every row: the median and the project-name decision stay put
+    with open(raw_path, "ab") as f:
+        f.write(body)
+    incremental, full = clean_both(raw_path)
+    assert incremental == full
+    assert "Cleaning 2000 appended row(s), reusing 2000" in capsys.readouterr().out
+
+    # An interrupted append left a partial row behind: it is cut off
+    with open(tmp_path / "incremental.csv", "ab") as f:
+        f.write(b"partial,row")
+    with open(raw_path, "ab") as f:
+        f.write(body + body)
+    incremental, full = clean_both(raw_path)
+    assert incremental == full
+    assert "Cleaning 4000 appended row(s), reusing 4000" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_incremental_merges_other_changes(tmp_path, monkeypatch, output_format):
+    monkeypatch.setattr(data_cleaner, "PROCESSED_DIR", str(tmp_path))
+    raw_path = write_raw_csv(str(tmp_path / "all.csv"), 6_000, missing_rate=0.2, seed=5)
+    lines = open(raw_path, "rb").read().splitlines(keepends=True)
+
+    def check(rows):
+        with open(tmp_path / "raw.csv", "wb") as f:
+            f.write(b"".join(rows))
+        incremental, full = clean_both(str(tmp_path / "raw.csv"), output_format)
+        if output_format == "csv":
+            assert incremental == full
+        else:
+            pd.testing.assert_frame_equal(incremental, full)
+
+    check(lines[:2_000])
+    check(lines[:2_001])           # appended, the median moves
+    check(lines[:6_000])
+    check(lines[:4_000])           # rows removed
+    check(lines[:100] + [lines[200]] + lines[101:4_000])   # a row changed
+
+
+def test_incremental_merges_when_a_column_changes_type(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(data_cleaner, "PROCESSED_DIR", str(tmp_path))
+    raw = pd.read_csv(write_raw_csv(str(tmp_path / "raw.csv"), 500, seed=6))
+    raw["bathrooms"] = 2
+    raw.to_csv(tmp_path / "raw.csv", index=False)
+
+    clean_both(str(tmp_path / "raw.csv"))
+    capsys.readouterr()
+    raw.iloc[:1].assign(bathrooms="10+").to_csv(tmp_path / "raw.csv", mode="a", header=False,
+                                                index=False)
+    incremental, full = clean_both(str(tmp_path / "raw.csv"))
+    assert incremental == full
+    # bathrooms is now text in every row: nothing can be appended or reused
+    assert "Cleaning 501 new or changed row(s), reusing 0" in capsys.readouterr().out
+
+
+def test_incremental_matches_full_clean_when_project_names_appear(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(data_cleaner, "PROCESSED_DIR", str(tmp_path))
+    raw = pd.read_csv(write_raw_csv(str(tmp_path / "raw.csv"), 300, seed=8))
+    # No society (a property word) and no project in the title: project
+    # names are dropped
+    raw["society"] = "Flat"
+    raw["title"] = "2 BHK Flat for Sale in Worli"
+    raw.to_csv(tmp_path / "raw.csv", index=False)
+    clean_both(str(tmp_path / "raw.csv"))
+    assert "project_name" not in pd.read_csv(tmp_path / "incremental.csv").columns
+
+    raw.iloc[:1].assign(title="3 BHK Flat for Sale in Acme Towers, Worli, Mumbai").to_csv(
+        tmp_path / "raw.csv", mode="a", header=False, index=False)
+    capsys.readouterr()
+    incremental, full = clean_both(str(tmp_path / "raw.csv"))
+
+    assert incremental == full
+    assert incremental.rstrip().splitlines()[-1].startswith(b"Acme Towers,")
+    assert "Cleaning 301 new or changed row(s), reusing 0" in capsys.readouterr().out
+
+
+def test_incremental_matches_full_clean_when_the_median_moves(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(data_cleaner, "PROCESSED_DIR", str(tmp_path))
+    raw = pd.read_csv(write_raw_csv(str(tmp_path / "raw.csv"), 300, missing_rate=0.3, seed=9))
+    raw.to_csv(tmp_path / "raw.csv", index=False)
+    clean_both(str(tmp_path / "raw.csv"))
+
+    # Larger units than any before: the median carpet area goes up
+    raw.iloc[:200].assign(carpet_area="90000 sqft").to_csv(
+        tmp_path / "raw.csv", mode="a", header=False, index=False)
+    capsys.readouterr()
+    incremental, full = clean_both(str(tmp_path / "raw.csv"))
+
+    assert incremental == full
+    assert "new or changed row(s)" in capsys.readouterr().out
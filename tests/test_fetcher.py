@@ -0,0 +1,114 @@
+"""Retry, backoff and adaptive concurrency of the Fetcher, against the local stand-in."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from benchmarks.standin import StandInServer
+from scraper.fetcher import Fetcher
+from scraper.throttle import HostLimiter, RetryPolicy, parse_retry_after
+from utils.metrics import Metrics
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Records the fetcher's retry waits instead of sleeping."""
+    recorded = []
+    monkeypatch.setattr("scraper.fetcher.time.sleep", recorded.append)
+    return recorded
+
+
+def make_fetcher(max_retries=3, backoff_base=0.01, max_per_host=4, metrics=None):
+    return Fetcher(
+        max_per_host=max_per_host,
+        rate_limiter=False,
+        retry_policy=RetryPolicy(max_retries, backoff_base),
+        metrics=metrics,
+    )
+
+
+def test_transient_errors_are_retried_until_success(sleeps):
+    metrics = Metrics("test")
+    with StandInServer(pages=1, error_rate=0.5, retry_after=None, seed=3) as server:
+        with make_fetcher(max_retries=10, metrics=metrics) as fetcher:
+            html = fetcher.fetch(server.start_url)
+        stats = server.stats()
+
+    assert "mb-srp__list" in html
+    assert stats["responses"][200] == 1
+    assert stats["requests"] > 1
+    assert metrics.snapshot()["counters"]["http.retries"] == stats["requests"] - 1
+    assert len(sleeps) == stats["requests"] - 1
+
+
+def test_backoff_grows_exponentially_with_full_jitter(sleeps):
+    with StandInServer(pages=1, error_rate=1.0, retry_after=None) as server:
+        with make_fetcher(max_retries=4, backoff_base=0.5) as fetcher:
+            with pytest.raises(requests.HTTPError):
+                fetcher.fetch(server.start_url)
+        assert server.stats()["requests"] == 5
+
+    assert len(sleeps) == 4
+    for attempt, delay in enumerate(sleeps):
+        assert 0 <= delay <= 0.5 * 2 ** attempt
+
+
+def test_retry_after_header_sets_the_delay(sleeps):
+    with StandInServer(pages=1, throttle_rate=1.0, retry_after=2) as server:
+        with make_fetcher(max_retries=2) as fetcher:
+            with pytest.raises(requests.HTTPError) as error:
+                fetcher.fetch(server.start_url)
+
+    assert error.value.response.status_code == 429
+    assert sleeps == [2.0, 2.0]
+
+
+def test_forbidden_is_not_retried(sleeps):
+    with StandInServer(pages=1, forbidden_rate=1.0) as server:
+        with make_fetcher() as fetcher:
+            with pytest.raises(PermissionError):
+                fetcher.fetch(server.start_url)
+        assert server.stats()["requests"] == 1
+
+    assert sleeps == []
+
+
+def test_throttling_halves_concurrency_and_successes_win_it_back(sleeps):
+    with StandInServer(pages=1, throttle_rate=1.0, retry_after=0) as server:
+        with make_fetcher(max_retries=3, max_per_host=8) as fetcher:
+            with pytest.raises(requests.HTTPError):
+                fetcher.fetch(server.start_url)
+            # 8 -> 4 -> 2 -> 1, and never below 1
+            assert fetcher.limiter.limit(server.start_url) == 1
+
+            server.throttle_rate = 0.0
+            for _ in range(fetcher.limiter.recovery_after):
+                fetcher.fetch(server.start_url)
+            assert fetcher.limiter.limit(server.start_url) == 2
+
+
+def test_host_limiter_caps_requests_in_flight():
+    with StandInServer(pages=8, latency=0.05) as server:
+        with make_fetcher(max_per_host=2) as fetcher:
+            with ThreadPoolExecutor(8) as pool:
+                list(pool.map(fetcher.fetch, [server.page_url(n) for n in range(1, 9)]))
+        assert server.stats()["peak_in_flight"] == 2
+
+
+def test_limit_grows_only_up_to_max_per_host():
+    limiter = HostLimiter(max_per_host=2, recovery_after=1)
+    url = "http://example.com/search"
+    for _ in range(5):
+        limiter.record_success(url)
+    assert limiter.limit(url) == 2
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    future = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30))
+    assert 25 <= parse_retry_after(future) <= 30
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0.0
@@ -0,0 +1,74 @@
+"""Listings are identified like the crawl deduplicates them."""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from scraper.dedup import listing_fingerprint
+from utils.loader import _normalize, listing_ids, load_dataset
+from utils.storage import read_processed, write_processed
+
+LISTING = {
+    "project_name": "Lodha Park",
+    "property_type": "Flat",
+    "listing_type": "for Sale",
+    "city": "Mumbai",
+    "locality": "Worli",
+    "furnishing": "Semi-Furnished",
+    "status": "Ready to Move",
+    "bhk": 2,
+    "bathrooms": "2",
+    "price_lakh": 450,
+    "carpet_area_sqft": 1050,
+    "price_per_sqft": 42857.14,
+}
+
+
+def load(tmp_path, rows) -> int:
+    path = tmp_path / "cleaned.csv"
+    pd.DataFrame(rows).to_csv(path, index=False)
+    db_path = str(tmp_path / "listings.db")
+    load_dataset(str(path), db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("changes", [
+    {"price_lakh": 460, "price_per_sqft": 43809.52},
+    {"price_per_sqft": 42867.14},
+    {"project_name": "Lodha Bellissimo"},
+])
+def test_units_differing_in_price_or_society_stay_distinct(tmp_path, changes):
+    assert load(tmp_path, [LISTING, {**LISTING, **changes}]) == 2
+
+
+def test_reloading_updates_rows_in_place(tmp_path):
+    assert load(tmp_path, [LISTING]) == 1
+    assert load(tmp_path, [{**LISTING, "status": "Under Construction", "bathrooms": "3"}]) == 1
+
+
+def test_ids_are_independent_of_the_file_format(tmp_path):
+    df = pd.DataFrame([LISTING, {**LISTING, "project_name": None}])
+    write_processed(df, str(tmp_path / "cleaned.csv"), "csv")
+    write_processed(df, str(tmp_path / "cleaned.parquet"), "parquet")
+
+    from_csv = listing_ids(_normalize(read_processed(str(tmp_path / "cleaned.csv"))))
+    from_parquet = listing_ids(_normalize(read_processed(str(tmp_path / "cleaned.parquet"))))
+    assert from_csv == from_parquet
+    assert len(set(from_csv)) == 2
+
+
+def test_raw_fingerprint_ignores_formatting():
+    record = {"title": "2 BHK Flat", "price": "₹4.5 Cr", "carpet_area": "1,050 sqft",
+              "society": "Lodha Park"}
+    noisy = {"title": " 2  bhk flat", "price": "₹ 4.5 Cr", "carpet_area": "1050 sqft",
+             "society": "LODHA PARK"}
+    other = {**record, "society": "Lodha Bellissimo"}
+
+    assert listing_fingerprint(noisy) == listing_fingerprint(record)
+    assert listing_fingerprint(other) != listing_fingerprint(record)
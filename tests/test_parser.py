@@ -0,0 +1,108 @@
+"""The bs4 and lxml parser backends must return identical records and Next links."""
+
+import pytest
+
+from benchmarks.fixtures import generate_page
+from scraper.config import BASE_URL
+from scraper.parser import BACKENDS, parse_page, parse_properties
+from scraper.schema import RAW_FIELDS
+
+# Hand-written pages with the markup quirks seen on MagicBricks result pages
+CARD = """
+<div class="mb-srp__list" id="card-{n}">
+  <div class="mb-srp__card">
+    <!-- sponsored -->
+    <h2 class="mb-srp__card--title">{title}</h2>
+    <div class="mb-srp__card__price extra">
+      <div class="mb-srp__card__price--amount">{price}</div>
+      <div class="mb-srp__card__price--size">&#8377;12,000 per sqft</div>
+    </div>
+    <div class="mb-srp__card__summary">
+      <div class="mb-srp__card__summary__list" data-summary="carpet-area">
+        <div class="mb-srp__card__summary--label">Carpet Area</div>
+        <div class="mb-srp__card__summary--value">{area}</div>
+      </div>
+      <div class="mb-srp__card__summary__list" data-summary="status">
+        <div class="mb-srp__card__summary--label">Under Construction</div>
+      </div>
+      <div class="mb-srp__card__summary__list" data-summary="society">
+        <div class="mb-srp__card__summary--label">Society</div>
+        <div class="mb-srp__card__summary--value"><a href="/p">{society}</a></div>
+      </div>
+      <div class="mb-srp__card__summary__list" data-summary="bathroom">
+        <div class="mb-srp__card__summary--label">Bathroom</div>
+        <div class="mb-srp__card__summary--value">2<script>track(1)</script></div>
+      </div>
+    </div>
+  </div>
+</div>
+"""
+
+SAMPLE_PAGES = [
+    # Regular cards and a site-relative Next link
+    "<html><body>"
+    + CARD.format(n=1, title="2 BHK Flat for Sale in Lodha Park, Worli, Mumbai",
+                  price="&#8377;4.5 Cr", area="1,050 sqft", society="Lodha Park")
+    + CARD.format(n=2, title="  3 BHK Flat\n for Sale in  Andheri West, Mumbai ",
+                  price="&#8377;95 Lac", area="<b>870</b> sqft", society="Sky &amp; Sea")
+    + '<a title="Next" href="/flats-for-sale?page=2">Next</a></body></html>',
+    # Missing blocks, comments inside values, an absolute Next link
+    '<html><body><div class="mb-srp__list"><div class="mb-srp__card">'
+    '<h2 class="mb-srp__card--title">1 RK Studio <!-- hidden -->for Rent in Powai, Mumbai</h2>'
+    '<div class="mb-srp__card__price--amount">&#8377;30,000</div>'
+    '<div data-summary="furnishing"><div class="mb-srp__card__summary--value"> Furnished </div></div>'
+    '<div data-summary="parking"><div class="mb-srp__card__summary--value">1 Covered,</div>'
+    '<div class="mb-srp__card__summary--value">1 Open</div></div>'
+    "</div></div>"
+    '<a title="Next" href="https://www.magicbricks.com/flats?page=3">Next</a></body></html>',
+    # A card without any field, and no Next link
+    '<html><body><div class="mb-srp__list"><p>Ad</p></div></body></html>',
+    # No cards at all
+    "<html><body><p>No results</p></body></html>",
+]
+
+
+@pytest.mark.parametrize("html", SAMPLE_PAGES)
+def test_backends_agree_on_sample_pages(html):
+    bs4_records, bs4_next = parse_page(html, backend="bs4")
+    lxml_records, lxml_next = parse_page(html, backend="lxml")
+
+    assert lxml_records == bs4_records
+    assert lxml_next == bs4_next
+    assert all(list(record) == RAW_FIELDS for record in bs4_records)
+
+
+def test_sample_page_values():
+    records, next_url = parse_page(SAMPLE_PAGES[0], backend="lxml")
+
+    assert next_url == BASE_URL + "/flats-for-sale?page=2"
+    assert records[0]["title"] == "2 BHK Flat for Sale in Lodha Park, Worli, Mumbai"
+    assert records[0]["price"] == "₹4.5 Cr"
+    assert records[0]["carpet_area"] == "1,050 sqft"
+    assert records[0]["status"] == "Under Construction"
+    assert records[0]["bathrooms"] == "2"
+    assert records[0]["furnishing"] == ""
+    assert records[1]["carpet_area"] == "870 sqft"
+    assert records[1]["society"] == "Sky & Sea"
+
+    records, next_url = parse_page(SAMPLE_PAGES[1], backend="lxml")
+    assert next_url == "https://www.magicbricks.com/flats?page=3"
+    assert records[0]["car_parking"] == "1 Covered,"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("seed,missing_rate", [(0, 0.0), (1, 0.1), (2, 0.5), (3, 1.0)])
+def test_backends_return_fixture_records(backend, seed, missing_rate):
+    for page in range(1, 6):
+        html, expected = generate_page(page, cards=20, missing_rate=missing_rate, seed=seed,
+                                       next_href=f"/search?page={page + 1}")
+        records, next_url = parse_page(html, backend=backend)
+
+        assert records == expected
+        assert next_url == BASE_URL + f"/search?page={page + 1}"
+        assert parse_properties(html, backend=backend) == expected
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        parse_page("<html></html>", backend="regex")
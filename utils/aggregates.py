@@ -0,0 +1,242 @@
+"""
+Aggregate Rollups
+
+Materializes the statistics the dashboards ask for over and over, next to
+the listings table in the SQLite database, and answers queries from them
+instead of rescanning the cleaned data:
+
+- rollup_locality_price / rollup_city_price: price_per_sqft percentiles
+  (p10, p25, median, p75, p90), mean, and the median price in lakh, per
+  locality and per city. Listings without a price (price_per_sqft 0) are
+  left out of these, including their listings count
+- rollup_bhk: listing counts per (city, locality, bhk)
+- rollup_furnishing: listing counts per (city, locality, furnishing)
+
+Counts are stored per locality because they add up; city totals are sums
+over a handful of rows. Percentiles do not add up, hence the separate
+city-level table.
+
+Refreshes are incremental: only cities with listings loaded since the last
+refresh (found through the loaded_at index) are recomputed, each from its
+own rows via the city index.
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from utils.loader import DB_PATH, connect
+
+PERCENTILES = {"ppsf_p10": 10, "ppsf_p25": 25, "ppsf_median": 50, "ppsf_p75": 75, "ppsf_p90": 90}
+
+_PRICE_COLUMNS = """
+    listings INTEGER NOT NULL,
+    ppsf_p10 REAL,
+    ppsf_p25 REAL,
+    ppsf_median REAL,
+    ppsf_p75 REAL,
+    ppsf_p90 REAL,
+    ppsf_mean REAL,
+    price_lakh_median REAL
+"""
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS rollup_locality_price (
+    city TEXT, locality TEXT, {_PRICE_COLUMNS},
+    PRIMARY KEY (city, locality)
+);
+CREATE TABLE IF NOT EXISTS rollup_city_price (
+    city TEXT PRIMARY KEY, {_PRICE_COLUMNS}
+);
+CREATE TABLE IF NOT EXISTS rollup_bhk (
+    city TEXT, locality TEXT, bhk INTEGER, listings INTEGER NOT NULL,
+    PRIMARY KEY (city, locality, bhk)
+);
+CREATE TABLE IF NOT EXISTS rollup_furnishing (
+    city TEXT, locality TEXT, furnishing TEXT, listings INTEGER NOT NULL,
+    PRIMARY KEY (city, locality, furnishing)
+);
+CREATE TABLE IF NOT EXISTS rollup_state (
+    key TEXT PRIMARY KEY,
+    value REAL
+);
+"""
+
+ROLLUP_TABLES = ("rollup_locality_price", "rollup_city_price", "rollup_bhk", "rollup_furnishing")
+
+# Bumped whenever what the rollups hold changes: older ones are recomputed
+ROLLUP_VERSION = 2
+
+
+def _price_stats(df: pd.DataFrame) -> dict:
+    """Price statistics of the listings of one group that have a price."""
+    ppsf = df.loc[df["price_per_sqft"] > 0, "price_per_sqft"].to_numpy(dtype=float)
+    price = df["price_lakh"].dropna().to_numpy(dtype=float)
+
+    stats = {"listings": len(ppsf)}
+    for name, q in PERCENTILES.items():
+        stats[name] = round(float(np.percentile(ppsf, q)), 2) if len(ppsf) else None
+    stats["ppsf_mean"] = round(float(ppsf.mean()), 2) if len(ppsf) else None
+    stats["price_lakh_median"] = float(np.median(price)) if len(price) else None
+    return stats
+
+
+def _insert(conn: sqlite3.Connection, table: str, rows: list):
+    if not rows:
+        return
+    columns = list(rows[0])
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})",
+        [tuple(row.values()) for row in rows],
+    )
+
+
+def _refresh_city(conn: sqlite3.Connection, city: str):
+    """Recomputes every rollup row of one city."""
+    df = pd.read_sql_query(
+        "SELECT locality, bhk, furnishing, price_lakh, price_per_sqft "
+        "FROM listings WHERE city IS ?",
+        conn,
+        params=(city,),
+    )
+
+    for table in ROLLUP_TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE city IS ?", (city,))
+
+    _insert(conn, "rollup_city_price", [{"city": city, **_price_stats(df)}])
+
+    _insert(conn, "rollup_locality_price", [
+        {"city": city, "locality": locality, **_price_stats(group)}
+        for locality, group in df.groupby("locality", dropna=False, sort=False)
+    ])
+
+    for table, column in (("rollup_bhk", "bhk"), ("rollup_furnishing", "furnishing")):
+        counts = df.groupby(["locality", column], dropna=False).size()
+        _insert(conn, table, [
+            {"city": city, "locality": locality, column: _scalar(value), "listings": int(count)}
+            for (locality, value), count in counts.items()
+        ])
+
+
+def _scalar(value):
+    """numpy scalars and NaN keys from groupby as plain SQLite values."""
+    if pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def refresh_rollups(db_path: str = DB_PATH, full: bool = False) -> int:
+    """
+    Brings the rollup tables up to date with the listings table.
+
+    Only cities with listings loaded since the previous refresh are
+    recomputed, unless full is set or the rollups were built by an older
+    ROLLUP_VERSION.
+
+    Returns:
+        int: Number of cities recomputed
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executescript(SCHEMA)
+
+            row = conn.execute("SELECT value FROM rollup_state WHERE key = 'version'").fetchone()
+            if row is None or row[0] != ROLLUP_VERSION:
+                full = True
+
+            row = conn.execute("SELECT value FROM rollup_state WHERE key = 'loaded_at'").fetchone()
+            watermark = -1.0 if full or row is None else row[0]
+
+            cities = [
+                city for (city,) in conn.execute(
+                    "SELECT DISTINCT city FROM listings WHERE loaded_at > ?", (watermark,)
+                )
+            ]
+            for city in cities:
+                _refresh_city(conn, city)
+
+            latest = conn.execute("SELECT MAX(loaded_at) FROM listings").fetchone()[0]
+            conn.executemany(
+                "INSERT OR REPLACE INTO rollup_state (key, value) VALUES (?, ?)",
+                [("loaded_at", latest if latest is not None else watermark),
+                 ("version", ROLLUP_VERSION)],
+            )
+    finally:
+        conn.close()
+
+    if cities:
+        print(f"Refreshed rollups for {len(cities)} city(ies)")
+    return len(cities)
+
+
+# ---------------- QUERY API ---------------- #
+
+def _query(db_path: str, sql: str, params: tuple = ()) -> pd.DataFrame:
+    # The tables are created if missing: a database nothing was loaded
+    # into yet answers with no rows
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def _where(filters: dict) -> tuple:
+    """WHERE clause (and parameters) for the filters that are set."""
+    clauses = [f"{column} = ?" for column, value in filters.items() if value is not None]
+    params = tuple(value for value in filters.values() if value is not None)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def price_per_sqft_stats(city: str | None = None, locality: str | None = None,
+                         by: str = "locality", min_listings: int = 1,
+                         db_path: str = DB_PATH) -> pd.DataFrame:
+    """
+    price_per_sqft percentiles per locality (by="locality") or per city
+    (by="city"), optionally for one city / locality only. Only groups with
+    at least min_listings priced listings are returned.
+    """
+    if by not in ("locality", "city"):
+        raise ValueError("by must be 'locality' or 'city'")
+
+    table = "rollup_locality_price" if by == "locality" else "rollup_city_price"
+    filters = {"city": city}
+    if by == "locality":
+        filters["locality"] = locality
+
+    where, params = _where(filters)
+    where += (" AND" if where else " WHERE") + " listings >= ?"
+    keys = "city, locality" if by == "locality" else "city"
+
+    return _query(db_path, f"SELECT * FROM {table}{where} ORDER BY {keys}", params + (min_listings,))
+
+
+def bhk_counts(city: str | None = None, locality: str | None = None,
+               db_path: str = DB_PATH) -> pd.DataFrame:
+    """Listing counts per bhk (and per city when no city is given)."""
+    where, params = _where({"city": city, "locality": locality})
+    keys = "bhk" if city else "city, bhk"
+    return _query(
+        db_path,
+        f"SELECT {keys}, SUM(listings) AS listings FROM rollup_bhk{where} "
+        f"GROUP BY {keys} ORDER BY {keys}",
+        params,
+    )
+
+
+def furnishing_mix(city: str | None = None, locality: str | None = None,
+                   db_path: str = DB_PATH) -> pd.DataFrame:
+    """Listing counts and share of each furnishing status per city."""
+    where, params = _where({"city": city, "locality": locality})
+    df = _query(
+        db_path,
+        f"SELECT city, furnishing, SUM(listings) AS listings FROM rollup_furnishing{where} "
+        "GROUP BY city, furnishing ORDER BY city, furnishing",
+        params,
+    )
+    df["share"] = (df["listings"] / df.groupby("city")["listings"].transform("sum")).round(4)
+    return df
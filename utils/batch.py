@@ -0,0 +1,218 @@
+"""
+Batch Pipeline
+
+Runs the scrape → clean pipeline for many cities at once, without any
+interactive input. Jobs are described in a JSON file:
+
+    {
+        "processes": 4,
+        "network_budget": 8,
+        "output_format": "csv",
+        "jobs": [
+            {"city": "mumbai", "url": "https://www.magicbricks.com/..."},
+            {"city": "pune", "url": "https://www.magicbricks.com/..."}
+        ]
+    }
+
+(a bare list of jobs is accepted too; the other keys are optional).
+main.py's --offline, --resume, --new-only, --incremental, --archive,
+--format, --no-cache and --db options apply to every job of the batch.
+
+Each job runs in its own worker process, so scraping and the CPU-bound
+cleaning of different cities overlap. All jobs share one network budget:
+a semaphore held for the duration of every request, which caps the number
+of requests in flight across the whole batch, and the request rate from
+config is split between the worker processes.
+
+Outputs:
+- data/raw/<city>_raw_data.csv and data/processed/<city>_cleaned_data.<ext>
+  per job, exactly as main.py names them
+- data/processed/national_cleaned_data.<ext>: every city's cleaned rows
+  combined, in job order
+- the national rows loaded into the SQLite database ("database" option,
+  data/magicbricks.db by default; null skips the Load stage), with its
+  aggregate rollups refreshed
+"""
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from scraper.cache import ResponseCache
+from scraper.config import ARCHIVE_DIR, CACHE_DIR, MAX_WORKERS, RATE_BURST, RATE_LIMIT
+from scraper.fetcher import Fetcher
+from scraper.scraper import run_scraper
+from scraper.throttle import TokenBucket
+from utils.aggregates import refresh_rollups
+from utils.data_cleaner import FINAL_COLUMNS, PROCESSED_DIR, clean_data
+from utils.loader import DB_PATH, load_dataset
+from utils.storage import ProcessedWriter, output_path_for, read_processed
+
+BATCH_PROCESSES = 4
+NETWORK_BUDGET = 8
+NATIONAL_NAME = "national_cleaned_data.csv"
+
+
+def load_jobs(path: str) -> tuple:
+    """
+    Reads a batch file.
+
+    Returns:
+        tuple: (list of {"city", "url"} jobs, dict of batch options)
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    if isinstance(config, list):
+        config = {"jobs": config}
+
+    jobs = []
+    for job in config.get("jobs", []):
+        city = str(job["city"]).strip().lower()
+        jobs.append({"city": city, "url": str(job["url"]).strip()})
+
+    cities = [job["city"] for job in jobs]
+    if len(set(cities)) != len(cities):
+        raise ValueError("Every batch job needs a distinct city name.")
+
+    options = {key: value for key, value in config.items() if key != "jobs"}
+    return jobs, options
+
+
+def _run_job(job: dict, network_slots, rate: float, options: dict) -> dict:
+    """Scrapes and cleans one city inside a worker process."""
+    city = job["city"]
+    raw_path = os.path.join("data", "raw", f"{city}_raw_data.csv")
+    result = {"city": city, "raw_path": raw_path, "clean_path": None, "error": None}
+
+    offline = options.get("offline", False)
+    cache_dir = options.get("cache_dir", CACHE_DIR)
+    if offline and not cache_dir:
+        cache_dir = CACHE_DIR
+    fetcher = Fetcher(
+        rate_limiter=TokenBucket(rate, RATE_BURST) if rate and not offline else False,
+        cache=ResponseCache(cache_dir) if cache_dir else None,
+        offline=offline,
+        network_slots=network_slots,
+    )
+
+    seen_index = None
+    if options.get("new_only"):
+        seen_index = os.path.join("data", "raw", f"{city}_seen.idx")
+
+    try:
+        with fetcher:
+            records = run_scraper(
+                job["url"],
+                raw_path,
+                workers=options.get("workers", MAX_WORKERS),
+                fetcher=fetcher,
+                resume=options.get("resume", False),
+                seen_index=seen_index,
+                archive_dir=os.path.join(ARCHIVE_DIR, city) if options.get("archive") else None,
+            )
+
+        # A raw CSV left over from an earlier run is not this job's output
+        if records:
+            result["clean_path"] = clean_data(
+                raw_path,
+                f"{city}_cleaned_data.csv",
+                output_format=options.get("output_format", "csv"),
+                incremental=options.get("incremental", False),
+            )
+        else:
+            result["error"] = "no data scraped"
+    except Exception as e:
+        # One failing city must not take the rest of the batch down
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+def combine_outputs(paths: list, output_format: str = "csv",
+                    output_name: str = NATIONAL_NAME) -> str | None:
+    """
+    Concatenates per-city cleaned datasets into one national dataset.
+
+    Columns are aligned on FINAL_COLUMNS (a city whose project names were
+    all dropped gets empty values there). CSV files are streamed city by
+    city and copied as text; columnar files are combined in memory so the
+    national file gets a single schema.
+    """
+    if not paths:
+        return None
+
+    output_path = output_path_for(os.path.join(PROCESSED_DIR, output_name), output_format)
+    writer = ProcessedWriter(output_path, output_format)
+
+    if output_format == "csv":
+        for path in paths:
+            df = pd.read_csv(path, dtype=str, keep_default_na=False)
+            writer.write(df.reindex(columns=FINAL_COLUMNS, fill_value=""))
+    else:
+        frames = []
+        for path in paths:
+            df = read_processed(path)
+            for column in df.select_dtypes("category").columns:
+                df[column] = df[column].astype(object)
+            frames.append(df.reindex(columns=FINAL_COLUMNS))
+        writer.write(pd.concat(frames, ignore_index=True))
+
+    writer.close()
+    return output_path
+
+
+def run_batch(jobs: list, processes: int = BATCH_PROCESSES,
+              network_budget: int = NETWORK_BUDGET, **options) -> list:
+    """
+    Runs every job concurrently and builds the national dataset.
+
+    Parameters:
+    - jobs (list): {"city", "url"} dicts, e.g. from load_jobs
+    - processes (int): Worker processes (jobs running at the same time)
+    - network_budget (int): Requests in flight across all jobs
+    - options: output_format, workers, cache_dir, offline, resume, new_only,
+      incremental, archive (as the main.py options of the same names; see
+      _run_job), database (path of the SQLite database, None to skip loading)
+
+    Returns:
+    - list: One result dict per job (city, raw_path, clean_path, error)
+    """
+    processes = max(1, min(processes, len(jobs) or 1))
+    output_format = options.get("output_format", "csv")
+
+    # The configured request rate is shared by all worker processes
+    rate = RATE_LIMIT / processes if RATE_LIMIT else 0
+
+    with multiprocessing.Manager() as manager:
+        network_slots = manager.BoundedSemaphore(max(1, network_budget))
+
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [
+                pool.submit(_run_job, job, network_slots, rate, options)
+                for job in jobs
+            ]
+            results = [future.result() for future in futures]
+
+    print("\nBatch summary:")
+    for result in results:
+        status = result["error"] or f"saved to {result['clean_path']}"
+        print(f"  {result['city']}: {status}")
+
+    national_path = combine_outputs(
+        [result["clean_path"] for result in results if result["clean_path"]],
+        output_format,
+    )
+    if national_path:
+        print(f"National dataset saved to: {national_path}")
+
+        # A single writer: the database is loaded here, not by the workers
+        database = options.get("database", DB_PATH)
+        if database:
+            load_dataset(national_path, database)
+            refresh_rollups(database)
+
+    return results
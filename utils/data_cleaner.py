@@ -6,165 +6,296 @@ This module processes raw scraped MagicBricks data and produces a clean, structu
 ready for analysis. It performs the following operations:
 
 - Normalize price (Cr/Lac → numeric INR and lakh)
-- Normalize carpet_area → numeric sqft, filling missing values with median
+- Normalize carpet_area (sqft/sqyrd/sqm/acre...) → numeric sqft, filling missing values with median
 - Extract info from title → bhk, property_type, listing_type, locality, city
 - Rename 'society' to 'project_name' for reliability
 - Normalize furnishing and status
 - Drop unused/problematic columns like title, price, carpet_area, car_parking
 - Calculate price_per_sqft
 - Reorder columns for a professional final dataset
+
+Every step is timed as a clean.* stage of a Metrics object (utils/metrics.py),
+along with rows read and written and values that failed to parse.
 """
 
 import pandas as pd
+import io
 import os
+import re
 import numpy as np
 
+from utils.manifest import ROW_DTYPE, CleanManifest, make_rows, raw_checksum, row_hashes
+from utils.metrics import Metrics
+from utils.storage import ProcessedWriter, output_path_for, read_processed
+
 PROCESSED_DIR = "data/processed"
 
 PROPERTY_WORDS = {"flat", "villa", "house", "apartment", "plot", "studio"}
 
-def clean_data(raw_path: str, output_name="magicbricks_clean.csv"):
-    os.makedirs(PROCESSED_DIR, exist_ok=True)
+# Price suffix -> multiplier to INR ("Cr" is checked before the lakh spellings)
+CRORE = 10_000_000
+LAKH = 100_000
+
+# Area unit -> multiplier to square feet
+AREA_UNITS = {
+    "sqft": 1,
+    "sqyrd": 9,
+    "sqyd": 9,
+    "sqm": 10.7639,
+    "acre": 43_560,
+    "hectare": 107_639,
+}
+AREA_UNIT_PATTERN = "|".join(sorted(AREA_UNITS, key=len, reverse=True))
+
+
+def normalize_price(price: pd.Series) -> pd.Series:
+    """
+    Vectorized price parser: "₹1.20 Cr" → 12000000.0, "₹85 Lac" → 8500000.0.
+
+    Values that cannot be parsed become NaN instead of raising.
+    """
+    text = (
+        price.astype(str)
+        .str.replace("₹", "", regex=False)
+        .str.replace(",", "", regex=False)
+        .str.strip()
+    )
 
-    df = pd.read_csv(raw_path)
-    df.columns = df.columns.str.lower()
+    is_crore = text.str.contains("Cr", regex=False, na=False)
+    is_lakh = ~is_crore & (
+        text.str.contains("Lac", regex=False, na=False)
+        | text.str.contains("Lakh", regex=False, na=False)
+    )
 
-    # ---------------- PRICE ---------------- #
-    def price_to_inr(price_str):
-        if pd.isna(price_str):
-            return np.nan
-        price_str = str(price_str).replace("₹", "").replace(",", "").strip()
-        if "Cr" in price_str:
-            return float(price_str.replace("Cr", "").strip()) * 10_000_000
-        if "Lac" in price_str or "Lakh" in price_str:
-            return float(price_str.replace("Lac", "").replace("Lakh", "").strip()) * 100_000
-        return float(price_str)
-
-    df["price_inr"] = df["price"].apply(price_to_inr)
-    df["price_lakh"] = (df["price_inr"] / 100_000).astype(int)
+    number = text.where(~is_crore, text.str.replace("Cr", "", regex=False))
+    number = number.where(
+        ~is_lakh,
+        number.str.replace("Lac", "", regex=False).str.replace("Lakh", "", regex=False),
+    )
 
-    # ---------------- CARPET AREA ---------------- #
-    df["carpet_area_sqft"] = (
-        df["carpet_area"]
-        .astype(str)
-        .str.replace("sqft", "", regex=False)
-        .str.strip()
+    multiplier = np.select([is_crore, is_lakh], [CRORE, LAKH], 1)
+    return pd.to_numeric(number.str.strip(), errors="coerce") * multiplier
+
+
+def normalize_area(area: pd.Series) -> pd.Series:
+    """
+    Vectorized area parser returning square feet: "1200 sqft" → 1200.0,
+    "100 sqyrd" → 900.0. Values without a unit are taken as sqft.
+
+    Values that cannot be parsed become NaN.
+    """
+    text = area.astype(str)
+
+    unit = text.str.extract(f"({AREA_UNIT_PATTERN})", expand=False)
+    multiplier = unit.map(AREA_UNITS).fillna(1).astype(float)
+
+    number = text.str.replace(AREA_UNIT_PATTERN, "", regex=True).str.strip()
+    return pd.to_numeric(number, errors="coerce") * multiplier
+
+
+BHK_RE = re.compile(r"(\d+)\s*BHK")
+PROPERTY_TYPE_RE = re.compile(r"BHK\s+(\w+)")
+LISTING_TYPE_RE = re.compile(r"(for Sale|for Rent)")
+AFTER_IN_RE = re.compile(r" in (.*)", re.DOTALL)
+FIRST_PART_RE = re.compile(r"^([^,]*),")
+LAST_PART_RE = re.compile(r"([^,]*)$")
+SECOND_LAST_PART_RE = re.compile(r"([^,]*),[^,]*$")
+LAST_WORD_RE = re.compile(r"^(.*?\S)\s+(\S+)$", re.DOTALL)
+WHITESPACE_RE = re.compile(r"\s+")
+
+TITLE_FIELDS = ["bhk", "property_type", "listing_type", "project_name", "locality", "city"]
+
+
+def project_names(title: pd.Series, society: pd.Series | None = None) -> np.ndarray:
+    """
+    Project name per listing: the society when it is a real name, else the
+    first comma-separated part after " in " in the title, else
+    "Independent Property".
+    """
+    # Missing values are compared as the text "nan", as str() would
+    if society is None:
+        society = pd.Series("", index=title.index)
+    society = society.astype(str).fillna("nan").str.strip()
+    use_society = society.ne("") & ~society.str.lower().isin(PROPERTY_WORDS)
+
+    after_in = title.astype(str).fillna("nan").str.lower().str.extract(AFTER_IN_RE, expand=False)
+    candidate = after_in.str.extract(FIRST_PART_RE, expand=False).str.strip()
+    use_candidate = candidate.notna() & candidate.ne("") & ~candidate.isin(PROPERTY_WORDS)
+
+    return np.select(
+        [use_society, use_candidate],
+        [society, candidate.str.title()],
+        "Independent Property",
     )
-    df["carpet_area_sqft"] = pd.to_numeric(df["carpet_area_sqft"], errors="coerce")
 
-    median_area = int(df["carpet_area_sqft"].median())
-    df["carpet_area_sqft"] = df["carpet_area_sqft"].fillna(median_area).astype(int)
 
-    # ---------------- PRICE PER SQFT ---------------- #
-    df["price_per_sqft"] = (
-        df["price_inr"] / df["carpet_area_sqft"].replace(0, np.nan)
-    ).round(2)
-    df["price_per_sqft"] = df["price_per_sqft"].fillna(0)
+def parse_titles(title: pd.Series, society: pd.Series | None = None,
+                 project_name: np.ndarray | None = None) -> pd.DataFrame:
+    """
+    Derives every title-based field in one vectorized pass.
 
-    # ---------------- BHK ---------------- #
-    df["bhk"] = df["title"].str.extract(r"(\d+)\s*BHK")[0]
-    df["bhk"] = df["bhk"].fillna(0).astype(int)
+    Titles look like "3 BHK Flat for Sale in <project>, <locality>, <city>".
 
-    # ---------------- PROPERTY TYPE ---------------- #
-    df["property_type"] = df["title"].str.extract(r"BHK\s+(\w+)")[0].str.title()
+    - bhk / property_type / listing_type: regex extraction
+    - project_name: see project_names; pass project_name when it was
+      already computed for these rows
+    - locality / city: the last two comma-separated parts after " in ",
+      with "New Delhi" kept whole and a space-separated fallback
+      ("Anna Nagar Chennai" → "Anna Nagar", "Chennai")
+    """
+    out = pd.DataFrame(index=title.index)
 
-    # ---------------- LISTING TYPE ---------------- #
-    df["listing_type"] = df["title"].str.extract(r"(for Sale|for Rent)")[0]
+    # ---------------- BHK / TYPE / LISTING ---------------- #
+    out["bhk"] = title.str.extract(BHK_RE, expand=False).fillna(0).astype(int)
+    out["property_type"] = title.str.extract(PROPERTY_TYPE_RE, expand=False).str.title()
+    out["listing_type"] = title.str.extract(LISTING_TYPE_RE, expand=False)
 
     # ---------------- PROJECT NAME (ROBUST) ---------------- #
-    def extract_project_name(row):
-        society = str(row.get("society", "")).strip()
-        title = str(row.get("title", "")).lower()
+    if project_name is None:
+        project_name = project_names(title, society)
+    out["project_name"] = project_name
 
-        if society and society.lower() not in PROPERTY_WORDS:
-            return society
+    # ---------------- LOCALITY & CITY ---------------- #
+    location = title.str.extract(AFTER_IN_RE, expand=False).str.strip()
+    has_comma = location.str.contains(",", regex=False, na=False)
 
-        if " in " in title:
-            after_in = title.split(" in ", 1)[1]
-            parts = [p.strip() for p in after_in.split(",")]
+    # Last and second-to-last comma-separated parts
+    last = location.str.extract(LAST_PART_RE, expand=False).str.strip()
+    second_last = location.str.extract(SECOND_LAST_PART_RE, expand=False).str.strip()
 
-            if len(parts) >= 3:
-                candidate = parts[0]
-            elif len(parts) == 2:
-                candidate = parts[0]
-            else:
-                candidate = ""
+    # Space-separated fallback (Chennai cases)
+    words = location.str.extract(LAST_WORD_RE)
+    has_words = words[1].notna()
+    words_locality = words[0].str.replace(WHITESPACE_RE, " ", regex=True)
 
-            if candidate and candidate.lower() not in PROPERTY_WORDS:
-                return candidate.title()
+    new_delhi = location.str.endswith("New Delhi", na=False)
 
-        return "Independent Property"
+    out["locality"] = np.select(
+        [new_delhi & has_comma, new_delhi, has_comma, has_words],
+        [second_last, "Unknown", second_last, words_locality],
+        "Unknown",
+    )
+    out["city"] = np.select(
+        [new_delhi, has_comma, has_words],
+        ["New Delhi", last, words[1]],
+        "Unknown",
+    )
 
-    df["project_name"] = df.apply(extract_project_name, axis=1)
-    df.drop(columns=["society"], inplace=True, errors="ignore")
+    return out
 
-    # ---------------- LOCALITY & CITY ---------------- #
-    def extract_locality_city(title):
-        if pd.isna(title) or " in " not in title:
-            return pd.Series(["Unknown", "Unknown"])
 
-        location = title.split(" in ", 1)[1].strip()
-        parts = [p.strip() for p in location.split(",")]
+FINAL_COLUMNS = [
+    "project_name",
+    "property_type",
+    "listing_type",
+    "city",
+    "locality",
+    "furnishing",
+    "status",
+    "bhk",
+    "bathrooms",
+    "price_lakh",
+    "carpet_area_sqft",
+    "price_per_sqft",
+]
+
 
-        # New Delhi handling
-        if location.endswith("New Delhi"):
-            city = "New Delhi"
-            locality = parts[-2] if len(parts) >= 2 else "Unknown"
-            return pd.Series([locality, city])
+class CleanCancelled(Exception):
+    """Raised by clean_data when its cancel event is set."""
 
-        # Normal comma-separated
-        if len(parts) >= 2:
-            city = parts[-1]
-            locality = parts[-2]
-            return pd.Series([locality, city])
 
-        # Space-separated fallback (Chennai cases)
-        words = parts[0].split()
-        if len(words) >= 2:
-            return pd.Series([" ".join(words[:-1]), words[-1]])
+def _count_unparsed(raw: pd.Series, parsed: pd.Series) -> int:
+    """Number of non-empty values that failed to parse."""
+    return int((raw.notna() & parsed.isna()).sum())
 
-        return pd.Series(["Unknown", "Unknown"])
 
-    df[["locality", "city"]] = df["title"].apply(extract_locality_city)
+def _report_unparsed(unparsed: dict):
+    for name, count in unparsed.items():
+        if count:
+            print(f"{count} {name} value(s) could not be parsed and were set to NaN")
+
+
+def _meaningful_mask(project_name: pd.Series) -> pd.Series:
+    """True for project names that are neither missing nor the placeholder."""
+    return (
+        project_name
+        .astype(str)
+        .str.strip()
+        .replace("Independent Property", "")
+        .replace("nan", "")
+        .ne("")
+    )
+
+
+def _meaningful_project_names(project_name: pd.Series) -> int:
+    """Counts project names that are neither missing nor the placeholder."""
+    return int(_meaningful_mask(project_name).sum())
+
+
+def _prepare(df: pd.DataFrame, unparsed: dict, metrics: Metrics) -> pd.DataFrame:
+    """Parses price and area; area gaps are left for the median fill."""
+    df.columns = df.columns.str.lower()
+
+    # ---------------- PRICE ---------------- #
+    with metrics.stage("clean.price"):
+        df["price_inr"] = normalize_price(df["price"])
+        unparsed["price"] += _count_unparsed(df["price"], df["price_inr"])
+
+        # Truncated like int(), nullable so unparsed prices stay missing
+        df["price_lakh"] = np.trunc(df["price_inr"] / LAKH).astype("Int64")
+
+    # ---------------- CARPET AREA ---------------- #
+    with metrics.stage("clean.area"):
+        df["carpet_area_sqft"] = normalize_area(df["carpet_area"])
+        unparsed["carpet_area"] += _count_unparsed(df["carpet_area"], df["carpet_area_sqft"])
+
+    return df
+
+
+def _transform(df: pd.DataFrame, median_area: int, keep_project_name: bool,
+               metrics: Metrics, project_name: np.ndarray | None = None) -> pd.DataFrame:
+    """
+    Turns a prepared raw frame into the final dataset.
+
+    The two dataset-wide inputs are passed in, so the same function serves
+    the in-memory and the chunked mode:
+    - median_area: fill value for missing carpet areas
+    - keep_project_name: False when no listing has a meaningful project name
+
+    project_name is the result of project_names() for df's rows, when the
+    caller already computed it.
+    """
+    metrics.incr("clean.areas_filled", int(df["carpet_area_sqft"].isna().sum()))
+    df["carpet_area_sqft"] = df["carpet_area_sqft"].fillna(median_area).astype(int)
+
+    # ---------------- PRICE PER SQFT ---------------- #
+    with metrics.stage("clean.price_per_sqft"):
+        df["price_per_sqft"] = (
+            df["price_inr"] / df["carpet_area_sqft"].replace(0, np.nan)
+        ).round(2)
+        df["price_per_sqft"] = df["price_per_sqft"].fillna(0)
+
+    # ---------------- TITLE-DERIVED FIELDS ---------------- #
+    # bhk, property_type, listing_type, project_name, locality and city
+    with metrics.stage("clean.titles"):
+        society = df["society"] if "society" in df.columns else None
+        df[TITLE_FIELDS] = parse_titles(df["title"], society, project_name)
+        df.drop(columns=["society"], inplace=True, errors="ignore")
 
     # ---------------- NORMALIZE ---------------- #
-    df["furnishing"] = df["furnishing"].str.title().fillna("Unfurnished")
-    df["status"] = df["status"].str.title().fillna("Unknown")
+    with metrics.stage("clean.normalize"):
+        df["furnishing"] = df["furnishing"].str.title().fillna("Unfurnished")
+        df["status"] = df["status"].str.title().fillna("Unknown")
 
     # ---------------- CLEANUP ---------------- #
-    df.drop(columns=["title", "price", "carpet_area", "car_parking"], inplace=True, errors="ignore")
-
-    final_columns = [
-        "project_name",
-        "property_type",
-        "listing_type",
-        "city",
-        "locality",
-        "furnishing",
-        "status",
-        "bhk",
-        "bathrooms",
-        "price_lakh",
-        "carpet_area_sqft",
-        "price_per_sqft",
-    ]
-    
-    df_clean = df[final_columns].copy()  
-
-    # ---------------- FINAL DISPLAY LOGIC FOR PROJECT NAME ---------------- #
-    if "project_name" in df_clean.columns:
-        non_empty_count = (
-            df_clean["project_name"]
-            .astype(str)
-            .str.strip()
-            .replace("Independent Property", "")
-            .replace("nan", "")
-            .ne("")
-            .sum()
-        )
+    with metrics.stage("clean.finalize"):
+        df.drop(columns=["title", "price", "carpet_area", "car_parking"], inplace=True, errors="ignore")
+
+        df_clean = df[FINAL_COLUMNS].copy()
 
+        # ---------------- FINAL DISPLAY LOGIC FOR PROJECT NAME ---------------- #
         # Case 1: Entire column has no meaningful values → drop it
-        if non_empty_count == 0:
+        if not keep_project_name:
             df_clean.drop(columns=["project_name"], inplace=True)
 
         # Case 2: Column has some valid values → fill missing safely
@@ -175,7 +306,411 @@ def clean_data(raw_path: str, output_name="magicbricks_clean.csv"):
                 .fillna("Project Name Not Available")
             )
 
+    return df_clean
+
+
+def _scan_raw(raw_path: str, chunksize: int, metrics: Metrics) -> tuple:
+    """
+    First pass of the chunked mode: gathers the dataset-wide values.
+
+    Returns:
+        tuple: (median carpet area, whether project names are kept,
+                read_csv dtypes that make every chunk parse like the whole file,
+                number of rows)
+    """
+    # Rows per distinct carpet area: the exact median without keeping a
+    # value per row (memory grows with the number of distinct areas)
+    area_counts = pd.Series(dtype=float)
+    rows = 0
+    project_name_count = 0
+    kinds = {}
+
+    for chunk in pd.read_csv(raw_path, chunksize=chunksize):
+        with metrics.stage("clean.scan"):
+            for column, dtype in chunk.dtypes.items():
+                kinds.setdefault(column, set()).add(dtype.kind)
+
+            chunk.columns = chunk.columns.str.lower()
+            counts = normalize_area(chunk["carpet_area"]).value_counts()
+            area_counts = area_counts.add(counts.astype(float), fill_value=0)
+            rows += len(chunk)
+
+            society = chunk["society"] if "society" in chunk.columns else None
+            names = pd.Series(project_names(chunk["title"], society))
+            project_name_count += _meaningful_project_names(names)
+
+    median_area = int(_median_from_counts(area_counts))
+    return median_area, project_name_count > 0, _read_dtypes(kinds), rows
+
+
+def _read_dtypes(kinds: dict) -> dict:
+    """
+    read_csv dtypes that make every part of a raw file parse like the whole
+    file, from the dtype kinds each column had in the parts.
+
+    pandas infers types per part: a column that is integer in one part and
+    has gaps in another must be read as float everywhere, and a column that
+    is text anywhere must be read as text everywhere.
+    """
+    dtypes = {}
+    for column, column_kinds in kinds.items():
+        if len(column_kinds) == 1:
+            continue
+        dtypes[column] = float if column_kinds <= {"i", "u", "f"} else str
+    return dtypes
+
+
+def _median_from_counts(counts: pd.Series) -> float:
+    """
+    Median of the values in counts' index, each repeated as many times as
+    its count; same result as Series.median() on the repeated values.
+    """
+    total = int(counts.sum())
+    if not total:
+        return np.nan
+
+    counts = counts.sort_index()
+    cumulative = counts.cumsum().to_numpy()
+    values = counts.index.to_numpy(dtype=float)
+
+    # Value at sorted position k: the first value whose cumulative count exceeds k
+    low = values[np.searchsorted(cumulative, (total - 1) // 2, side="right")]
+    high = values[np.searchsorted(cumulative, total // 2, side="right")]
+    return (low + high) / 2
+
+
+def clean_data(raw_path: str, output_name="magicbricks_clean.csv",
+               chunksize: int | None = None, output_format: str = "csv",
+               incremental: bool = False, progress=None, cancel=None,
+               metrics: Metrics | None = None) -> str:
+    """
+    Cleans a raw MagicBricks CSV into data/processed/<output_name>.
+
+    Parameters:
+    - raw_path (str): Raw CSV produced by the scraper
+    - output_name (str): File name of the cleaned dataset
+    - chunksize (int, optional): Stream the raw file in chunks of this many
+      rows instead of loading it whole. Peak memory then depends on the
+      chunk size (plus one count per distinct carpet area, for the exact
+      median); the output is identical to the in-memory mode
+    - output_format (str): "csv", "parquet" or "feather". For the columnar
+      formats the extension of output_name is replaced accordingly
+    - incremental (bool): Only clean raw rows that are new or changed since
+      the previous incremental run and reuse the rest of the existing
+      output; rows appended to the raw file are appended to a CSV output
+      without reading the rest (see _clean_incremental). Cannot be combined
+      with chunksize
+    - progress (callable, optional): Called with a dict of the rows cleaned
+      so far and the completed fraction (per chunk in chunked mode)
+    - cancel (threading.Event, optional): Checked between steps; when set,
+      the partial output is discarded and CleanCancelled is raised
+    - metrics (Metrics, optional): Collects the timings of every clean.*
+      step and the row counters
+
+    Returns:
+    - str: Path of the cleaned dataset
+    """
+    if incremental and chunksize:
+        raise ValueError("incremental and chunksize cannot be combined")
+
+    if metrics is None:
+        metrics = Metrics("clean")
+
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
     output_path = os.path.join(PROCESSED_DIR, output_name)
-    df_clean.to_csv(output_path, index=False, encoding="utf-8")
+    if output_format != "csv":
+        output_path = output_path_for(output_path, output_format)
+    writer = ProcessedWriter(output_path, output_format)
+    unparsed = {"price": 0, "carpet_area": 0}
+
+    def step(rows, fraction):
+        # Reports progress and stops between steps once cancelled
+        if cancel is not None and cancel.is_set():
+            raise CleanCancelled("Cleaning cancelled")
+        if progress:
+            progress({"rows": rows, "fraction": fraction})
+
+    manifest = None
+
+    try:
+        if incremental:
+            manifest = _clean_incremental(raw_path, output_path, writer, unparsed, metrics)
+            if manifest is None:
+                print(f"Cleaned data is up to date: {output_path}")
+                return output_path
+        elif chunksize:
+            CleanManifest(output_path).delete()
+            _clean_chunked(raw_path, writer, chunksize, unparsed, metrics, step)
+        else:
+            # A full clean leaves no manifest behind that could go stale
+            CleanManifest(output_path).delete()
+
+            with metrics.stage("clean.read"):
+                df = pd.read_csv(raw_path)
+            metrics.incr("clean.rows_read", len(df))
+
+            df = _prepare(df, unparsed, metrics)
+            step(0, 0.0)
+
+            with metrics.stage("clean.scan"):
+                median_area = int(df["carpet_area_sqft"].median())
 
+                society = df["society"] if "society" in df.columns else None
+                names = project_names(df["title"], society)
+                keep_project_name = _meaningful_project_names(pd.Series(names)) > 0
+
+            _write(writer, _transform(df, median_area, keep_project_name, metrics, names), metrics)
+
+        step(writer.rows_written, 1.0)
+    except BaseException:
+        writer.abort()
+        raise
+
+    with metrics.stage("clean.write"):
+        writer.close()
+
+    # Saved only once the output it describes is in place
+    if manifest is not None:
+        manifest.save()
+
+    for name, count in unparsed.items():
+        metrics.incr(f"clean.unparsed.{name}", count)
+    metrics.event("clean_finished", output=output_path, rows=writer.rows_written,
+                  unparsed=unparsed)
+
+    _report_unparsed(unparsed)
     print(f"Cleaned data saved to: {output_path}")
+    return output_path
+
+
+def _write(writer: ProcessedWriter, df: pd.DataFrame, metrics: Metrics):
+    with metrics.stage("clean.write"):
+        writer.write(df)
+    metrics.incr("clean.rows_written", len(df))
+
+
+def _clean_chunked(raw_path: str, writer: ProcessedWriter, chunksize: int, unparsed: dict,
+                   metrics: Metrics, step=None):
+    """Two-pass, bounded-memory version of clean_data's transform."""
+    median_area, keep_project_name, dtypes, total_rows = _scan_raw(raw_path, chunksize, metrics)
+
+    # Chunks are appended to a temporary file, published once complete
+    chunks = pd.read_csv(raw_path, chunksize=chunksize, dtype=dtypes)
+    while True:
+        with metrics.stage("clean.read"):
+            chunk = next(chunks, None)
+        if chunk is None:
+            break
+        metrics.incr("clean.rows_read", len(chunk))
+
+        df = _prepare(chunk, unparsed, metrics)
+        _write(writer, _transform(df, median_area, keep_project_name, metrics), metrics)
+        if step:
+            step(writer.rows_written, writer.rows_written / max(total_rows, 1))
+
+
+def _clean_incremental(raw_path: str, output_path: str, writer: ProcessedWriter,
+                       unparsed: dict, metrics: Metrics) -> CleanManifest | None:
+    """
+    Cleans only what changed since the last incremental run.
+
+    When the raw CSV only grew since then and the output is a CSV, only the
+    appended raw bytes are read, and their rows are cleaned and appended to
+    the output (_append_incremental): time and memory are proportional to
+    the new rows. Otherwise, or when the new rows move the median carpet
+    area, flip whether project names are kept, or change a column's type,
+    the whole raw file is merged with the output (_merge_incremental).
+
+    Either way the output is identical to a full clean of the same raw file.
+
+    Returns:
+        CleanManifest: Manifest of the new output, to be saved once the
+        writer is closed; None when nothing changed and nothing was written
+    """
+    manifest = CleanManifest.load(output_path)
+
+    if manifest is not None and writer.fmt == "csv":
+        appended = _append_incremental(raw_path, writer, manifest, unparsed, metrics)
+        if appended is not False:
+            return appended
+
+    return _merge_incremental(raw_path, output_path, writer, manifest, unparsed, metrics)
+
+
+def _append_incremental(raw_path: str, writer: ProcessedWriter, manifest: CleanManifest,
+                        unparsed: dict, metrics: Metrics):
+    """
+    Cleans the rows appended to the raw CSV since the manifest was saved
+    and appends them to the CSV output.
+
+    Returns:
+        CleanManifest, None (up to date) or False when the raw file changed
+        in another way, or the new rows would change already written rows
+    """
+    raw_size = os.path.getsize(raw_path)
+    if raw_size < manifest.raw_bytes or raw_checksum(raw_path, manifest.raw_bytes) != manifest.raw_check:
+        return False
+    if raw_size == manifest.raw_bytes:
+        # Output larger than recorded: an append was interrupted
+        return None if os.path.getsize(writer.path) == manifest.output_bytes else False
+
+    with metrics.stage("clean.read"):
+        with open(raw_path, "rb") as f:
+            f.seek(manifest.raw_bytes)
+            appended = f.read(raw_size - manifest.raw_bytes)
+        columns = [column for column, _ in manifest.columns]
+        raw = pd.read_csv(io.BytesIO(appended), header=None, names=columns)
+
+        # The appended rows must parse with the types the whole file has
+        kinds = {column: manifest.kinds[column] | {dtype.kind} for column, dtype in raw.dtypes.items()}
+        if any(_resolved_kind(kinds[c]) != _resolved_kind(manifest.kinds[c]) for c in columns):
+            return False
+        dtypes = _read_dtypes(kinds)
+        if dtypes:
+            raw = pd.read_csv(io.BytesIO(appended), header=None, names=columns, dtype=dtypes)
+
+    with metrics.stage("clean.hash"):
+        hashes = row_hashes(raw)
+
+    counts = {"price": 0, "carpet_area": 0}
+    df = _prepare(raw, counts, metrics)
+    society = df["society"] if "society" in df.columns else None
+    names = project_names(df["title"], society)
+    rows = make_rows(hashes, df["carpet_area_sqft"].to_numpy(dtype=float),
+                     _meaningful_mask(pd.Series(names)).to_numpy())
+
+    # Rows already written keep their values only if these stay the same
+    median_area, keep_project_name = manifest.median_area, manifest.keep_project_name
+    area_counts = manifest.area_counts.add(
+        pd.Series(rows["area"]).value_counts().astype(float), fill_value=0
+    )
+    if (int(_median_from_counts(area_counts)) != median_area
+            or (manifest.named_rows + rows["named"].sum() > 0) != keep_project_name):
+        return False
+
+    for name, count in counts.items():
+        unparsed[name] += count
+    metrics.incr("clean.rows_read", len(raw))
+    metrics.incr("clean.rows_reused", manifest.rows)
+    print(f"Cleaning {len(rows)} appended row(s), reusing {manifest.rows}")
+
+    writer.append(manifest.output_bytes)
+    _write(writer, _transform(df, median_area, keep_project_name, metrics, names), metrics)
+
+    manifest.set_rows(rows, append=True)
+    manifest.kinds = kinds
+    manifest.raw_bytes = raw_size
+    manifest.raw_check = raw_checksum(raw_path, raw_size)
+    return manifest
+
+
+def _resolved_kind(kinds: set) -> str:
+    """dtype kind of a whole raw column whose parts had the given kinds."""
+    if len(kinds) == 1:
+        return next(iter(kinds))
+    return "f" if kinds <= {"i", "u", "f"} else "O"
+
+
+def _merge_incremental(raw_path: str, output_path: str, writer: ProcessedWriter,
+                       manifest: CleanManifest | None, unparsed: dict,
+                       metrics: Metrics) -> CleanManifest | None:
+    """
+    Reads the whole raw file and merges it with the existing output.
+
+    Every raw row is identified by a hash of its content. Rows whose hash
+    is in the manifest are copied from the existing output; the others are
+    prepared and transformed. The median carpet area is recomputed over all
+    current rows (from the manifest's stored areas plus the new rows); if
+    it moved, the rows that were median-filled are transformed again too.
+    A change in whether project names are kept rewrites everything. The
+    whole output is written again.
+    """
+    raw_size = os.path.getsize(raw_path)
+    with metrics.stage("clean.read"):
+        raw = pd.read_csv(raw_path)
+    raw.columns = raw.columns.str.lower()
+    metrics.incr("clean.rows_read", len(raw))
+
+    with metrics.stage("clean.hash"):
+        hashes = row_hashes(raw)
+
+    previous_rows = None
+    if manifest is not None and manifest.columns == CleanManifest.describe(raw):
+        previous_rows = manifest.read_rows()
+    else:
+        manifest = None
+
+    # Position of each raw row in the previous output (-1 = not there)
+    positions = np.full(len(raw), -1)
+    if manifest is not None:
+        previous = pd.Series(np.arange(len(previous_rows)), index=previous_rows["hash"])
+        previous = previous[~previous.index.duplicated()]
+        positions = previous.reindex(hashes).fillna(-1).to_numpy(dtype=int)
+
+    reused = positions >= 0
+    areas = np.full(len(raw), np.nan)
+    named = np.zeros(len(raw), dtype=bool)
+    if manifest is not None:
+        areas[reused] = previous_rows["area"][positions[reused]]
+        named[reused] = previous_rows["named"][positions[reused]]
+
+    # Parse price and area of the new rows
+    prepared = [_prepare(raw[~reused].copy(), unparsed, metrics)]
+    areas[~reused] = prepared[0]["carpet_area_sqft"].to_numpy(dtype=float)
+    society = prepared[0]["society"] if "society" in raw.columns else None
+    named[~reused] = _meaningful_mask(
+        pd.Series(project_names(prepared[0]["title"], society))
+    ).to_numpy()
+
+    # Dataset-wide values, exactly as a full clean computes them
+    median_area = int(pd.Series(areas).median())
+    keep_project_name = bool(named.any())
+
+    if manifest is not None:
+        redo = np.zeros(len(raw), dtype=bool)
+        if keep_project_name != manifest.keep_project_name:
+            redo = reused.copy()
+        elif median_area != manifest.median_area:
+            redo = reused & np.isnan(areas)
+        if redo.any():
+            prepared.append(_prepare(raw[redo].copy(), {"price": 0, "carpet_area": 0}, metrics))
+            reused &= ~redo
+
+        if reused.all() and np.array_equal(hashes, previous_rows["hash"]):
+            # Same rows: only remember the raw file as it is now
+            manifest.set_rows(np.empty(0, dtype=ROW_DTYPE), append=True)
+            manifest.raw_bytes = raw_size
+            manifest.raw_check = raw_checksum(raw_path, raw_size)
+            manifest.save()
+            return None
+
+    fresh = _transform(pd.concat(prepared), median_area, keep_project_name, metrics)
+    metrics.incr("clean.rows_reused", int(reused.sum()))
+    print(f"Cleaning {len(fresh)} new or changed row(s), reusing {int(reused.sum())}")
+
+    if reused.any():
+        # CSV rows are carried over as their exact text; columnar files
+        # keep their types (categories are turned back into plain values)
+        if writer.fmt == "csv":
+            previous_output = pd.read_csv(output_path, dtype=str, keep_default_na=False)
+        else:
+            previous_output = read_processed(output_path)
+            for column in previous_output.select_dtypes("category").columns:
+                previous_output[column] = previous_output[column].astype(object)
+
+        carried = previous_output.iloc[positions[reused]]
+        carried.index = raw.index[reused]
+        fresh = pd.concat([carried, fresh])
+
+    # New rows and redone rows were transformed in two groups: back to raw order
+    _write(writer, fresh.sort_index(), metrics)
+
+    manifest = CleanManifest(output_path)
+    manifest.columns = CleanManifest.describe(raw)
+    manifest.kinds = {column: {dtype.kind} for column, dtype in raw.dtypes.items()}
+    manifest.median_area = median_area
+    manifest.keep_project_name = keep_project_name
+    manifest.set_rows(make_rows(hashes, areas, named))
+    manifest.raw_bytes = raw_size
+    manifest.raw_check = raw_checksum(raw_path, raw_size)
+    return manifest
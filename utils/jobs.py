@@ -0,0 +1,168 @@
+"""
+Background Jobs
+
+Runs the long pipeline stages (scraping and cleaning) in worker threads so
+the Streamlit script never blocks on them. A JobManager is meant to be a
+process-wide singleton (st.cache_resource in app.py): jobs outlive the
+script run, the session and even the browser connection that started them,
+and every user of the app shares the same pool of workers.
+
+Each job gets:
+- a progress callback, whose latest report is kept on the job. Cleaning
+  reports the fraction done, from which snapshot() derives an ETA. A
+  crawl cannot know how many result pages a search has, so scrape jobs
+  report pages and records only: their snapshot has rates and the elapsed
+  time, and no ETA
+- a cancel event, passed to the stage function (run_scraper / clean_data
+  stop at their next page / step once it is set)
+
+A job is identified by an id, and optionally by a key (e.g. its output
+path): submitting a job whose key is already running returns the running
+job instead of starting a second writer on the same file.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_WORKERS = 4
+# Finished jobs kept around for users coming back to them
+MAX_FINISHED_JOBS = 50
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class Job:
+    """One background run of a pipeline stage."""
+
+    def __init__(self, job_id: str, kind: str, key: str | None = None):
+        self.id = job_id
+        self.kind = kind
+        self.key = key
+        self.status = QUEUED
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    def report(self, progress: dict):
+        """Progress callback handed to the stage function."""
+        self.progress = dict(progress)
+
+    def snapshot(self) -> dict:
+        """Current state, with throughput and ETA derived from the progress."""
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        progress = self.progress
+
+        records = progress.get("records", progress.get("rows", 0))
+        rate = records / elapsed if elapsed > 0 else 0.0
+        pages = progress.get("pages")
+        page_rate = pages / elapsed if pages is not None and elapsed > 0 else None
+
+        # Only stages that know how far along they are can predict the end
+        fraction = progress.get("fraction")
+        eta = None
+        if self.status == RUNNING and fraction and 0 < fraction < 1:
+            eta = elapsed * (1 - fraction) / fraction
+
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "pages": pages,
+            "pages_per_second": page_rate,
+            "records": records,
+            "records_per_second": rate,
+            "fraction": fraction,
+            "eta_seconds": eta,
+            "elapsed_seconds": elapsed,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Thread pool plus a registry of the jobs it runs."""
+
+    def __init__(self, max_workers: int = JOB_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn, *args, key: str | None = None, **kwargs) -> Job:
+        """
+        Runs fn(*args, progress=..., cancel=..., **kwargs) in the background.
+
+        Returns the new job, or the active job already registered under key.
+        """
+        with self._lock:
+            if key is not None:
+                for job in self._jobs.values():
+                    if job.key == key and job.active:
+                        return job
+
+            # Random ids: a stale id from an earlier server run never matches
+            job = Job(f"{kind}-{uuid.uuid4().hex[:12]}", kind, key)
+            self._jobs[job.id] = job
+            self._prune()
+
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job: Job, fn, args: tuple, kwargs: dict):
+        job.started_at = time.time()
+
+        # Cancelled while still waiting for a worker
+        if job.cancel_event.is_set():
+            job.status = CANCELLED
+            job.finished_at = job.started_at
+            return
+
+        job.status = RUNNING
+        try:
+            job.result = fn(*args, progress=job.report, cancel=job.cancel_event, **kwargs)
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = CANCELLED if job.cancel_event.is_set() else FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if not job.active]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: str | None) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """Asks a job to stop; it does so at its next checkpoint."""
+        job = self.get(job_id)
+        if job is None or not job.active:
+            return False
+        job.cancel_event.set()
+        return True
+
+    def shutdown(self):
+        for job in self.jobs():
+            job.cancel_event.set()
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,183 @@
+"""
+Database Loader
+
+The Load stage of the pipeline: bulk-inserts cleaned listings into a local
+SQLite database (data/magicbricks.db) so questions like "median
+price_per_sqft by locality" become indexed SQL queries instead of rescans
+of the processed files.
+
+- One table, listings, with the cleaned columns plus listing_id and
+  loaded_at
+- listing_id is a stable hash of the fields that identify a listing, the
+  ones the crawl deduplicates on (scraper/dedup.py): title, price, carpet
+  area and society, as the cleaned columns derived from them. Reloading a
+  city updates its listings in place (upsert) instead of adding duplicate
+  rows, while distinct units that share a title stay distinct rows
+- Rows are inserted with executemany in batches, inside one transaction
+- Indexes on city, locality, bhk and price_lakh; (city, locality) is a
+  composite index because localities are only unique within a city.
+  loaded_at is indexed too, so rollups (utils/aggregates.py) can find
+  what changed since they were last refreshed
+"""
+
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from scraper.dedup import FINGERPRINT_FIELDS, fingerprint
+from utils.data_cleaner import FINAL_COLUMNS
+from utils.storage import read_processed
+
+DB_PATH = os.path.join("data", "magicbricks.db")
+LOAD_BATCH_SIZE = 10_000
+
+# Cleaned columns standing for each field of a listing's fingerprint
+# (scraper/dedup.py FINGERPRINT_FIELDS)
+IDENTITY_COLUMNS = {
+    "title": ["bhk", "property_type", "listing_type", "locality", "city"],
+    "price": ["price_lakh", "price_per_sqft"],
+    "carpet_area": ["carpet_area_sqft"],
+    "society": ["project_name"],
+}
+
+COLUMN_TYPES = {
+    "project_name": "TEXT",
+    "property_type": "TEXT",
+    "listing_type": "TEXT",
+    "city": "TEXT",
+    "locality": "TEXT",
+    "furnishing": "TEXT",
+    "status": "TEXT",
+    "bhk": "INTEGER",
+    "bathrooms": "TEXT",
+    "price_lakh": "INTEGER",
+    "carpet_area_sqft": "INTEGER",
+    "price_per_sqft": "REAL",
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS listings (
+    listing_id TEXT PRIMARY KEY,
+    {", ".join(f"{column} {COLUMN_TYPES[column]}" for column in FINAL_COLUMNS)},
+    loaded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_listings_city ON listings (city);
+CREATE INDEX IF NOT EXISTS idx_listings_city_locality ON listings (city, locality);
+CREATE INDEX IF NOT EXISTS idx_listings_locality ON listings (locality);
+CREATE INDEX IF NOT EXISTS idx_listings_bhk ON listings (bhk);
+CREATE INDEX IF NOT EXISTS idx_listings_price ON listings (price_lakh);
+CREATE INDEX IF NOT EXISTS idx_listings_loaded_at ON listings (loaded_at);
+"""
+
+_COLUMNS = ["listing_id"] + FINAL_COLUMNS + ["loaded_at"]
+
+UPSERT = (
+    f"INSERT INTO listings ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+    "ON CONFLICT (listing_id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in _COLUMNS[1:])
+)
+
+
+def connect(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """Opens the database, creating the schema on first use."""
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(db_path)
+    # WAL lets readers (e.g. the app) query while a load is running
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _text(value) -> str | None:
+    """
+    Text form of a value: 2.0 (an integer read back as float) becomes "2",
+    and the "nan" placeholder becomes NULL like it does when read from CSV.
+    """
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value)
+    return None if value == "nan" else value
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Cleaned frame with the table's columns as plain Python values."""
+    df = df.reindex(columns=FINAL_COLUMNS)
+    out = {}
+
+    for column in FINAL_COLUMNS:
+        values = df[column]
+        if COLUMN_TYPES[column] == "TEXT":
+            values = values.astype(object).map(_text, na_action="ignore")
+        elif COLUMN_TYPES[column] == "INTEGER":
+            values = values.astype("Int64")
+        # sqlite3 only binds Python scalars: NaN/NA become NULL
+        out[column] = values.astype(object).where(values.notna(), None)
+
+    return pd.DataFrame(out, index=df.index)
+
+
+def listing_ids(df: pd.DataFrame) -> list:
+    """Stable identifier of every normalized row (16 hex characters)."""
+    columns = [column for field in FINGERPRINT_FIELDS for column in IDENTITY_COLUMNS[field]]
+    rows = zip(*(df[column].tolist() for column in columns))
+    return [f"{fingerprint(row):016x}" for row in rows]
+
+
+def _rows(df: pd.DataFrame, loaded_at: float) -> list:
+    """Converts a cleaned frame to the tuples bound to UPSERT."""
+    df = _normalize(df)
+    columns = [listing_ids(df)]
+    columns += [df[column].tolist() for column in FINAL_COLUMNS]
+    columns.append([loaded_at] * len(df))
+    return list(zip(*columns))
+
+
+def load_frame(conn: sqlite3.Connection, df: pd.DataFrame,
+               batch_size: int = LOAD_BATCH_SIZE) -> int:
+    """
+    Upserts a cleaned frame in batches. The caller commits.
+
+    Returns:
+        int: Number of rows sent to the database
+    """
+    loaded_at = time.time()
+
+    for start in range(0, len(df), batch_size):
+        conn.executemany(UPSERT, _rows(df.iloc[start:start + batch_size], loaded_at))
+
+    return len(df)
+
+
+def load_dataset(path: str, db_path: str = DB_PATH,
+                 batch_size: int = LOAD_BATCH_SIZE) -> int:
+    """
+    Loads a cleaned dataset (.csv, .parquet or .feather) into the database
+    in a single transaction.
+
+    Returns:
+        int: Number of rows loaded
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            if path.endswith(".csv"):
+                # CSV files are streamed; columnar files are compact enough
+                count = sum(
+                    load_frame(conn, chunk, batch_size)
+                    for chunk in pd.read_csv(path, chunksize=batch_size)
+                )
+            else:
+                count = load_frame(conn, read_processed(path), batch_size)
+            conn.execute("ANALYZE listings")
+    finally:
+        conn.close()
+
+    print(f"Loaded {count} listings into: {db_path}")
+    return count
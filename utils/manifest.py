@@ -0,0 +1,190 @@
+"""
+Cleaning Manifests
+
+Persists what an incremental clean_data run needs to know about the rows it
+has already cleaned, next to the processed dataset:
+
+- "<output>.manifest.json": the dataset-wide state, whose size does not
+  depend on the number of rows
+- "<output>.rows": one fixed-size binary record per processed row (in
+  output order), appended to as rows are appended to the output
+
+The JSON state holds:
+- columns / kinds: raw columns with their dtypes, and the dtype kinds seen
+  for each column (see clean_data's chunked mode); incompatible raw data
+  invalidates the manifest
+- median_area / keep_project_name: the dataset-wide values the output was
+  produced with
+- area_counts / named_rows: rows per distinct parsed carpet area and the
+  number of meaningful project names, so both values can be updated from
+  new rows alone
+- raw_bytes / raw_check: how much of the raw CSV has been cleaned, and a
+  checksum of its header and of the bytes just before raw_bytes. A raw
+  file that still matches only grew, and only what follows raw_bytes is new
+- output_bytes: size of the output once written
+
+Each row record holds:
+- hash: content hash of the raw row it was cleaned from
+- area: parsed carpet area in sqft before the median fill (NaN if missing)
+- named: whether the row has a meaningful project name
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+ROW_DTYPE = np.dtype([("hash", "<u8"), ("area", "<f8"), ("named", "u1")])
+
+# Bytes before the watermark covered by raw_check
+CHECK_BYTES = 64 * 1024
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """64-bit content hash of every row (the index is ignored)."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def make_rows(hashes: np.ndarray, areas: np.ndarray, named: np.ndarray) -> np.ndarray:
+    """Row records from per-row hashes, areas and named flags."""
+    rows = np.empty(len(hashes), dtype=ROW_DTYPE)
+    rows["hash"] = hashes
+    rows["area"] = areas
+    rows["named"] = named
+    return rows
+
+
+def raw_checksum(raw_path: str, size: int) -> str | None:
+    """
+    Checksum of the raw CSV's header line and of the CHECK_BYTES bytes
+    before size, or None when the file is shorter than size.
+    """
+    try:
+        with open(raw_path, "rb") as f:
+            header = f.readline()
+            if os.fstat(f.fileno()).st_size < size:
+                return None
+            start = max(0, size - CHECK_BYTES)
+            f.seek(start)
+            tail = f.read(size - start)
+    except OSError:
+        return None
+    return hashlib.blake2b(header + b"\0" + tail, digest_size=16).hexdigest()
+
+
+class CleanManifest:
+    """Rows already present in a processed dataset."""
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.path = output_path + ".manifest.json"
+        self.rows_path = output_path + ".rows"
+        self.columns = None
+        self.kinds = {}
+        self.median_area = None
+        self.keep_project_name = None
+        self.area_counts = pd.Series(dtype=float)
+        self.named_rows = 0
+        self.rows = 0
+        self.raw_bytes = 0
+        self.raw_check = None
+        self.output_bytes = None
+
+        # Row records to write on save(): all of them, or only new ones
+        self.new_rows = np.empty(0, dtype=ROW_DTYPE)
+        self.append_rows = False
+
+    @staticmethod
+    def describe(raw: pd.DataFrame) -> list:
+        """Raw columns and dtypes, as stored in the manifest."""
+        return [[column, str(dtype)] for column, dtype in raw.dtypes.items()]
+
+    @classmethod
+    def load(cls, output_path: str):
+        """
+        Returns the manifest of output_path, or None when there is none or
+        it does not match the output or its row records.
+        """
+        manifest = cls(output_path)
+        try:
+            with open(manifest.path, encoding="utf-8") as f:
+                state = json.load(f)
+            rows_size = os.path.getsize(manifest.rows_path)
+            output_size = os.path.getsize(output_path)
+        except (OSError, ValueError):
+            return None
+
+        if rows_size != state["rows"] * ROW_DTYPE.itemsize or output_size < state["output_bytes"]:
+            return None
+
+        manifest.columns = state["columns"]
+        manifest.kinds = {column: set(kinds) for column, kinds in state["kinds"].items()}
+        manifest.median_area = state["median_area"]
+        manifest.keep_project_name = state["keep_project_name"]
+        values, counts = zip(*state["area_counts"]) if state["area_counts"] else ((), ())
+        manifest.area_counts = pd.Series(counts, index=pd.Index(values, dtype=float), dtype=float)
+        manifest.named_rows = state["named_rows"]
+        manifest.rows = state["rows"]
+        manifest.raw_bytes = state["raw_bytes"]
+        manifest.raw_check = state["raw_check"]
+        manifest.output_bytes = state["output_bytes"]
+        return manifest
+
+    def read_rows(self) -> np.ndarray:
+        """Every row record, in output order."""
+        return np.fromfile(self.rows_path, dtype=ROW_DTYPE, count=self.rows)
+
+    def set_rows(self, rows: np.ndarray, append: bool = False):
+        """
+        Records the rows of the output: all of them, or (append=True) the
+        rows appended after the existing ones. Counts are updated here.
+        """
+        self.new_rows = rows
+        self.append_rows = append
+        if not append:
+            self.rows = 0
+            self.area_counts = pd.Series(dtype=float)
+            self.named_rows = 0
+
+        self.rows += len(rows)
+        areas = pd.Series(rows["area"])
+        self.area_counts = self.area_counts.add(areas.value_counts().astype(float), fill_value=0)
+        self.named_rows += int(rows["named"].sum())
+
+    def save(self):
+        """Writes the row records, then the JSON state atomically."""
+        if self.append_rows:
+            with open(self.rows_path, "ab") as f:
+                self.new_rows.tofile(f)
+        else:
+            tmp_path = self.rows_path + ".tmp"
+            self.new_rows.tofile(tmp_path)
+            os.replace(tmp_path, self.rows_path)
+
+        self.output_bytes = os.path.getsize(self.output_path)
+        state = {
+            "columns": self.columns,
+            "kinds": {column: sorted(kinds) for column, kinds in self.kinds.items()},
+            "median_area": self.median_area,
+            "keep_project_name": self.keep_project_name,
+            "area_counts": [[value, count] for value, count in self.area_counts.items()],
+            "named_rows": self.named_rows,
+            "rows": self.rows,
+            "raw_bytes": self.raw_bytes,
+            "raw_check": self.raw_check,
+            "output_bytes": self.output_bytes,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def delete(self):
+        """Removes the manifest, e.g. after a full (non-incremental) clean."""
+        for path in (self.path, self.rows_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
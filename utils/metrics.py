@@ -0,0 +1,266 @@
+"""
+Pipeline Metrics
+
+Instrumentation shared by the scraping and cleaning stages. A Metrics object
+collects, for one pipeline run:
+
+- stage timers: calls, total / max seconds of every timed stage
+  (fetch, parse, paginate, write, and each clean.* step of clean_data)
+- counters: requests, retries, bytes downloaded, cache hits, records
+  written, duplicates and rows dropped, ...
+- observations: distributions such as cards per page (count/sum/min/max)
+
+It is thread-safe, so the worker threads of a concurrent crawl can share
+one instance.
+
+Outputs:
+- structured logs: one JSON object per event on the "magicbricks.metrics"
+  logger (stage timings at DEBUG, summaries at INFO). Nothing is shown
+  unless logging is configured, e.g. with configure_logging()
+- snapshot(): a JSON-serializable dict; to_prometheus(): the same data in
+  the Prometheus text format; save() writes either, by file extension
+
+Profiling hook: stages named in profile are run under cProfile
+(profile_mode="cpu") or tracemalloc ("memory") without touching their
+code. save_profiles() writes one <stage>.prof (pstats) or
+<stage>.memory.txt file per profiled stage.
+"""
+
+import cProfile
+import json
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger("magicbricks.metrics")
+
+PROFILE_MODES = ("cpu", "memory")
+PROFILE_DIR = os.path.join("data", "profiles")
+PROMETHEUS_PREFIX = "magicbricks"
+
+# Allocation sites kept per stage in memory profiles
+TOP_ALLOCATIONS = 15
+
+
+def configure_logging(level: int = logging.INFO, stream=None):
+    """Prints the structured metric events (one JSON object per line)."""
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+
+
+class Metrics:
+    """Counters, stage timers and observations of one pipeline run."""
+
+    def __init__(self, name: str = "pipeline", profile=None, profile_mode: str = "cpu"):
+        if profile_mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {profile_mode!r}, expected one of {PROFILE_MODES}")
+
+        self.name = name
+        self.started_at = time.time()
+        self.counters = {}
+        self.stages = {}
+        self.observations = {}
+        self._lock = threading.Lock()
+
+        self.profile = set(profile or ())
+        self.profile_mode = profile_mode
+        self._profiles = {}
+        # cProfile and tracemalloc are process-wide: one profiled stage at a time
+        self._profiling = threading.Lock()
+
+    # ---------------- RECORDING ---------------- #
+
+    def incr(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            stats = self.observations.get(name)
+            if stats is None:
+                self.observations[name] = {"count": 1, "sum": value, "min": value, "max": value}
+            else:
+                stats["count"] += 1
+                stats["sum"] += value
+                stats["min"] = min(stats["min"], value)
+                stats["max"] = max(stats["max"], value)
+
+    def event(self, event: str, level: int = logging.INFO, **fields):
+        """Logs one structured event."""
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps({"event": event, "run": self.name, **fields}, default=str))
+
+    @contextmanager
+    def stage(self, name: str, **fields):
+        """Times the enclosed block as one call of the stage."""
+        profiled = name in self.profile and self._profiling.acquire(blocking=False)
+        profiler = self._start_profile() if profiled else None
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if profiled:
+                self._stop_profile(name, profiler)
+                self._profiling.release()
+
+            with self._lock:
+                stats = self.stages.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+                stats["count"] += 1
+                stats["total"] += seconds
+                stats["max"] = max(stats["max"], seconds)
+
+            self.event("stage", logging.DEBUG, stage=name, seconds=round(seconds, 6), **fields)
+
+    # ---------------- PROFILING ---------------- #
+
+    def _start_profile(self):
+        if self.profile_mode == "cpu":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            return True
+        tracemalloc.reset_peak()
+        return False
+
+    def _stop_profile(self, name: str, profiler):
+        if self.profile_mode == "cpu":
+            profiler.disable()
+            stats = self._profiles.get(name)
+            if stats is None:
+                self._profiles[name] = pstats.Stats(profiler)
+            else:
+                stats.add(profiler)
+            return
+
+        peak = tracemalloc.get_traced_memory()[1]
+        top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+        if profiler:
+            # Tracing was started for this stage only
+            tracemalloc.stop()
+
+        report = self._profiles.setdefault(name, {"peak_bytes": 0, "top": []})
+        if peak >= report["peak_bytes"]:
+            report["peak_bytes"] = peak
+            report["top"] = [str(stat) for stat in top]
+        self.observe(f"profile.{name}.peak_bytes", peak)
+
+    def save_profiles(self, directory: str = PROFILE_DIR) -> list:
+        """
+        Writes the collected profiles, one file per profiled stage.
+
+        Returns:
+            list: Paths written
+        """
+        if not self._profiles:
+            return []
+
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+
+        for name, profile in self._profiles.items():
+            if self.profile_mode == "cpu":
+                path = os.path.join(directory, f"{name}.prof")
+                profile.dump_stats(path)
+            else:
+                path = os.path.join(directory, f"{name}.memory.txt")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(f"peak traced memory: {profile['peak_bytes']} bytes\n\n")
+                    f.write("\n".join(profile["top"]) + "\n")
+            paths.append(path)
+
+        return paths
+
+    # ---------------- OUTPUT ---------------- #
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {
+                name: {
+                    "count": stats["count"],
+                    "total_seconds": round(stats["total"], 6),
+                    "mean_seconds": round(stats["total"] / stats["count"], 6),
+                    "max_seconds": round(stats["max"], 6),
+                }
+                for name, stats in self.stages.items()
+            }
+            observations = {
+                name: {**stats, "mean": stats["sum"] / stats["count"]}
+                for name, stats in self.observations.items()
+            }
+            counters = dict(self.counters)
+
+        return {
+            "run": self.name,
+            "started_at": self.started_at,
+            "elapsed_seconds": round(time.time() - self.started_at, 6),
+            "counters": counters,
+            "stages": stages,
+            "observations": observations,
+        }
+
+    def to_prometheus(self) -> str:
+        """Snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        run = _label(snapshot["run"])
+        lines = []
+
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{PROMETHEUS_PREFIX}_{_metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f'{metric}{{run="{run}"}} {value}']
+
+        if snapshot["stages"]:
+            for suffix, key, kind in (("seconds_total", "total_seconds", "counter"),
+                                      ("calls_total", "count", "counter"),
+                                      ("max_seconds", "max_seconds", "gauge")):
+                metric = f"{PROMETHEUS_PREFIX}_stage_{suffix}"
+                lines.append(f"# TYPE {metric} {kind}")
+                for stage, stats in sorted(snapshot["stages"].items()):
+                    lines.append(f'{metric}{{run="{run}",stage="{_label(stage)}"}} {stats[key]}')
+
+        for name, stats in sorted(snapshot["observations"].items()):
+            metric = f"{PROMETHEUS_PREFIX}_{_metric_name(name)}"
+            lines.append(f"# TYPE {metric} summary")
+            lines.append(f'{metric}_sum{{run="{run}"}} {stats["sum"]}')
+            lines.append(f'{metric}_count{{run="{run}"}} {stats["count"]}')
+            for key in ("min", "max"):
+                lines.append(f'# TYPE {metric}_{key} gauge')
+                lines.append(f'{metric}_{key}{{run="{run}"}} {stats[key]}')
+
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: str) -> str:
+        """Writes the snapshot: Prometheus text for .prom/.txt, JSON otherwise."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith((".prom", ".txt")):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.snapshot(), f, indent=2)
+        return path
+
+    def log_summary(self):
+        """Logs the whole snapshot as one structured event."""
+        self.event("summary", **self.snapshot())
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
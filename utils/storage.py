@@ -0,0 +1,311 @@
+"""
+Processed Data Storage
+
+Writes and reads the cleaned MagicBricks dataset in one of three formats:
+
+- "csv": plain text, readable anywhere (default)
+- "parquet": columnar, zstd-compressed, with typed columns; supports column
+  projection and predicate pushdown (row groups are skipped using their
+  min/max statistics)
+- "feather": Arrow IPC, lz4-compressed; the fastest to load whole
+
+Parquet and Feather store the low-cardinality text columns as dictionary
+(categorical) columns and downcast the integer columns, so a cleaned
+dataset loads many times faster and with a fraction of the memory.
+
+pyarrow is only imported when a columnar format is actually used.
+"""
+
+import os
+
+import pandas as pd
+
+FORMATS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+# Text columns with few distinct values: stored as dictionaries
+CATEGORICAL_COLUMNS = [
+    "project_name",
+    "property_type",
+    "listing_type",
+    "city",
+    "locality",
+    "furnishing",
+    "status",
+]
+
+# Integer columns and the smallest type that safely holds them
+INTEGER_COLUMNS = {
+    "bhk": "int16",
+    "price_lakh": "int32",
+    "carpet_area_sqft": "int32",
+}
+
+# Kept as float64: price_per_sqft carries two exact decimals
+FLOAT_COLUMNS = {"price_per_sqft": "float64"}
+
+PARQUET_COMPRESSION = "zstd"
+FEATHER_COMPRESSION = "lz4"
+ROW_GROUP_SIZE = 128 * 1024
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Parquet/Feather output needs pyarrow: pip install pyarrow"
+        ) from e
+
+
+def output_path_for(path: str, fmt: str) -> str:
+    """Replaces the extension of path with the one matching fmt."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}, expected one of {tuple(FORMATS)}")
+    return os.path.splitext(path)[0] + FORMATS[fmt]
+
+
+def arrow_schema(df: pd.DataFrame):
+    """
+    Explicit Arrow schema for a cleaned frame.
+
+    bathrooms is stored as int16 when every value is a number, and as a
+    dictionary column otherwise (e.g. "10+"), so no value is lost.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for column in df.columns:
+        if column in CATEGORICAL_COLUMNS:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        elif column in INTEGER_COLUMNS:
+            arrow_type = pa.from_numpy_dtype(INTEGER_COLUMNS[column])
+        elif column in FLOAT_COLUMNS:
+            arrow_type = pa.from_numpy_dtype(FLOAT_COLUMNS[column])
+        elif column == "bathrooms" and pd.api.types.is_numeric_dtype(df[column]):
+            arrow_type = pa.int16()
+        else:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        fields.append(pa.field(column, arrow_type))
+
+    return pa.schema(fields)
+
+
+def to_arrow(df: pd.DataFrame, schema=None):
+    """Converts a cleaned frame to an Arrow table with the compact schema."""
+    import pyarrow as pa
+
+    schema = schema or arrow_schema(df)
+    columns = []
+
+    for field in schema:
+        values = df[field.name]
+        if pa.types.is_dictionary(field.type):
+            # Text column: keep missing values missing, everything else as str
+            values = values.astype("string")
+        columns.append(pa.array(values, from_pandas=True).cast(field.type))
+
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+class ProcessedWriter:
+    """
+    Writes a cleaned dataset in one go or chunk by chunk.
+
+    Data is written to "<path>.part" and renamed to path by close(), so a
+    failed run never leaves a truncated dataset behind. CSV rows can also
+    be appended to an existing dataset in place (append()).
+    """
+
+    def __init__(self, path: str, fmt: str = "csv"):
+        output_path_for(path, fmt)
+        if fmt != "csv":
+            _require_pyarrow()
+
+        self.path = path
+        self.fmt = fmt
+        self.part_path = path + ".part"
+        self._schema = None
+        self._writer = None
+        # Feather: dictionary of every categorical column, grown chunk by chunk
+        self._dictionaries = {}
+        self._started = False
+        # CSV size to cut back to on abort() when appending in place
+        self._append_at = None
+        self.rows_written = 0
+
+    def append(self, size: int):
+        """
+        Appends to the existing CSV at path instead of writing a new file.
+
+        The file is first cut back to size bytes (its size after the last
+        complete write, dropping an interrupted append), and abort() cuts it
+        back to that size again.
+        """
+        if self.fmt != "csv":
+            raise ValueError(f"Cannot append to a {self.fmt} dataset")
+        with open(self.path, "r+b") as f:
+            f.truncate(size)
+        self.part_path = self.path
+        self._append_at = size
+        self._started = True
+
+    def write(self, df: pd.DataFrame):
+        if self.fmt == "csv":
+            df.to_csv(
+                self.part_path,
+                mode="a" if self._started else "w",
+                header=not self._started,
+                index=False,
+                encoding="utf-8",
+            )
+        else:
+            self._write_arrow(df)
+        self._started = True
+        self.rows_written += len(df)
+
+    def _write_arrow(self, df: pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._schema is None:
+            self._schema = arrow_schema(df)
+
+        table = to_arrow(df, self._schema)
+
+        if self.fmt == "parquet":
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(
+                    self.part_path, self._schema, compression=PARQUET_COMPRESSION
+                )
+            # Each chunk becomes its own row group(s) with min/max statistics
+            self._writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+        else:
+            # Feather (Arrow IPC file) batches are written as they arrive.
+            # The format allows one dictionary per column, extended by
+            # deltas, so every chunk is encoded against the dictionary of
+            # the chunks before it plus its own new values
+            if self._writer is None:
+                options = pa.ipc.IpcWriteOptions(
+                    compression=FEATHER_COMPRESSION, emit_dictionary_deltas=True
+                )
+                self._writer = pa.ipc.new_file(self.part_path, self._schema, options=options)
+            self._writer.write_table(self._extend_dictionaries(table))
+
+    def _extend_dictionaries(self, table):
+        """Re-encodes the dictionary columns of table against the growing dictionaries."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        columns = []
+        for field, column in zip(table.schema, table.columns):
+            if not pa.types.is_dictionary(field.type):
+                columns.append(column)
+                continue
+
+            values = column.combine_chunks().dictionary_decode()
+            known = self._dictionaries.get(field.name, pa.array([], pa.string()))
+            new = pc.unique(pc.drop_null(values.filter(pc.invert(pc.is_in(values, value_set=known)))))
+            known = self._dictionaries[field.name] = pa.concat_arrays([known, new])
+
+            indices = pc.index_in(values, value_set=known).cast(pa.int32())
+            columns.append(pa.DictionaryArray.from_arrays(indices, known))
+
+        return pa.Table.from_arrays(columns, schema=table.schema)
+
+    def close(self):
+        """Finishes the file and moves it into place."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._started and self._append_at is None:
+            os.replace(self.part_path, self.path)
+
+    def abort(self):
+        """Discards everything written so far; the previous output is kept."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._dictionaries = {}
+        if self._append_at is not None:
+            with open(self.path, "r+b") as f:
+                f.truncate(self._append_at)
+        elif os.path.exists(self.part_path):
+            os.remove(self.part_path)
+        self._started = False
+
+
+def write_processed(df: pd.DataFrame, path: str, fmt: str = "csv"):
+    """Writes a whole cleaned frame to path in the given format."""
+    writer = ProcessedWriter(path, fmt)
+    writer.write(df)
+    writer.close()
+
+
+def read_processed(path: str, columns: list | None = None, filters: list | None = None) -> pd.DataFrame:
+    """
+    Loads a cleaned dataset, reading only what is needed.
+
+    Args:
+        path (str): .csv, .parquet or .feather file
+        columns (list, optional): Columns to load (projection)
+        filters (list, optional): Row filters as (column, op, value) tuples,
+            all of which must hold, e.g. [("city", "==", "Mumbai"), ("bhk", ">=", 2)].
+            Supported ops: ==, !=, <, <=, >, >=, in, not in
+
+    Parquet and Feather files are filtered inside Arrow before any pandas
+    object is built; Parquet additionally skips whole row groups.
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".csv":
+        usecols = None
+        if columns is not None:
+            usecols = list(dict.fromkeys(list(columns) + [f[0] for f in filters or []]))
+        df = pd.read_csv(path, usecols=usecols)
+        if filters:
+            df = df[_pandas_mask(df, filters)]
+        return df[columns] if columns is not None else df
+
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    NULLABLE_INTEGERS = {
+        pa.int16(): pd.Int16Dtype(),
+        pa.int32(): pd.Int32Dtype(),
+        pa.int64(): pd.Int64Dtype(),
+    }
+
+    fmt = "parquet" if extension == ".parquet" else "ipc"
+    dataset = ds.dataset(path, format=fmt)
+    expression = pq.filters_to_expression(filters) if filters else None
+    table = dataset.to_table(columns=columns, filter=expression)
+
+    # Integer columns with missing values stay integers (pandas nullable types)
+    return table.to_pandas(types_mapper=NULLABLE_INTEGERS.get)
+
+
+def _pandas_mask(df: pd.DataFrame, filters: list):
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        values = df[column]
+        if op in ("==", "="):
+            mask &= values == value
+        elif op == "!=":
+            mask &= values != value
+        elif op == "<":
+            mask &= values < value
+        elif op == "<=":
+            mask &= values <= value
+        elif op == ">":
+            mask &= values > value
+        elif op == ">=":
+            mask &= values >= value
+        elif op == "in":
+            mask &= values.isin(value)
+        elif op == "not in":
+            mask &= ~values.isin(value)
+        else:
+            raise ValueError(f"Unsupported filter operator {op!r}")
+    return mask